@@ -0,0 +1,80 @@
+"""Time one dispatcher poll over many recurring announcements: the due prefix of the
+next_fire index (Database.get_pending_announcements) against filtering every row on
+schedule_time, and the cost of advancing each fired announcement to its next occurrence.
+
+    python benchmarks/bench_announcements.py --announcements 100000 --due 50
+"""
+import argparse
+import os
+import random
+import sqlite3
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bot.utils.database import Database
+
+RULES = ('every 1w', 'every 1d', 'every 12h', '0 20 * * 5', '30 18 * * 1,3')
+
+SCAN_QUERY = '''
+    SELECT id, guild_id, channel_id, message, schedule_time
+    FROM scheduled_announcements
+    WHERE is_sent = FALSE AND schedule_time <= ?
+'''
+
+
+def best_of(function, repeat=5):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--announcements', type=int, default=100000)
+    parser.add_argument('--due', type=int, default=50)
+    args = parser.parse_args()
+
+    random.seed(7)
+    path = os.path.join(tempfile.mkdtemp(), 'bench_announcements.db')
+    Database(path)
+    now = datetime.now().replace(second=0, microsecond=0)
+
+    # A few due now, the rest spread over the coming week
+    conn = sqlite3.connect(path)
+    conn.executemany('''
+        INSERT INTO scheduled_announcements (guild_id, channel_id, message, schedule_time, recurrence, next_fire)
+        VALUES (?, ?, ?, ?, ?, ?)
+    ''', (
+        (random.randrange(1000), random.randrange(10000), f"Announcement {index}", fire, random.choice(RULES), fire)
+        for index in range(args.announcements)
+        for fire in [now - timedelta(minutes=1) if index < args.due else now + timedelta(minutes=random.randrange(1, 7 * 24 * 60))]
+    ))
+    conn.commit()
+
+    db = Database(path)
+    due = db.get_pending_announcements(now=now)
+    indexed = best_of(lambda: db.get_pending_announcements(now=now))
+    scan = best_of(lambda: conn.execute(SCAN_QUERY, (now,)).fetchall())
+
+    start = time.perf_counter()
+    db.finish_announcements([announcement[0] for announcement in due], now=now)
+    advance = time.perf_counter() - start
+    conn.close()
+
+    print(f"{args.announcements:,} recurring announcements, {len(due)} due")
+    print(f"due rows via next_fire index: {indexed * 1000:8.2f} ms")
+    print(f"schedule_time scan:           {scan * 1000:8.2f} ms")
+    print(f"advance {len(due)} fired:         {advance * 1000:8.2f} ms")
+    print(f"due after advancing:          {len(db.get_pending_announcements(now=now))}")
+    os.remove(path)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,77 @@
+"""Back up a throwaway database while a writer thread keeps inserting, and report
+backup throughput next to the writer's insert latency with and without a backup running.
+
+    python benchmarks/bench_backup.py --mb 200 --pages 256
+"""
+import argparse
+import os
+import shutil
+import sqlite3
+import sys
+import tempfile
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bot.utils.backup import copy_database
+from bot.utils.database import Database
+
+
+def writer(path, stop, latencies):
+    """Insert event logs the way the bot does (one connection and commit per write)"""
+    db = Database(path)
+    while not stop.is_set():
+        start = time.perf_counter()
+        db.log_event('bench', 1, 'x' * 200)
+        latencies.append(time.perf_counter() - start)
+        time.sleep(0.002)
+
+
+def measure(path, seconds, during=None):
+    stop = threading.Event()
+    latencies = []
+    thread = threading.Thread(target=writer, args=(path, stop, latencies))
+    thread.start()
+    result = during() if during else time.sleep(seconds)
+    stop.set()
+    thread.join()
+    latencies.sort()
+    return result, latencies
+
+
+def summary(latencies):
+    p99 = latencies[int(len(latencies) * 0.99)] * 1000
+    return f"{len(latencies):6d} writes  p99 {p99:7.2f} ms  max {latencies[-1] * 1000:7.2f} ms"
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--mb', type=int, default=200)
+    parser.add_argument('--pages', type=int, default=256)
+    parser.add_argument('--pause', type=float, default=0.01)
+    args = parser.parse_args()
+
+    directory = tempfile.mkdtemp()
+    path = os.path.join(directory, 'bench.db')
+    Database(path)
+    conn = sqlite3.connect(path)
+    blob = 'y' * 1000
+    conn.executemany('INSERT INTO command_logs (command_name, user_id) VALUES (?, ?)',
+                     ((blob, i) for i in range(args.mb * 1024)))
+    conn.commit()
+    conn.close()
+
+    _, baseline = measure(path, 3)
+    print(f"baseline:      {summary(baseline)}")
+
+    report, during = measure(path, 0, lambda: copy_database(path, os.path.join(directory, 'copy.db'), args.pages, args.pause))
+    print(f"during backup: {summary(during)}")
+    print(f"backup: {report['bytes'] / 1024 / 1024:.0f} MB in {report['seconds']:.2f}s ({report['mb_per_second']:.0f} MB/s), "
+          f"{report['steps']} steps, longest step {report['max_step_ms']:.2f} ms, {report['restarts']} restarts")
+
+    shutil.rmtree(directory)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,92 @@
+"""Microbenchmark: embeds built per second, per-call get_translation vs compiled templates.
+
+    python benchmarks/bench_embeds.py --seconds 2
+"""
+import argparse
+import os
+import sys
+import time
+from datetime import datetime
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import discord
+from bot.utils.translations import get_translation, get_embed_template, build_embed, format_datetime
+
+MATCH_DATE = datetime(2025, 7, 26, 18, 30)
+STATS = [(f"Team {i}", 30 - i, 10 - i // 3, i // 3, i % 3) for i in range(10)]
+
+
+def legacy_match_created(lang):
+    """/creatematch embed as built before templates (translation lookups + month dict per call)"""
+    embed = discord.Embed(title=get_translation("match_created", lang), color=0x00ff00, timestamp=datetime.utcnow())
+    months_es = {
+        1: "enero", 2: "febrero", 3: "marzo", 4: "abril",
+        5: "mayo", 6: "junio", 7: "julio", 8: "agosto",
+        9: "septiembre", 10: "octubre", 11: "noviembre", 12: "diciembre"
+    }
+    time_str = f"{MATCH_DATE.day} de {months_es[MATCH_DATE.month]}, {MATCH_DATE.year} a las {MATCH_DATE.strftime('%H:%M')} (España)"
+    embed.add_field(name=get_translation("teams", lang), value="🔴 A\n🔵 B", inline=False)
+    embed.add_field(name=get_translation("match_time", lang), value=time_str, inline=False)
+    embed.add_field(name=get_translation("match_id", lang), value="#1", inline=True)
+    return embed
+
+
+def template_match_created(lang):
+    return build_embed("match_created", lang, "🔴 A\n🔵 B", format_datetime(MATCH_DATE, lang, 'long'), "#1")
+
+
+def legacy_rankings(lang):
+    """/teamstats rankings as built before templates (4 lookups per row)"""
+    embed = discord.Embed(title=get_translation("team_statistics", lang), color=0x0099ff, timestamp=datetime.utcnow())
+    embed.description = get_translation("team_rankings", lang)
+    for i, row in enumerate(STATS, 1):
+        embed.add_field(
+            name=f"{i}. {row[0]}",
+            value=f"{get_translation('points', lang)}: {row[1]} | {get_translation('wins', lang)}: {row[2]} | {get_translation('losses', lang)}: {row[3]} | {get_translation('draws', lang)}: {row[4]}",
+            inline=False
+        )
+    return embed
+
+
+def template_rankings(lang):
+    template = get_embed_template("team_rankings", lang)
+    labels = template.labels
+    embed = template.build()
+    for i, row in enumerate(STATS, 1):
+        embed.add_field(
+            name=f"{i}. {row[0]}",
+            value=f"{labels['points']}: {row[1]} | {labels['wins']}: {row[2]} | {labels['losses']}: {row[3]} | {labels['draws']}: {row[4]}",
+            inline=False
+        )
+    return embed
+
+
+def rate(func, lang, seconds):
+    """Embeds built per second"""
+    count = 0
+    deadline = time.perf_counter() + seconds
+    while time.perf_counter() < deadline:
+        for _ in range(100):
+            func(lang)
+        count += 100
+    return count / seconds
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--seconds', type=float, default=1.0)
+    parser.add_argument('--lang', default='es')
+    args = parser.parse_args()
+
+    for name, legacy, compiled in (
+        ('creatematch', legacy_match_created, template_match_created),
+        ('teamstats', legacy_rankings, template_rankings),
+    ):
+        before = rate(legacy, args.lang, args.seconds)
+        after = rate(compiled, args.lang, args.seconds)
+        print(f"{name:>12}: legacy {before:10,.0f}/s  template {after:10,.0f}/s  ({after / before:.2f}x)")
+
+
+if __name__ == '__main__':
+    main()
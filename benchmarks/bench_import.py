@@ -0,0 +1,90 @@
+"""Time the synchronous part of /importmatches for a CSV of N matches: parsing and
+validation, the single-transaction insert, caching and reminder scheduling, and the
+paged summary. Everything here must fit well inside the 3 s interaction deadline.
+
+    python benchmarks/bench_import.py --matches 500
+"""
+import argparse
+import asyncio
+import os
+import random
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bot.commands.match import MatchCommands
+from bot.utils.database import Database
+from bot.utils.imports import parse_matches
+from bot.utils.pagination import paginate_lines
+from bot.utils.scheduler import MatchScheduler
+from bot.utils.translations import build_embed, format_datetime
+
+
+class FakeBot:
+    """Just the attributes MatchCommands.add_active_match touches"""
+
+    def __init__(self, db):
+        self.db = db
+        self.scheduler = MatchScheduler(self)
+
+    def owns_guild(self, guild_id):
+        return True
+
+
+def build_csv(count):
+    start = datetime.now() + timedelta(hours=1)
+    lines = ["team1,team2,date,time"]
+    for i in range(count):
+        match_date = start + timedelta(minutes=30 * i + random.randrange(30))
+        lines.append(f"Team {i % 40},Team {(i + 7) % 40 + 40},{match_date:%Y-%m-%d},{match_date:%H:%M}")
+    return "\n".join(lines).encode()
+
+
+async def run(args):
+    data = build_csv(args.matches)
+    path = os.path.join(tempfile.mkdtemp(), 'bench_import.db')
+    bot = FakeBot(Database(path))
+    cog = MatchCommands(bot)
+    timings = []
+
+    start = time.perf_counter()
+    matches, errors = parse_matches(data, 'matches.csv')
+    assert not errors, errors
+    timings.append(("parse + validate", time.perf_counter() - start))
+
+    start = time.perf_counter()
+    match_ids = bot.db.create_matches(1, 1, 1, 'en', matches)
+    timings.append(("insert (one transaction)", time.perf_counter() - start))
+
+    start = time.perf_counter()
+    for match_id, match in zip(match_ids, matches):
+        cog.add_active_match((match_id, 1, 1, match['team1'], match['team2'], match['match_date'].isoformat(' '), 1, 'en', None, None))
+    timings.append((f"cache + reminders ({len(bot.scheduler.scheduler.get_jobs())} jobs)", time.perf_counter() - start))
+
+    start = time.perf_counter()
+    lines = [
+        f"**#{match_id}** {match['team1']} vs {match['team2']} · {format_datetime(match['match_date'], 'en')}"
+        for match_id, match in zip(match_ids, matches)
+    ]
+    pages = paginate_lines(lines, 15, lambda text, number, count: build_embed("matches_imported", 'en', description=text))
+    timings.append((f"summary ({len(pages)} pages)", time.perf_counter() - start))
+
+    for label, seconds in timings:
+        print(f"{label:32s} {seconds * 1000:8.1f} ms")
+    print(f"{'total':32s} {sum(seconds for _, seconds in timings) * 1000:8.1f} ms")
+    os.remove(path)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--matches', type=int, default=500)
+    args = parser.parse_args()
+    random.seed(7)
+    asyncio.run(run(args))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,104 @@
+"""Measure resident memory of the member cache for 1k guilds in each MEMBER_CACHE_MODE.
+
+Guilds and members are fed straight into discord.py's connection state from
+synthetic gateway payloads, so no Discord connection is needed:
+
+    python benchmarks/bench_member_cache.py --guilds 1000 --members 200
+"""
+import argparse
+import os
+import subprocess
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def rss_mb():
+    """Current resident set size in MB (Linux)"""
+    with open('/proc/self/statm') as f:
+        pages = int(f.read().split()[1])
+    return pages * os.sysconf('SC_PAGE_SIZE') / 1024 / 1024
+
+
+def member_payload(user_id):
+    return {
+        'user': {'id': str(user_id), 'username': f'user{user_id}', 'discriminator': '0', 'avatar': None, 'global_name': None},
+        'roles': [],
+        'joined_at': '2025-01-01T00:00:00+00:00',
+        'deaf': False,
+        'mute': False,
+        'flags': 0
+    }
+
+
+def guild_payload(guild_id, member_count):
+    return {
+        'id': str(guild_id),
+        'name': f'guild{guild_id}',
+        'member_count': member_count,
+        'roles': [{
+            'id': str(guild_id), 'name': '@everyone', 'permissions': '0', 'position': 0,
+            'color': 0, 'hoist': False, 'managed': False, 'mentionable': False
+        }],
+        'channels': [],
+        'members': [],
+        'emojis': [],
+        'stickers': [],
+        'features': []
+    }
+
+
+def run_mode(mode, guild_count, members_per_guild, fanout_ratio):
+    """Populate a connection state the way the given cache mode would"""
+    import discord
+    from bot.utils.members import member_cache_options
+
+    intents = discord.Intents.default()
+    intents.members = True
+    client = discord.Client(intents=intents, **member_cache_options(mode))
+    state = client._connection
+
+    baseline = rss_mb()
+    next_user = 1 << 40
+    fanout_every = max(1, int(1 / fanout_ratio)) if fanout_ratio else 0
+
+    for index in range(guild_count):
+        guild = state._add_guild_from_data(guild_payload((index + 1) << 22, members_per_guild))
+
+        # full chunks every guild at startup; lazy only the guilds that ran a role fan-out
+        chunked = mode == 'full' or (fanout_every and index % fanout_every == 0)
+        if not chunked:
+            continue
+
+        for _ in range(members_per_guild):
+            guild._add_member(discord.Member(data=member_payload(next_user), guild=guild, state=state))
+            next_user += 1
+
+    cached = sum(len(guild._members) for guild in state.guilds)
+    print(f"{mode:>5}: {rss_mb() - baseline:8.1f} MB for {cached} cached members in {guild_count} guilds")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--guilds', type=int, default=1000)
+    parser.add_argument('--members', type=int, default=200)
+    parser.add_argument('--fanout-ratio', type=float, default=0.05,
+                        help='share of guilds that needed a role fan-out in lazy mode')
+    parser.add_argument('--mode', choices=['full', 'lazy'])
+    args = parser.parse_args()
+
+    if args.mode:
+        run_mode(args.mode, args.guilds, args.members, args.fanout_ratio)
+        return
+
+    # Each mode runs in a fresh interpreter so RSS isn't shared between runs
+    for mode in ('full', 'lazy'):
+        subprocess.run([
+            sys.executable, __file__, '--mode', mode,
+            '--guilds', str(args.guilds), '--members', str(args.members),
+            '--fanout-ratio', str(args.fanout_ratio)
+        ], check=True)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,75 @@
+"""Time a full Elo recompute over synthetic match history, against replaying it one
+elo_update() call per match, and end to end through Database.recompute_ratings.
+
+    python benchmarks/bench_ratings.py --matches 1000000 --teams 500
+"""
+import argparse
+import os
+import random
+import sqlite3
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bot.utils.database import Database
+from bot.utils.ratings import INITIAL_RATING, elo_update, match_score, replay_ratings
+
+
+def naive_replay(matches):
+    """One dictionary lookup and elo_update() call per match"""
+    ratings = {}
+    for team1, team2, team1_score, team2_score in matches:
+        ratings[team1], ratings[team2] = elo_update(
+            ratings.get(team1, INITIAL_RATING),
+            ratings.get(team2, INITIAL_RATING),
+            match_score(team1_score, team2_score)
+        )
+    return ratings
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--matches', type=int, default=1000000)
+    parser.add_argument('--teams', type=int, default=500)
+    args = parser.parse_args()
+
+    random.seed(7)
+    teams = [f"Team {i}" for i in range(args.teams)]
+    matches = [
+        (*random.sample(teams, 2), random.randrange(5), random.randrange(5))
+        for _ in range(args.matches)
+    ]
+
+    start = time.perf_counter()
+    expected = naive_replay(matches)
+    naive = time.perf_counter() - start
+
+    start = time.perf_counter()
+    ratings = replay_ratings(matches)
+    columnar = time.perf_counter() - start
+
+    drift = max(abs(ratings[team] - expected[team]) for team in expected)
+    print(f"per-match elo_update: {naive:6.2f} s")
+    print(f"replay_ratings:       {columnar:6.2f} s  ({naive / columnar:.2f}x, max drift {drift:.2e})")
+
+    path = os.path.join(tempfile.mkdtemp(), 'bench_ratings.db')
+    db = Database(path)
+    conn = sqlite3.connect(path)
+    conn.executemany('''
+        INSERT INTO match_results (match_id, guild_id, team1_name, team2_name, team1_score, team2_score)
+        VALUES (0, 1, ?, ?, ?, ?)
+    ''', matches)
+    conn.executemany('INSERT INTO teams (guild_id, team_name) VALUES (1, ?)', ((team,) for team in teams))
+    conn.commit()
+    conn.close()
+
+    start = time.perf_counter()
+    db.recompute_ratings(1)
+    print(f"Database.recompute_ratings (read, replay, write): {time.perf_counter() - start:6.2f} s")
+    os.remove(path)
+
+
+if __name__ == '__main__':
+    main()
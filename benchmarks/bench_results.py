@@ -0,0 +1,70 @@
+"""Time recording a matchday one result at a time (save_match_result + finish_match
+per match, as /recordresult does) against one Database.record_results batch.
+
+    python benchmarks/bench_results.py --matches 25 --teams 20
+"""
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bot.utils.database import Database
+
+
+def matchday(db, count, teams):
+    """Create `count` scheduled matches and return result dicts for them"""
+    pairs = [random.sample(teams, 2) for _ in range(count)]
+    match_ids = db.create_matches(1, 1, 1, 'en', [
+        {'team1': team1, 'team2': team2, 'match_date': datetime.now() + timedelta(days=1)} for team1, team2 in pairs
+    ])
+    return [
+        {
+            'match_id': match_id, 'team1': team1, 'team2': team2, 'team1_score': random.randrange(5),
+            'team2_score': random.randrange(5), 'match_date': datetime.now(), 'advance': None
+        }
+        for match_id, (team1, team2) in zip(match_ids, pairs)
+    ]
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--matches', type=int, default=25)
+    parser.add_argument('--teams', type=int, default=20)
+    parser.add_argument('--rounds', type=int, default=20)
+    args = parser.parse_args()
+
+    random.seed(7)
+    teams = [f"Team {i}" for i in range(args.teams)]
+    path = os.path.join(tempfile.mkdtemp(), 'bench_results.db')
+    db = Database(path)
+
+    single = batch = 0.0
+    for _ in range(args.rounds):
+        results = matchday(db, args.matches, teams)
+        start = time.perf_counter()
+        for result in results:
+            db.save_match_result(
+                result['match_id'], 1, result['team1'], result['team2'],
+                result['team1_score'], result['team2_score'], result['match_date']
+            )
+            db.finish_match(result['match_id'])
+        single += time.perf_counter() - start
+
+        results = matchday(db, args.matches, teams)
+        start = time.perf_counter()
+        db.record_results(1, results)
+        batch += time.perf_counter() - start
+
+    print(f"{args.matches} results per matchday, mean of {args.rounds}")
+    print(f"one call per result: {single / args.rounds * 1000:8.1f} ms")
+    print(f"record_results:      {batch / args.rounds * 1000:8.1f} ms  ({single / batch:.1f}x)")
+    os.remove(path)
+
+
+if __name__ == '__main__':
+    main()
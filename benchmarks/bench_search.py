@@ -0,0 +1,67 @@
+"""Build a throwaway database with N event logs and time full-text searches against it.
+
+The rows are inserted before the FTS index exists, so the one-off backfill is timed too:
+
+    python benchmarks/bench_search.py --rows 1000000
+"""
+import argparse
+import os
+import random
+import sqlite3
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bot.utils.database import Database
+
+WORDS = ("joined left guild member match created ended result announcement final cup league "
+         "team red blue green derby semifinal quarter training schedule reminder").split()
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--rows', type=int, default=1000000)
+    parser.add_argument('--guilds', type=int, default=50)
+    args = parser.parse_args()
+
+    random.seed(42)
+    path = os.path.join(tempfile.mkdtemp(), 'bench_search.db')
+    conn = sqlite3.connect(path)
+    conn.execute('''
+        CREATE TABLE event_logs (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            event_type TEXT NOT NULL,
+            guild_id INTEGER,
+            description TEXT,
+            timestamp DATETIME DEFAULT CURRENT_TIMESTAMP
+        )
+    ''')
+    conn.executemany(
+        'INSERT INTO event_logs (event_type, guild_id, description) VALUES (?, ?, ?)',
+        (
+            (random.choice(('member_join', 'member_leave', 'match_created')), random.randrange(args.guilds),
+             f"Member joined: user{random.randrange(10 ** 6)} " + ' '.join(random.choices(WORDS, k=8)))
+            for _ in range(args.rows)
+        )
+    )
+    conn.commit()
+    conn.close()
+
+    start = time.perf_counter()
+    db = Database(path)
+    print(f"init + FTS backfill of {args.rows:,} rows: {time.perf_counter() - start:.1f} s")
+
+    for query, guild_id in (('user123456', None), ('derby semi*', 7), ('final cup league', None), ('joined', 3)):
+        start = time.perf_counter()
+        for _ in range(20):
+            results = db.search_events(query, guild_id, 10)
+        elapsed = (time.perf_counter() - start) / 20
+        print(f"{query!r:>20} guild={guild_id}: {elapsed * 1000:8.2f} ms  ({len(results)} results)")
+
+    os.remove(path)
+
+
+if __name__ == '__main__':
+    main()
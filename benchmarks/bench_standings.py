@@ -0,0 +1,94 @@
+"""Time a last-30-days standings table as match history grows: summed from the daily
+standings_rollups (Database.get_windowed_standings) against aggregating match_results.
+
+History is extended backwards in time at a fixed number of results per day, so the
+window itself always covers the same amount of play; only older history grows.
+
+    python benchmarks/bench_standings.py --sizes 10000,100000,1000000 --teams 40
+"""
+import argparse
+import os
+import random
+import sqlite3
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bot.utils.database import Database
+
+RESULTS_PER_DAY = 100
+
+SCAN_QUERY = '''
+    SELECT team_name, SUM(points), SUM(win), SUM(loss), SUM(draw), SUM(goals_for), SUM(goals_against)
+    FROM (
+        SELECT team1_name AS team_name,
+            CASE WHEN team1_score > team2_score THEN 3 WHEN team1_score = team2_score THEN 1 ELSE 0 END AS points,
+            team1_score > team2_score AS win, team1_score < team2_score AS loss, team1_score = team2_score AS draw,
+            team1_score AS goals_for, team2_score AS goals_against
+        FROM match_results WHERE guild_id = ? AND substr(match_date, 1, 10) >= ?
+        UNION ALL
+        SELECT team2_name,
+            CASE WHEN team2_score > team1_score THEN 3 WHEN team1_score = team2_score THEN 1 ELSE 0 END,
+            team2_score > team1_score, team2_score < team1_score, team1_score = team2_score,
+            team2_score, team1_score
+        FROM match_results WHERE guild_id = ? AND substr(match_date, 1, 10) >= ?
+    )
+    GROUP BY team_name
+'''
+
+
+def best_of(function, repeat=5):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--sizes', default='10000,100000,1000000')
+    parser.add_argument('--teams', type=int, default=40)
+    args = parser.parse_args()
+
+    random.seed(7)
+    teams = [f"Team {i}" for i in range(args.teams)]
+    path = os.path.join(tempfile.mkdtemp(), 'bench_standings.db')
+    Database(path)
+    today = datetime.now().replace(hour=20, minute=0, second=0, microsecond=0)
+    window_start = (today - timedelta(days=29)).strftime('%Y-%m-%d')
+
+    stored = 0
+    print(f"{'results':>9} {'rollups':>10} {'scan results':>13}")
+    for size in (int(value) for value in args.sizes.split(',')):
+        conn = sqlite3.connect(path)
+        conn.executemany('''
+            INSERT INTO match_results (match_id, guild_id, team1_name, team2_name, team1_score, team2_score, match_date)
+            VALUES (0, 1, ?, ?, ?, ?, ?)
+        ''', (
+            (*random.sample(teams, 2), random.randrange(5), random.randrange(5),
+             (today - timedelta(days=index // RESULTS_PER_DAY)).isoformat(' '))
+            for index in range(stored, size)
+        ))
+        # Reopening without the rollups table runs the one-off backfill over all results
+        conn.execute('DROP TABLE standings_rollups')
+        conn.commit()
+        conn.close()
+        db = Database(path)
+        stored = size
+
+        conn = sqlite3.connect(path)
+        rollups = best_of(lambda: db.get_windowed_standings(1, window_start))
+        scan = best_of(lambda: conn.execute(SCAN_QUERY, (1, window_start, 1, window_start)).fetchall())
+        conn.close()
+        print(f"{size:>9,} {rollups * 1000:>8.2f} ms {scan * 1000:>10.2f} ms")
+
+    os.remove(path)
+
+
+if __name__ == '__main__':
+    main()
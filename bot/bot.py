@@ -2,54 +2,175 @@ import discord
 from discord.ext import commands
 import asyncio
 import os
-from datetime import datetime
 from bot.utils.database import Database
 from bot.utils.scheduler import MatchScheduler
-from bot.utils.translations import get_translation
+from bot.utils.translations import (
+    get_translation, build_embed, precompile_templates, validate_translations,
+    SUPPORTED_LANGUAGES, DEFAULT_LANGUAGE
+)
+from bot.utils.shards import ShardStats, shard_id_for
+from bot.utils.members import MemberCacheManager, get_member_cache_mode, member_cache_options
+from bot.utils.mentions import MentionResolver
+from bot.utils.preferences import LanguagePreferences
+from bot.utils.sketches import ActivitySketches, ActivityLeaders
+from bot.utils.backup import BackupManager
+from bot.utils.dm_queue import DMQueue
+from bot.utils.response_cache import ResponseCache
+from bot.utils.headtohead import HeadToHead
+from bot.utils.predictions import PredictionVotes, PredictionButton
+from bot.utils.activity_log import ActivityLog
+from bot.utils.admission import AdmissionControl, AdmissionTree
+from bot.utils.protection import Protection
 from bot.commands.admin import AdminCommands
 from bot.commands.match import MatchCommands
 from bot.commands.help import HelpCommands
 from bot.commands.advanced import AdvancedCommands
 
 class XSportBSBot(commands.Bot):
-    def __init__(self):
+    def __init__(self, **options):
         intents = discord.Intents.default()
         intents.message_content = True
         intents.members = True
         intents.guilds = True
         
+        # MEMBER_CACHE_MODE=lazy skips startup chunking; members are loaded per guild on demand
+        member_cache_mode = get_member_cache_mode()
+        options.update(member_cache_options(member_cache_mode))
+        
         super().__init__(
             command_prefix='!',
             intents=intents,
-            help_command=None
+            help_command=None,
+            tree_cls=AdmissionTree,
+            **options
         )
         
         # Initialize database and scheduler
         self.db = Database()
         self.scheduler = MatchScheduler(self)
+        self.shard_stats = ShardStats()
+        self.member_cache = MemberCacheManager(
+            self,
+            member_cache_mode,
+            idle_seconds=int(os.getenv("MEMBER_CACHE_IDLE", "1800"))
+        )
+        self.mentions = MentionResolver(
+            self,
+            maxsize=int(os.getenv("MENTION_CACHE_SIZE", "10000")),
+            fetched_ttl=float(os.getenv("MENTION_CACHE_TTL", "300"))
+        )
+        self.dm_queue = DMQueue(self)
+        
+        # Rendered replies of read-only commands, dropped when their tables change
+        self.responses = ResponseCache(
+            maxsize=int(os.getenv("RESPONSE_CACHE_SIZE", "1024")),
+            ttl=float(os.getenv("RESPONSE_CACHE_TTL", "60"))
+        )
+        self.db.add_change_listener(self.responses.invalidate)
+        
+        # Per-user, per-guild and global token buckets checked before every app command
+        self.admission = AdmissionControl()
+        
+        # Stored guild/user language overrides, kept hot in memory
+        self.language_prefs = LanguagePreferences(self.db)
+        self.language_prefs.load()
+        
+        # Unique active member estimates (HyperLogLog per guild and day)
+        self.active_members = ActivitySketches(self.db)
+        
+        # Most active members per guild (bounded Space-Saving counters)
+        self.leaders = ActivityLeaders(self.db)
+        self.leaders.load()
+        
+        # Head-to-head records and recent form, rebuilt from match results
+        self.head_to_head = HeadToHead(self.db)
+        self.head_to_head.load()
+        
+        # Match winner predictions (votes buffered in memory, flushed in batches)
+        self.predictions = PredictionVotes(self)
+        self.predictions.load()
+        
+        # Online database snapshots (BACKUP_INTERVAL_HOURS=0 disables the schedule)
+        self.backups = BackupManager(
+            self.db.db_path,
+            os.getenv("BACKUP_DIR", "backups"),
+            keep=int(os.getenv("BACKUP_KEEP", "7")),
+            interval_hours=float(os.getenv("BACKUP_INTERVAL_HOURS", "24"))
+        )
         
         # Language settings
-        self.languages = ['es', 'en', 'pt']  # Spanish primary, English, Portuguese
-        self.default_language = 'es'
+        self.languages = list(SUPPORTED_LANGUAGES)  # Spanish primary; catalogs load on first use
+        self.default_language = DEFAULT_LANGUAGE
         
         # Server settings
         self.log_channels = {}
         self.allowed_channels = {}
         
+        # Log-channel events, posted as digests (LOG_DIGEST_SECONDS apart or every LOG_DIGEST_EVENTS events)
+        self.activity_log = ActivityLog(
+            self,
+            interval=float(os.getenv("LOG_DIGEST_SECONDS", "30")),
+            max_events=int(os.getenv("LOG_DIGEST_EVENTS", "50"))
+        )
+        
+        # Channels receiving scheduled announcements at the same time
+        self.announcement_slots = asyncio.Semaphore(int(os.getenv("ANNOUNCE_CONCURRENCY", "10")))
+        
+        # Join-flood and message-spam detection (RAID_JOINS / SPAM_MESSAGES thresholds)
+        self.protection = Protection(self)
+        
     async def setup_hook(self):
         """Setup hook called when bot is starting"""
+        # Check translation coverage; only the default language is compiled up front,
+        # the other catalogs load when a user with that locale first runs a command
+        for scope, missing in validate_translations().items():
+            print(f"Missing translations in {scope}: {', '.join(missing)}")
+        precompile_templates([self.default_language])
+        
+        # A database that just gained the rating column replays its history once, before
+        # commands can use the ratings, in a thread so the event loop keeps running
+        if self.db.ratings_pending:
+            await asyncio.to_thread(self.db.recompute_ratings)
+            self.db.ratings_pending = False
+        
         # Add command cogs
         await self.add_cog(AdminCommands(self))
         await self.add_cog(MatchCommands(self))
         await self.add_cog(HelpCommands(self))
         await self.add_cog(AdvancedCommands(self))
         
+        # Prediction buttons are routed by custom ID, so old match messages keep working
+        self.add_dynamic_items(PredictionButton)
+        
         # Start scheduler
         self.scheduler.start()
         
+        # Start the shared DM sender
+        asyncio.create_task(self.dm_queue.run())
+        
+        # Post log-channel digests
+        asyncio.create_task(self.activity_log.run())
+        
+        # End raid and spam bursts once their rate drops
+        asyncio.create_task(self.protection.run())
+        
         # Start announcement checker
         asyncio.create_task(self.check_scheduled_announcements())
         
+        # Evict member caches of idle guilds in lazy mode
+        if self.member_cache.lazy:
+            asyncio.create_task(self.member_cache.run_evictions())
+        
+        # Persist activity sketches periodically
+        asyncio.create_task(self.active_members.run_flusher(self))
+        asyncio.create_task(self.leaders.run_checkpointer(self))
+        asyncio.create_task(self.predictions.run_flusher())
+        
+        # Scheduled backups run in a single process (the one holding shard 0)
+        local_shards = self.get_local_shard_ids()
+        if self.backups.interval_hours > 0 and (local_shards is None or 0 in local_shards):
+            asyncio.create_task(self.backups.run_schedule(self))
+        
         # Sync slash commands
         try:
             synced = await self.tree.sync()
@@ -69,65 +190,110 @@ class XSportBSBot(commands.Bot):
         )
         await self.change_presence(activity=activity)
     
+    async def on_shard_connect(self, shard_id):
+        """Called when a shard connects to the gateway"""
+        self.shard_stats.set_connected(shard_id, True)
+    
+    async def on_shard_resumed(self, shard_id):
+        """Called when a shard resumes its session"""
+        self.shard_stats.set_connected(shard_id, True)
+    
+    async def on_shard_disconnect(self, shard_id):
+        """Called when a shard loses its gateway connection"""
+        self.shard_stats.set_connected(shard_id, False)
+    
+    async def on_interaction(self, interaction):
+        """Called for every interaction (commands, buttons)"""
+        if interaction.guild_id:
+            self.shard_stats.record(self.get_shard_id(interaction.guild_id))
+    
     async def on_guild_join(self, guild):
         """Called when bot joins a new guild"""
+        self.shard_stats.record(guild.shard_id)
         self.db.log_event('guild_join', guild.id, f"Joined guild: {guild.name}")
         print(f"Joined new guild: {guild.name} (ID: {guild.id})")
     
     async def on_guild_remove(self, guild):
         """Called when bot leaves a guild"""
+        self.shard_stats.record(guild.shard_id)
+        self.mentions.invalidate_guild(guild.id)
         self.db.log_event('guild_leave', guild.id, f"Left guild: {guild.name}")
         print(f"Left guild: {guild.name} (ID: {guild.id})")
     
     async def on_member_join(self, member):
         """Called when a member joins a guild"""
+        self.shard_stats.record(member.guild.shard_id)
+        self.active_members.record(member.guild.id, member.id)
+        if await self.protection.member_joined(member):
+            return
         self.db.log_member_activity(member.guild.id, member.id, 'join')
         self.db.log_event('member_join', member.guild.id, f"Member joined: {member.display_name}")
     
     async def on_member_remove(self, member):
         """Called when a member leaves a guild"""
+        self.shard_stats.record(member.guild.shard_id)
+        self.mentions.invalidate_member(member.guild.id, member.id)
+        if self.protection.member_left(member):
+            return
         self.db.log_member_activity(member.guild.id, member.id, 'leave')
         self.db.log_event('member_leave', member.guild.id, f"Member left: {member.display_name}")
     
-    async def on_message(self, message):
-        """Called when a message is sent"""
-        if message.author.bot:
-            return
-        
-        # Log member activity
-        self.db.log_member_activity(message.guild.id, message.author.id, 'message')
-        
-        # Process commands if any
-        await self.process_commands(message)
+    async def on_guild_role_update(self, before, after):
+        """Called when a role is edited"""
+        if before.name != after.name:
+            self.mentions.invalidate_role(after.guild.id, after.id)
+    
+    async def on_guild_role_delete(self, role):
+        """Called when a role is deleted"""
+        self.mentions.invalidate_role(role.guild.id, role.id)
+    
+    async def on_member_update(self, before, after):
+        """Called when a member's nickname or roles change"""
+        if before.display_name != after.display_name:
+            self.mentions.invalidate_member(after.guild.id, after.id)
+    
+    async def on_user_update(self, before, after):
+        """Called when a user's global name changes"""
+        if before.display_name != after.display_name:
+            self.mentions.invalidate_user(after.id)
     
     async def check_scheduled_announcements(self):
-        """Check and send scheduled announcements"""
+        """Check and send scheduled announcements for this bot's shards"""
+        await self.wait_until_ready()
+        
         while not self.is_closed():
             try:
-                pending_announcements = self.db.get_pending_announcements()
+                # Only connected shards are queried, so a disconnected shard's backlog delays
+                # its own guilds without filling the batch limit ahead of everyone else's
+                local_shards = self.get_local_shard_ids()
+                if local_shards is None:
+                    shard_ids = None if self.is_shard_ready(None) else []
+                else:
+                    shard_ids = [shard_id for shard_id in local_shards if self.is_shard_ready(shard_id)]
+                pending_announcements = self.db.get_pending_announcements(
+                    shard_count=self.shard_count,
+                    shard_ids=shard_ids
+                ) if shard_ids != [] else []
                 
+                # Each channel gets its announcements in due order; channels are served concurrently
+                by_channel = {}
                 for announcement in pending_announcements:
-                    announcement_id, guild_id, channel_id, message, schedule_time = announcement
+                    by_channel.setdefault(announcement[2], []).append(announcement)
+                
+                if by_channel:
+                    outcomes = await asyncio.gather(*(
+                        self._send_channel_announcements(announcements) for announcements in by_channel.values()
+                    ))
                     
-                    guild = self.get_guild(guild_id)
-                    if guild:
-                        channel = guild.get_channel(channel_id)
-                        if channel:
-                            embed = discord.Embed(
-                                title="📢 Anuncio Programado",
-                                description=message,
-                                color=0x0099ff,
-                                timestamp=datetime.utcnow()
-                            )
-                            
-                            try:
-                                await channel.send(embed=embed)
-                                self.db.mark_announcement_sent(announcement_id)
-                                self.db.log_event('announcement_sent', guild_id, f"Sent scheduled announcement to #{channel.name}")
-                            except discord.Forbidden:
-                                print(f"No permission to send announcement in {channel.name}")
-                            except Exception as e:
-                                print(f"Error sending announcement: {e}")
+                    # One transaction per cycle for every sent-mark, retirement and event log;
+                    # undeliverable announcements leave the due set too, so they can't starve newer ones
+                    results = [result for channel_results in outcomes for result in channel_results]
+                    if results:
+                        self.db.finish_announcements(
+                            [announcement_id for announcement_id, sent, _ in results if sent],
+                            [announcement_id for announcement_id, sent, _ in results if not sent],
+                            [event for _, _, event in results]
+                        )
                 
                 # Check every minute
                 await asyncio.sleep(60)
@@ -136,38 +302,131 @@ class XSportBSBot(commands.Bot):
                 print(f"Error checking announcements: {e}")
                 await asyncio.sleep(60)
     
+    async def _send_channel_announcements(self, announcements):
+        """Send one channel's due announcements in order; returns [(announcement_id, sent, event)]"""
+        results = []
+        async with self.announcement_slots:
+            for announcement in announcements:
+                sent, event = await self._send_announcement(announcement)
+                results.append((announcement[0], sent, event))
+        return results
+    
+    async def _send_announcement(self, announcement):
+        """Send a single scheduled announcement; returns (sent, event_logs row)"""
+        announcement_id, guild_id, channel_id, message, schedule_time = announcement
+        
+        guild = self.get_guild(guild_id)
+        channel = guild.get_channel(channel_id) if guild else None
+        if not channel:
+            return False, ('announcement_failed', guild_id, f"Announcement {announcement_id}: channel {channel_id} not found")
+        
+        language = self.language_prefs.language_for(guild_id=guild_id)
+        embed = build_embed("announcement", language, description=message)
+        
+        try:
+            await channel.send(embed=embed)
+            return True, ('announcement_sent', guild_id, f"Sent scheduled announcement to #{channel.name}")
+        except discord.Forbidden:
+            print(f"No permission to send announcement in {channel.name}")
+            reason = f"no permission in #{channel.name}"
+        except Exception as e:
+            print(f"Error sending announcement: {e}")
+            reason = str(e)
+        return False, ('announcement_failed', guild_id, f"Announcement {announcement_id}: {reason}")
+    
     async def on_message(self, message):
         """Called when a message is sent"""
-        if message.author == self.user:
-            # Log bot messages in allowed channels
-            if message.guild and message.guild.id in self.log_channels:
-                log_channel_id = self.log_channels[message.guild.id]
-                log_channel = self.get_channel(log_channel_id)
-                if log_channel and log_channel != message.channel:
-                    embed = discord.Embed(
-                        title="Bot Activity",
-                        description=f"Bot spoke in {message.channel.mention}",
-                        color=0x00ff00,
-                        timestamp=datetime.utcnow()
-                    )
-                    try:
-                        await log_channel.send(embed=embed)
-                    except:
-                        pass
-        
-        await self.process_commands(message)
+        if message.guild:
+            self.shard_stats.record(message.guild.shard_id)
+            if not message.author.bot:
+                # Log member activity
+                self.active_members.record(message.guild.id, message.author.id)
+                self.leaders.record(message.guild.id, message.author.id)
+                if not await self.protection.message_sent(message):
+                    self.db.log_member_activity(message.guild.id, message.author.id, 'message')
+            elif message.author == self.user and message.channel.id != self.log_channels.get(message.guild.id):
+                # Mirror bot messages to the log channel as a periodic digest
+                self.activity_log.record(message.guild.id, 'bot_message', message.channel.id)
+        
+        # Process commands if any
+        if not message.author.bot:
+            await self.process_commands(message)
+    
+    async def close(self):
+        """Persist pending activity sketches, leader counters and prediction votes before shutting down"""
+        try:
+            self.active_members.flush()
+            self.leaders.checkpoint()
+            self.predictions.flush()
+        except Exception as e:
+            print(f"Error flushing activity data: {e}")
+        await super().close()
+    
+    def get_shard_id(self, guild_id):
+        """Get the shard that owns a guild"""
+        return shard_id_for(guild_id, self.shard_count)
+    
+    def get_local_shard_ids(self):
+        """Get the shard IDs handled by this process, or None when unsharded"""
+        if not self.shard_count:
+            return None
+        if getattr(self, 'shard_ids', None) is not None:
+            return list(self.shard_ids)
+        if self.shard_id is not None:
+            return [self.shard_id]
+        return list(range(self.shard_count))
+    
+    def owns_guild(self, guild_id):
+        """Check if a guild belongs to one of this process's shards"""
+        local = self.get_local_shard_ids()
+        return local is None or self.get_shard_id(guild_id) in local
+    
+    def is_shard_ready(self, shard_id):
+        """Check if the shard's gateway connection is up"""
+        return self.shard_stats.connected.get(shard_id or 0, True)
+    
+    def get_shard_latencies(self):
+        """Get (shard_id, latency) pairs for this process's shards"""
+        return [(self.shard_id or 0, self.latency)]
+    
+    def get_stats_snapshot(self):
+        """Collect guild, user and per-shard statistics"""
+        shards = {}
+        for shard_id, latency in self.get_shard_latencies():
+            shard = self.shard_stats.snapshot(shard_id)
+            shard['latency_ms'] = round(latency * 1000, 1) if latency == latency else None
+            shard['guilds'] = 0
+            shard['users'] = 0
+            shards[shard_id] = shard
+        
+        for guild in self.guilds:
+            shard = shards.get(guild.shard_id)
+            if shard is None:
+                continue
+            shard['guilds'] += 1
+            shard['users'] += guild.member_count or 0
+        
+        return {
+            'guilds': sum(shard['guilds'] for shard in shards.values()),
+            'users': sum(shard['users'] for shard in shards.values()),
+            'shard_count': self.shard_count or 1,
+            'member_cache': self.member_cache.stats(),
+            'mention_cache': self.mentions.stats(),
+            'dm_queue': self.dm_queue.stats(),
+            'response_cache': self.responses.stats(),
+            'admission': self.admission.stats(),
+            'activity_log': self.activity_log.stats(),
+            'protection': self.protection.stats(),
+            'shards': [dict(shard, shard_id=shard_id) for shard_id, shard in sorted(shards.items())]
+        }
     
     def get_user_language(self, interaction):
-        """Get user's preferred language from interaction locale"""
-        locale = str(interaction.locale)
-        if locale.startswith('es'):
-            return 'es'
-        elif locale.startswith('en'):
-            return 'en'
-        elif locale.startswith('pt'):
-            return 'pt'
-        else:
-            return self.default_language
+        """Get user's language: stored user/guild override, then interaction locale"""
+        return self.language_prefs.language_for(
+            interaction.user.id,
+            interaction.guild_id,
+            interaction.locale
+        )
     
     async def send_dm_to_role(self, guild, role_id, content, language='es'):
         """Send DM to all members of a role"""
@@ -175,6 +434,8 @@ class XSportBSBot(commands.Bot):
         if not role:
             return 0
         
+        await self.member_cache.ensure_chunked(guild)
+        
         sent_count = 0
         for member in role.members:
             try:
@@ -189,6 +450,9 @@ class XSportBSBot(commands.Bot):
     def is_admin(self, user, guild):
         """Check if user is admin"""
         member = guild.get_member(user.id)
+        if not member and isinstance(user, discord.Member) and user.guild.id == guild.id:
+            # Interaction users are full members even when the cache doesn't hold them
+            member = user
         if not member:
             return False
         
@@ -203,3 +467,35 @@ class XSportBSBot(commands.Bot):
         
         allowed = self.allowed_channels[guild_id]
         return channel_id in allowed if allowed else True
+
+
+class XSportBSShardedBot(XSportBSBot, commands.AutoShardedBot):
+    """XSportBSBot running one gateway connection per shard"""
+    
+    def get_shard_latencies(self):
+        """Get (shard_id, latency) pairs for this process's shards"""
+        return self.latencies
+    
+    def is_shard_ready(self, shard_id):
+        """Check if the shard's gateway connection is up"""
+        shard = self.get_shard(shard_id)
+        return shard is not None and not shard.is_closed()
+
+
+def create_bot(sharded=None, shard_count=None, shard_ids=None):
+    """Create the bot, sharded when requested or configured via BOT_SHARDED"""
+    if sharded is None:
+        sharded = os.getenv("BOT_SHARDED", "").lower() in ("1", "true", "yes")
+    
+    if not sharded:
+        return XSportBSBot()
+    
+    options = {}
+    if shard_count is None and os.getenv("SHARD_COUNT"):
+        shard_count = int(os.getenv("SHARD_COUNT"))
+    if shard_count is not None:
+        options['shard_count'] = shard_count
+    if shard_ids is not None:
+        options['shard_ids'] = list(shard_ids)
+    
+    return XSportBSShardedBot(**options)
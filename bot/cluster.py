@@ -0,0 +1,275 @@
+import asyncio
+import multiprocessing
+import signal
+import threading
+import time
+from multiprocessing.connection import wait
+
+import discord
+
+from bot.utils.database import Database
+from bot.utils.sketches import ActivitySketches
+
+
+def shard_ranges(shard_count, workers):
+    """Split shard IDs into contiguous ranges, one per worker"""
+    workers = max(1, min(workers, shard_count))
+    base, extra = divmod(shard_count, workers)
+
+    ranges = []
+    start = 0
+    for index in range(workers):
+        size = base + (1 if index < extra else 0)
+        ranges.append(list(range(start, start + size)))
+        start += size
+    return ranges
+
+
+def fetch_recommended_shards(token):
+    """Ask Discord for the recommended shard count"""
+    # requests is only in requirements.txt; needed here alone, when SHARD_COUNT isn't set
+    import requests
+
+    response = requests.get(
+        'https://discord.com/api/v10/gateway/bot',
+        headers={'Authorization': f'Bot {token}'},
+        timeout=10
+    )
+    response.raise_for_status()
+    return response.json()['shards']
+
+
+def _worker_main(index, shard_ids, shard_count, token, conn, stats_interval):
+    """Entry point of a worker process: run the bot on a shard range"""
+    from bot.bot import create_bot
+
+    bot = create_bot(sharded=True, shard_count=shard_count, shard_ids=shard_ids)
+
+    def publish_language(scope, target_id, language):
+        try:
+            conn.send(('language', (scope, target_id, language)))
+        except (BrokenPipeError, EOFError, OSError):
+            pass
+
+    def receive():
+        """Apply language changes relayed by the supervisor from other workers"""
+        try:
+            while conn.poll():
+                kind, payload = conn.recv()
+                if kind == 'language':
+                    bot.language_prefs.apply(*payload)
+        except (EOFError, OSError):
+            asyncio.get_running_loop().remove_reader(conn.fileno())
+
+    bot.language_prefs.on_change = publish_language
+
+    async def report_stats():
+        await bot.wait_until_ready()
+        while not bot.is_closed():
+            try:
+                conn.send(('stats', bot.get_stats_snapshot()))
+            except (BrokenPipeError, EOFError, OSError):
+                return
+            except Exception as e:
+                print(f"[worker {index}] Error reporting stats: {e}")
+            await asyncio.sleep(stats_interval)
+
+    async def runner():
+        async with bot:
+            asyncio.get_running_loop().add_reader(conn.fileno(), receive)
+            asyncio.create_task(report_stats())
+            await bot.start(token)
+
+    print(f"[worker {index}] Starting shards {shard_ids[0]}-{shard_ids[-1]} of {shard_count}")
+    discord.utils.setup_logging()
+    asyncio.run(runner())
+
+
+class Worker:
+    """Supervisor-side handle of a worker process"""
+
+    def __init__(self, index, shard_ids):
+        self.index = index
+        self.shard_ids = shard_ids
+        self.process = None
+        self.conn = None
+        self.started_at = 0
+        self.restarts = 0
+        self.stats = None
+
+
+class ClusterSupervisor:
+    """Spawns worker processes, restarts crashed ones and aggregates their stats"""
+
+    # Restart backoff bounds (seconds); reset once a worker stays up for STABLE_SECONDS
+    MIN_BACKOFF = 5
+    MAX_BACKOFF = 300
+    STABLE_SECONDS = 120
+
+    def __init__(self, token, workers, shard_count=None, stats_interval=10):
+        self.token = token
+        self.shard_count = shard_count or fetch_recommended_shards(token)
+        self.stats_interval = stats_interval
+        self.workers = [
+            Worker(index, shard_ids)
+            for index, shard_ids in enumerate(shard_ranges(self.shard_count, workers))
+        ]
+        self.lock = threading.Lock()
+        self.running = False
+        self.context = multiprocessing.get_context('spawn')
+
+        # Workers write to the shared database; the dashboard reads sketches and searches from here
+        self.db = Database()
+        if self.db.ratings_pending:
+            # The supervisor migrates the shared database before any worker starts
+            self.db.recompute_ratings()
+            self.db.ratings_pending = False
+        self.active_members = ActivitySketches(self.db)
+
+    def _spawn(self, worker):
+        """Start (or restart) a worker process"""
+        # Duplex: workers report stats and language changes, the supervisor relays the latter
+        parent_conn, child_conn = self.context.Pipe()
+        worker.process = self.context.Process(
+            target=_worker_main,
+            args=(worker.index, worker.shard_ids, self.shard_count, self.token, child_conn, self.stats_interval),
+            name=f"xsportbs-worker-{worker.index}",
+            daemon=True
+        )
+        worker.process.start()
+        child_conn.close()
+        worker.conn = parent_conn
+        worker.started_at = time.monotonic()
+        worker.stats = None
+
+    def _backoff(self, worker):
+        """Delay before restarting a worker that keeps crashing"""
+        if time.monotonic() - worker.started_at > self.STABLE_SECONDS:
+            worker.restarts = 0
+        return min(self.MAX_BACKOFF, self.MIN_BACKOFF * 2 ** worker.restarts)
+
+    def _read_stats(self, timeout):
+        """Receive stats and language-change messages from workers over their pipes"""
+        conns = {worker.conn: worker for worker in self.workers if worker.conn}
+        if not conns:
+            time.sleep(timeout)
+            return
+
+        for conn in wait(list(conns), timeout=timeout):
+            worker = conns[conn]
+            try:
+                kind, payload = conn.recv()
+            except (EOFError, OSError):
+                conn.close()
+                worker.conn = None
+                continue
+
+            if kind == 'stats':
+                with self.lock:
+                    worker.stats = payload
+            elif kind == 'language':
+                self._relay(worker, kind, payload)
+
+    def _relay(self, source, kind, payload):
+        """Forward a worker's cache invalidation to every other running worker"""
+        for worker in self.workers:
+            if worker is source or worker.conn is None:
+                continue
+            try:
+                worker.conn.send((kind, payload))
+            except (BrokenPipeError, EOFError, OSError):
+                pass
+
+    def run(self):
+        """Run the supervisor loop until interrupted"""
+        self.running = True
+        signal.signal(signal.SIGTERM, lambda *_: self.stop())
+
+        for worker in self.workers:
+            self._spawn(worker)
+
+        restart_at = {}
+        try:
+            while self.running:
+                self._read_stats(timeout=1)
+
+                for worker in self.workers:
+                    if worker.process.is_alive():
+                        continue
+
+                    if worker.process.exitcode == 0:
+                        # Clean shutdown (e.g. bot.close()); don't respawn
+                        continue
+
+                    if worker.index not in restart_at:
+                        delay = self._backoff(worker)
+                        restart_at[worker.index] = time.monotonic() + delay
+                        print(f"Worker {worker.index} exited with code {worker.process.exitcode}, restarting in {delay}s")
+                    elif time.monotonic() >= restart_at[worker.index]:
+                        del restart_at[worker.index]
+                        worker.restarts += 1
+                        self._spawn(worker)
+
+                if all(w.process.exitcode == 0 for w in self.workers):
+                    break
+        except KeyboardInterrupt:
+            pass
+        finally:
+            self.stop()
+
+    def stop(self):
+        """Terminate all workers"""
+        self.running = False
+        for worker in self.workers:
+            if worker.process and worker.process.is_alive():
+                worker.process.terminate()
+        for worker in self.workers:
+            if worker.process:
+                worker.process.join(timeout=10)
+
+    def get_stats_snapshot(self):
+        """Aggregate the latest stats reported by every worker"""
+        with self.lock:
+            workers = [(worker, worker.stats) for worker in self.workers]
+
+        shards = []
+        guilds = 0
+        users = 0
+        worker_info = []
+        for worker, stats in workers:
+            alive = bool(worker.process and worker.process.is_alive())
+            worker_info.append({
+                'worker': worker.index,
+                'pid': worker.process.pid if worker.process else None,
+                'alive': alive,
+                'restarts': worker.restarts,
+                'shard_ids': [worker.shard_ids[0], worker.shard_ids[-1]],
+                'reporting': stats is not None
+            })
+            if stats and alive:
+                guilds += stats['guilds']
+                users += stats['users']
+                shards.extend(stats['shards'])
+
+        return {
+            'guilds': guilds,
+            'users': users,
+            'shard_count': self.shard_count,
+            'shards': sorted(shards, key=lambda shard: shard['shard_id']),
+            'workers': worker_info
+        }
+
+
+def run_cluster(token, workers, shard_count=None):
+    """Start the dashboard and supervise a cluster of bot workers"""
+    from keep_alive import keep_alive
+    from web.app import dashboard
+
+    supervisor = ClusterSupervisor(token, workers, shard_count)
+    print(f"Starting cluster: {len(supervisor.workers)} workers, {supervisor.shard_count} shards")
+
+    # The dashboard lives in the supervisor and reads the aggregated stats
+    dashboard.bot = supervisor
+    keep_alive()
+
+    supervisor.run()
@@ -1,9 +1,10 @@
 import discord
 from discord.ext import commands
 from discord import app_commands
-from bot.utils.translations import get_translation
+from bot.utils.translations import get_translation, build_embed, error_embed, get_embed_template
 from datetime import datetime
 import asyncio
+from bot.commands.help import LANGUAGE_CHOICES
 
 class AdminCommands(commands.Cog):
     def __init__(self, bot):
@@ -18,23 +19,15 @@ class AdminCommands(commands.Cog):
         """Set log channel for bot activities"""
         if not self.bot.is_admin(interaction.user, interaction.guild):
             lang = self.bot.get_user_language(interaction)
-            embed = discord.Embed(
-                title=get_translation("error", lang),
-                description=get_translation("admin_only", lang),
-                color=0xff0000
-            )
+            embed = build_embed("admin_only", lang)
             await interaction.response.send_message(embed=embed, ephemeral=True)
             return
         
         self.bot.log_channels[interaction.guild.id] = channel.id
         lang = self.bot.get_user_language(interaction)
         
-        embed = discord.Embed(
-            title=get_translation("success", lang),
-            description=get_translation("log_channel_set", lang).format(channel=channel.mention),
-            color=0x00ff00,
-            timestamp=datetime.utcnow()
-        )
+        description = get_translation("log_channel_set", lang).format(channel=channel.mention)
+        embed = build_embed("success", lang, description=description)
         
         await interaction.response.send_message(embed=embed)
         self.bot.db.log_command('setlogchannel', interaction.user.id, interaction.guild.id)
@@ -48,11 +41,7 @@ class AdminCommands(commands.Cog):
         """Set allowed channels for bot usage"""
         if not self.bot.is_admin(interaction.user, interaction.guild):
             lang = self.bot.get_user_language(interaction)
-            embed = discord.Embed(
-                title=get_translation("error", lang),
-                description=get_translation("admin_only", lang),
-                color=0xff0000
-            )
+            embed = build_embed("admin_only", lang)
             await interaction.response.send_message(embed=embed, ephemeral=True)
             return
         
@@ -67,25 +56,15 @@ class AdminCommands(commands.Cog):
                 if channel:
                     channel_mentions.append(channel.mention)
             
-            embed = discord.Embed(
-                title=get_translation("success", lang),
-                description=get_translation("channels_set", lang).format(
-                    channels=", ".join(channel_mentions)
-                ),
-                color=0x00ff00,
-                timestamp=datetime.utcnow()
-            )
+            description = get_translation("channels_set", lang).format(channels=", ".join(channel_mentions))
+            embed = build_embed("success", lang, description=description)
             
             await interaction.response.send_message(embed=embed)
             self.bot.db.log_command('setchannels', interaction.user.id, interaction.guild.id)
             
         except ValueError:
             lang = self.bot.get_user_language(interaction)
-            embed = discord.Embed(
-                title=get_translation("error", lang),
-                description=get_translation("invalid_channel_ids", lang),
-                color=0xff0000
-            )
+            embed = error_embed("invalid_channel_ids", lang)
             await interaction.response.send_message(embed=embed, ephemeral=True)
     
     @app_commands.command(
@@ -100,11 +79,7 @@ class AdminCommands(commands.Cog):
         """Send DM to specific user"""
         if not self.bot.is_admin(interaction.user, interaction.guild):
             lang = self.bot.get_user_language(interaction)
-            embed = discord.Embed(
-                title=get_translation("error", lang),
-                description=get_translation("admin_only", lang),
-                color=0xff0000
-            )
+            embed = build_embed("admin_only", lang)
             await interaction.response.send_message(embed=embed, ephemeral=True)
             return
         
@@ -113,22 +88,14 @@ class AdminCommands(commands.Cog):
         try:
             await user.send(message)
             
-            embed = discord.Embed(
-                title=get_translation("success", lang),
-                description=get_translation("dm_sent", lang).format(user=user.mention),
-                color=0x00ff00,
-                timestamp=datetime.utcnow()
-            )
+            description = get_translation("dm_sent", lang).format(user=user.mention)
+            embed = build_embed("success", lang, description=description)
             
             await interaction.response.send_message(embed=embed)
             self.bot.db.log_command('dmuser', interaction.user.id, interaction.guild.id)
             
         except discord.Forbidden:
-            embed = discord.Embed(
-                title=get_translation("error", lang),
-                description=get_translation("dm_failed", lang),
-                color=0xff0000
-            )
+            embed = error_embed("dm_failed", lang)
             await interaction.response.send_message(embed=embed, ephemeral=True)
     
     @app_commands.command(
@@ -143,11 +110,7 @@ class AdminCommands(commands.Cog):
         """Send DM to all members of a role"""
         if not self.bot.is_admin(interaction.user, interaction.guild):
             lang = self.bot.get_user_language(interaction)
-            embed = discord.Embed(
-                title=get_translation("error", lang),
-                description=get_translation("admin_only", lang),
-                color=0xff0000
-            )
+            embed = build_embed("admin_only", lang)
             await interaction.response.send_message(embed=embed, ephemeral=True)
             return
         
@@ -157,15 +120,8 @@ class AdminCommands(commands.Cog):
         
         sent_count = await self.bot.send_dm_to_role(interaction.guild, role.id, message, lang)
         
-        embed = discord.Embed(
-            title=get_translation("success", lang),
-            description=get_translation("role_dm_sent", lang).format(
-                count=sent_count,
-                role=role.mention
-            ),
-            color=0x00ff00,
-            timestamp=datetime.utcnow()
-        )
+        description = get_translation("role_dm_sent", lang).format(count=sent_count, role=role.mention)
+        embed = build_embed("success", lang, description=description)
         
         await interaction.followup.send(embed=embed)
         self.bot.db.log_command('dmrole', interaction.user.id, interaction.guild.id)
@@ -191,11 +147,7 @@ class AdminCommands(commands.Cog):
         """Send custom embed with optional image"""
         if not self.bot.is_admin(interaction.user, interaction.guild):
             lang = self.bot.get_user_language(interaction)
-            embed = discord.Embed(
-                title=get_translation("error", lang),
-                description=get_translation("admin_only", lang),
-                color=0xff0000
-            )
+            embed = build_embed("admin_only", lang)
             await interaction.response.send_message(embed=embed, ephemeral=True)
             return
         
@@ -221,13 +173,159 @@ class AdminCommands(commands.Cog):
                 embed.set_image(url=image.url)
             else:
                 lang = self.bot.get_user_language(interaction)
-                error_embed = discord.Embed(
-                    title=get_translation("error", lang),
-                    description=get_translation("invalid_image", lang),
-                    color=0xff0000
-                )
-                await interaction.response.send_message(embed=error_embed, ephemeral=True)
+                invalid_embed = error_embed("invalid_image", lang)
+                await interaction.response.send_message(embed=invalid_embed, ephemeral=True)
                 return
         
         await interaction.response.send_message(embed=embed)
         self.bot.db.log_command('customembed', interaction.user.id, interaction.guild.id)
+    
+    @app_commands.command(
+        name="serverlanguage",
+        description="Set the server's default language"
+    )
+    @app_commands.describe(language="Default language for this server, or Auto to use each user's language")
+    @app_commands.choices(language=LANGUAGE_CHOICES)
+    async def set_server_language(self, interaction: discord.Interaction, language: app_commands.Choice[str]):
+        """Store the guild's language override"""
+        if not self.bot.is_admin(interaction.user, interaction.guild):
+            lang = self.bot.get_user_language(interaction)
+            embed = build_embed("admin_only", lang)
+            await interaction.response.send_message(embed=embed, ephemeral=True)
+            return
+        
+        code = None if language.value == "auto" else language.value
+        self.bot.language_prefs.set_guild_language(interaction.guild.id, code)
+        
+        lang = self.bot.get_user_language(interaction)
+        if code:
+            description = get_translation("server_language_set", lang).format(language=language.name)
+        else:
+            description = get_translation("server_language_reset", lang)
+        
+        embed = build_embed("success", lang, description=description)
+        await interaction.response.send_message(embed=embed)
+        self.bot.db.log_command('serverlanguage', interaction.user.id, interaction.guild.id)
+    
+    @app_commands.command(
+        name="activeusers",
+        description="Show how many unique members have been active"
+    )
+    async def active_users(self, interaction: discord.Interaction):
+        """Show approximate unique active members today, this week and this month"""
+        lang = self.bot.get_user_language(interaction)
+        if not self.bot.is_admin(interaction.user, interaction.guild):
+            embed = build_embed("admin_only", lang)
+            await interaction.response.send_message(embed=embed, ephemeral=True)
+            return
+        
+        counts = self.bot.active_members.counts(interaction.guild.id)
+        embed = build_embed(
+            "active_users", lang,
+            f"{counts['today']:,}", f"{counts['week']:,}", f"{counts['month']:,}"
+        )
+        await interaction.response.send_message(embed=embed)
+        self.bot.db.log_command('activeusers', interaction.user.id, interaction.guild.id)
+    
+    @app_commands.command(
+        name="search",
+        description="Search event logs and announcements"
+    )
+    @app_commands.describe(query="Words to search for (end a word with * to match its prefix)", scope="Where to search")
+    @app_commands.choices(scope=[
+        app_commands.Choice(name="All", value="all"),
+        app_commands.Choice(name="Events", value="events"),
+        app_commands.Choice(name="Announcements", value="announcements")
+    ])
+    async def search(self, interaction: discord.Interaction, query: str, scope: app_commands.Choice[str] = None):
+        """Full-text search over this server's event logs and announcements"""
+        lang = self.bot.get_user_language(interaction)
+        if not self.bot.is_admin(interaction.user, interaction.guild):
+            embed = build_embed("admin_only", lang)
+            await interaction.response.send_message(embed=embed, ephemeral=True)
+            return
+        
+        scope = scope.value if scope else "all"
+        guild_id = interaction.guild.id
+        events = self.bot.db.search_events(query, guild_id, 10) if scope in ("all", "events") else []
+        announcements = self.bot.db.search_announcements(query, guild_id, 10) if scope in ("all", "announcements") else []
+        
+        if not events and not announcements:
+            embed = error_embed("no_search_results", lang)
+            await interaction.response.send_message(embed=embed, ephemeral=True)
+            return
+        
+        template = get_embed_template("search_results", lang)
+        labels = template.labels
+        embed = template.build(description=f"🔎 {query}")
+        
+        if events:
+            lines = [f"`{timestamp}` **{event_type}** - {snippet}" for event_type, snippet, timestamp in events]
+            embed.add_field(name=labels["events"], value="\n".join(lines)[:1024], inline=False)
+        if announcements:
+            lines = [
+                f"`{schedule_time}` <#{channel_id}> {'✅' if is_sent else '⏳'} - {snippet}"
+                for channel_id, snippet, schedule_time, is_sent in announcements
+            ]
+            embed.add_field(name=labels["announcements"], value="\n".join(lines)[:1024], inline=False)
+        
+        await interaction.response.send_message(embed=embed, ephemeral=True)
+        self.bot.db.log_command('search', interaction.user.id, interaction.guild.id)
+    
+    @app_commands.command(
+        name="backup",
+        description="Create a database snapshot now (bot owner only)"
+    )
+    async def backup(self, interaction: discord.Interaction):
+        """Take an online snapshot of the database"""
+        lang = self.bot.get_user_language(interaction)
+        # The snapshot covers every guild's data, so only the bot owner may take one
+        if not await self.bot.is_owner(interaction.user):
+            embed = error_embed("owner_only", lang)
+            await interaction.response.send_message(embed=embed, ephemeral=True)
+            return
+        
+        await interaction.response.defer(ephemeral=True)
+        try:
+            report = await self.bot.backups.snapshot()
+        except Exception as e:
+            # The exception text can name server paths; it stays in the console
+            print(f"Error creating backup: {e}")
+            embed = error_embed("backup_failed", lang, error=type(e).__name__)
+            await interaction.followup.send(embed=embed, ephemeral=True)
+            return
+        
+        description = get_translation("backup_created", lang).format(
+            size=f"{report['bytes'] / 1024 / 1024:.1f}",
+            seconds=f"{report['seconds']:.1f}",
+            speed=f"{report['mb_per_second']:.1f}",
+            stall=f"{report['max_step_ms']:.0f}"
+        )
+        embed = build_embed("success", lang, description=description)
+        await interaction.followup.send(embed=embed, ephemeral=True)
+        self.bot.db.log_command('backup', interaction.user.id, interaction.guild.id)
+    
+    @app_commands.command(
+        name="recomputeratings",
+        description="Rebuild team Elo ratings from the match history"
+    )
+    @app_commands.describe(k_factor="Elo K-factor to replay with (default from ELO_K_FACTOR)")
+    async def recompute_ratings(self, interaction: discord.Interaction, k_factor: float = None):
+        """Replay this server's results to rebuild its ratings"""
+        lang = self.bot.get_user_language(interaction)
+        if not self.bot.is_admin(interaction.user, interaction.guild):
+            embed = build_embed("admin_only", lang)
+            await interaction.response.send_message(embed=embed, ephemeral=True)
+            return
+        
+        # Replaying a long history takes a while; keep it off the event loop
+        await interaction.response.defer()
+        if k_factor is not None:
+            matches = await asyncio.to_thread(self.bot.db.recompute_ratings, interaction.guild.id, k_factor)
+        else:
+            matches = await asyncio.to_thread(self.bot.db.recompute_ratings, interaction.guild.id)
+        
+        description = get_translation("ratings_recomputed", lang).format(matches=matches)
+        embed = build_embed("success", lang, description=description)
+        await interaction.followup.send(embed=embed)
+        self.bot.db.log_command('recomputeratings', interaction.user.id, interaction.guild.id)
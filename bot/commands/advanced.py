@@ -1,14 +1,22 @@
 import discord
 from discord.ext import commands
 from discord import app_commands
-from bot.utils.translations import get_translation
+from bot.utils.translations import build_embed, error_embed, get_embed_template, format_datetime, get_translation
+from bot.utils.pagination import KeysetPages
+from bot.utils.fixtures import generate_fixtures
+from bot.utils.ratings import INITIAL_RATING
+from bot.utils.recurrence import Recurrence
 from datetime import datetime, timedelta
 import asyncio
+import re
+
+# One batch entry: "match_id:team1_score-team2_score"
+RESULT_ENTRY = re.compile(r'^#?(\d+):(\d+)-(\d+)$')
+MAX_BATCH_RESULTS = 25
 
 class AdvancedCommands(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
-        self.match_votes = {}  # Store ongoing votes
     
     @app_commands.command(
         name="recordresult",
@@ -29,73 +37,253 @@ class AdvancedCommands(commands.Cog):
         """Record match result"""
         if not self.bot.is_admin(interaction.user, interaction.guild):
             lang = self.bot.get_user_language(interaction)
-            embed = discord.Embed(
-                title=get_translation("error", lang),
-                description=get_translation("admin_only", lang),
-                color=0xff0000
-            )
+            embed = build_embed("admin_only", lang)
             await interaction.response.send_message(embed=embed, ephemeral=True)
             return
         
         lang = self.bot.get_user_language(interaction)
         
-        # Get match info
+        # Claim the match before any await, so a concurrent call can't record it too
         match_commands_cog = self.bot.get_cog('MatchCommands')
-        if not match_commands_cog or match_id not in match_commands_cog.active_matches:
-            embed = discord.Embed(
-                title=get_translation("error", lang),
-                description=get_translation("match_not_found", lang),
-                color=0xff0000
-            )
+        match_info = match_commands_cog.claim_guild_match(interaction.guild.id, match_id) if match_commands_cog else None
+        if match_info is None:
+            embed = error_embed("match_not_found", lang)
             await interaction.response.send_message(embed=embed, ephemeral=True)
             return
         
-        match_info = match_commands_cog.active_matches[match_id]
+        # Knockout fixtures need a winner to advance
+        if match_info.get('bracket') not in (None, 'RR') and team1_score == team2_score:
+            match_commands_cog.active_matches[match_id] = match_info
+            embed = error_embed("knockout_draw", lang)
+            await interaction.response.send_message(embed=embed, ephemeral=True)
+            return
+        
+        if team1_score != team2_score:
+            winner, loser = (match_info['team1'], match_info['team2']) if team1_score > team2_score else (match_info['team2'], match_info['team1'])
+        else:
+            winner = loser = None
         
         # Convert mentions to team names
-        team1_name = await self._extract_team_name(interaction.guild, match_info['team1'])
-        team2_name = await self._extract_team_name(interaction.guild, match_info['team2'])
-        
-        # Save result to database
-        self.bot.db.save_match_result(
-            match_id, 
-            interaction.guild.id, 
-            team1_name, 
-            team2_name, 
-            team1_score, 
-            team2_score, 
-            match_info['datetime']
-        )
+        try:
+            team1_name = await self.bot.mentions.team_name(interaction.guild, match_info['team1'])
+            team2_name = await self.bot.mentions.team_name(interaction.guild, match_info['team2'])
+        except Exception:
+            match_commands_cog.active_matches[match_id] = match_info
+            raise
+        
+        # Save the result, update both Elo ratings and finish the match in one transaction;
+        # None means another command already recorded it
+        recorded = self.bot.db.record_results(interaction.guild.id, [{
+            'match_id': match_id, 'team1': team1_name, 'team2': team2_name, 'team1_score': team1_score,
+            'team2_score': team2_score, 'match_date': match_info['datetime'], 'advance': (winner, loser) if winner else None
+        }])
+        if recorded is None:
+            embed = error_embed("match_not_found", lang)
+            await interaction.response.send_message(embed=embed, ephemeral=True)
+            return
+        [((old1, new1), (old2, new2))], ready, completed = recorded
+        self.bot.head_to_head.record(interaction.guild.id, team1_name, team2_name, team1_score, team2_score, match_info['datetime'])
+        self.bot.predictions.settle(interaction.guild.id, [(match_id, self._outcome(team1_score, team2_score))])
         
         # Create result embed
-        embed = discord.Embed(
-            title=get_translation("match_result_recorded", lang),
-            color=0x00ff00,
-            timestamp=datetime.utcnow()
-        )
+        template = get_embed_template("match_result", lang)
+        labels = template.labels
+        embed = template.build()
         
         # Determine winner and display
         if team1_score > team2_score:
-            winner = team1_name
-            embed.add_field(name="🏆 " + get_translation("winner", lang), value=winner, inline=False)
+            embed.add_field(name="🏆 " + labels["winner"], value=team1_name, inline=False)
         elif team2_score > team1_score:
-            winner = team2_name
-            embed.add_field(name="🏆 " + get_translation("winner", lang), value=winner, inline=False)
+            embed.add_field(name="🏆 " + labels["winner"], value=team2_name, inline=False)
         else:
-            embed.add_field(name="🤝 " + get_translation("result", lang), value=get_translation("draw", lang), inline=False)
+            embed.add_field(name="🤝 " + labels["result"], value=labels["draw"], inline=False)
         
         embed.add_field(
-            name=get_translation("final_score", lang),
+            name=labels["final_score"],
             value=f"{team1_name} {team1_score} - {team2_score} {team2_name}",
             inline=False
         )
+        embed.add_field(
+            name=labels["rating"],
+            value=f"{team1_name}: {new1:.0f} ({new1 - old1:+.0f})\n{team2_name}: {new2:.0f} ({new2 - old2:+.0f})",
+            inline=False
+        )
         
-        # Remove match from active matches
-        del match_commands_cog.active_matches[match_id]
+        # Fixtures that now have both teams become active
+        for row in ready:
+            match_commands_cog.add_active_match(row)
+            embed.add_field(
+                name=labels["next_match"],
+                value=f"#{row[0]} - {row[3]} vs {row[4]}",
+                inline=False
+            )
+        if completed:
+            # A knockout's last match crowns the champion; league tables live in /teamstats
+            champion = winner if match_info['bracket'] != 'RR' else "/teamstats"
+            embed.add_field(name="🏁 " + labels["tournament_complete"], value=champion, inline=False)
         
         await interaction.response.send_message(embed=embed)
         self.bot.db.log_command('recordresult', interaction.user.id, interaction.guild.id)
     
+    @app_commands.command(
+        name="recordresults",
+        description="Record several match results at once"
+    )
+    @app_commands.describe(results="Entries like 12:2-1 13:0-0, separated by spaces or commas")
+    async def record_results(self, interaction: discord.Interaction, results: str):
+        """Record a whole matchday in one transaction"""
+        lang = self.bot.get_user_language(interaction)
+        if not self.bot.is_admin(interaction.user, interaction.guild):
+            embed = build_embed("admin_only", lang)
+            await interaction.response.send_message(embed=embed, ephemeral=True)
+            return
+        
+        match_commands_cog = self.bot.get_cog('MatchCommands')
+        entries = [entry for entry in re.split(r'[\s,;]+', results) if entry]
+        if not entries or len(entries) > MAX_BATCH_RESULTS:
+            embed = error_embed("batch_results_size", lang, limit=MAX_BATCH_RESULTS)
+            await interaction.response.send_message(embed=embed, ephemeral=True)
+            return
+        
+        # Validate everything first: a batch is recorded completely or not at all
+        parsed, problems, seen = [], [], set()
+        for entry in entries:
+            found = RESULT_ENTRY.match(entry)
+            if not found:
+                problems.append(f"`{entry}`: {get_translation('invalid_result_entry', lang)}")
+                continue
+            match_id, team1_score, team2_score = (int(value) for value in found.groups())
+            match_info = match_commands_cog.get_guild_match(interaction.guild.id, match_id) if match_commands_cog else None
+            if match_id in seen:
+                problems.append(f"`{entry}`: {get_translation('duplicate_result_entry', lang)}")
+            elif match_info is None:
+                problems.append(f"`{entry}`: {get_translation('match_not_found', lang)}")
+            elif match_info.get('bracket') not in (None, 'RR') and team1_score == team2_score:
+                problems.append(f"`{entry}`: {get_translation('knockout_draw', lang)}")
+            else:
+                parsed.append((match_id, team1_score, team2_score, match_info))
+            seen.add(match_id)
+        
+        if problems:
+            embed = error_embed("batch_results_invalid", lang)
+            embed.description += "\n\n" + "\n".join(problems)
+            await interaction.response.send_message(embed=embed, ephemeral=True)
+            return
+        
+        # Claim every match before the first await, so concurrent commands can't record them too
+        for match_id, _, _, _ in parsed:
+            del match_commands_cog.active_matches[match_id]
+        
+        try:
+            await interaction.response.defer()
+            
+            batch = []
+            for match_id, team1_score, team2_score, match_info in parsed:
+                if team1_score != team2_score:
+                    advance = (match_info['team1'], match_info['team2']) if team1_score > team2_score else (match_info['team2'], match_info['team1'])
+                else:
+                    advance = None
+                batch.append({
+                    'match_id': match_id,
+                    'team1': await self.bot.mentions.team_name(interaction.guild, match_info['team1']),
+                    'team2': await self.bot.mentions.team_name(interaction.guild, match_info['team2']),
+                    'team1_score': team1_score,
+                    'team2_score': team2_score,
+                    'match_date': match_info['datetime'],
+                    'advance': advance
+                })
+        except Exception:
+            for match_id, _, _, match_info in parsed:
+                match_commands_cog.active_matches[match_id] = match_info
+            raise
+        
+        # None means a match was finished elsewhere in the meantime; nothing was written
+        recorded = self.bot.db.record_results(interaction.guild.id, batch)
+        if recorded is None:
+            embed = error_embed("match_not_found", lang)
+            await interaction.followup.send(embed=embed, ephemeral=True)
+            return
+        changes, ready, completed = recorded
+        for result in batch:
+            self.bot.head_to_head.record(
+                interaction.guild.id, result['team1'], result['team2'], result['team1_score'], result['team2_score'], result['match_date']
+            )
+        self.bot.predictions.settle(interaction.guild.id, [
+            (result['match_id'], self._outcome(result['team1_score'], result['team2_score'])) for result in batch
+        ])
+        
+        # One consolidated embed: a line per result with both rating changes
+        template = get_embed_template("match_results", lang)
+        labels = template.labels
+        lines = []
+        for result, ((old1, new1), (old2, new2)) in zip(batch, changes):
+            lines.append(
+                f"**#{result['match_id']}** {result['team1']} **{result['team1_score']} - {result['team2_score']}** {result['team2']}"
+                f" · {new1:.0f} ({new1 - old1:+.0f}) / {new2:.0f} ({new2 - old2:+.0f})"
+            )
+        embed = template.build(description="\n".join(lines))
+        
+        champions = {}
+        for result, (_, _, _, match_info) in zip(batch, parsed):
+            if match_info['tournament_id'] in completed:
+                # The tournament's last recorded match decides a knockout; leagues point to /teamstats
+                champions[match_info['tournament_id']] = result['advance'][0] if match_info['bracket'] != 'RR' else "/teamstats"
+        
+        if ready:
+            for row in ready:
+                match_commands_cog.add_active_match(row)
+            embed.add_field(
+                name=labels["next_match"],
+                value="\n".join(f"#{row[0]} - {row[3]} vs {row[4]}" for row in ready[:15]),
+                inline=False
+            )
+        for tournament_id, champion in champions.items():
+            embed.add_field(name=f"🏁 {labels['tournament_complete']} (#{tournament_id})", value=champion, inline=False)
+        
+        await interaction.followup.send(embed=embed)
+        self.bot.db.log_command('recordresults', interaction.user.id, interaction.guild.id)
+    
+    @staticmethod
+    def _outcome(team1_score, team2_score):
+        """The winning prediction choice for a score"""
+        if team1_score > team2_score:
+            return 'team1'
+        if team2_score > team1_score:
+            return 'team2'
+        return 'draw'
+    
+    @app_commands.command(
+        name="predictions",
+        description="Show the best match predictors of this server"
+    )
+    async def prediction_leaders(self, interaction: discord.Interaction):
+        """Show the prediction accuracy leaderboard"""
+        lang = self.bot.get_user_language(interaction)
+        embed = self.bot.responses.get_or_build(
+            'predictions', interaction.guild.id, lang, (), ('prediction_scores',),
+            lambda: self._prediction_leaders_embed(interaction.guild.id, lang),
+            stale=interaction.extras.get('throttled', False)
+        )
+        if embed is None:
+            await self.bot.admission.reject(interaction)
+            return
+        
+        await interaction.response.send_message(embed=embed)
+        self.bot.db.log_command('predictions', interaction.user.id, interaction.guild.id)
+    
+    def _prediction_leaders_embed(self, guild_id, lang):
+        """Top 10 predictors by correct picks, then accuracy"""
+        leaders = self.bot.db.get_prediction_leaders(guild_id)
+        if not leaders:
+            return error_embed("no_predictions", lang)
+        
+        template = get_embed_template("prediction_leaders", lang)
+        lines = []
+        for i, (user_id, correct, total) in enumerate(leaders, 1):
+            medal = "🥇" if i == 1 else "🥈" if i == 2 else "🥉" if i == 3 else f"{i}."
+            lines.append(f"{medal} <@{user_id}> - {correct}/{total} {template.labels['correct']} ({correct * 100 / total:.0f}%)")
+        return template.build(description="\n".join(lines))
+    
     @app_commands.command(
         name="teamstats",
         description="Show team statistics and rankings"
@@ -104,92 +292,159 @@ class AdvancedCommands(commands.Cog):
     async def team_stats(self, interaction: discord.Interaction, team_name: str = None):
         """Show team statistics"""
         lang = self.bot.get_user_language(interaction)
+        embed = self.bot.responses.get_or_build(
+            'teamstats', interaction.guild.id, lang, (team_name,), ('teams',),
+            lambda: self._team_stats_embed(interaction.guild.id, team_name, lang),
+            stale=interaction.extras.get('throttled', False)
+        )
+        if embed is None:
+            await self.bot.admission.reject(interaction)
+            return
         
-        # Get team stats from database
-        stats = self.bot.db.get_team_stats(interaction.guild.id, team_name)
+        await interaction.response.send_message(embed=embed)
+        self.bot.db.log_command('teamstats', interaction.user.id, interaction.guild.id)
+    
+    def _team_stats_embed(self, guild_id, team_name, lang):
+        """One team's statistics, or the top 10 rankings"""
+        stats = self.bot.db.get_team_stats(guild_id, team_name)
         
         if not stats:
-            embed = discord.Embed(
-                title=get_translation("error", lang),
-                description=get_translation("no_team_stats", lang),
-                color=0xff0000
-            )
-            await interaction.response.send_message(embed=embed)
-            return
-        
-        embed = discord.Embed(
-            title=get_translation("team_statistics", lang),
-            color=0x0099ff,
-            timestamp=datetime.utcnow()
-        )
+            return error_embed("no_team_stats", lang)
         
         if team_name:
             # Show specific team stats
             team_data = stats[0]
-            embed.add_field(name=get_translation("team", lang), value=team_data[0], inline=False)
-            embed.add_field(name=get_translation("points", lang), value=str(team_data[1]), inline=True)
-            embed.add_field(name=get_translation("wins", lang), value=str(team_data[2]), inline=True)
-            embed.add_field(name=get_translation("losses", lang), value=str(team_data[3]), inline=True)
-            embed.add_field(name=get_translation("draws", lang), value=str(team_data[4]), inline=True)
+            form = self.bot.head_to_head.form(guild_id, team_data[0]) or "-"
+            embed = build_embed("team_stats", lang, team_data[0], *(str(value) for value in team_data[1:5]), f"{team_data[5]:.0f}", form)
         else:
             # Show rankings
-            embed.description = get_translation("team_rankings", lang)
+            template = get_embed_template("team_rankings", lang)
+            labels = template.labels
+            embed = template.build()
             
             for i, team_data in enumerate(stats[:10], 1):
                 medal = "🥇" if i == 1 else "🥈" if i == 2 else "🥉" if i == 3 else f"{i}."
                 embed.add_field(
                     name=f"{medal} {team_data[0]}",
-                    value=f"{get_translation('points', lang)}: {team_data[1]} | {get_translation('wins', lang)}: {team_data[2]} | {get_translation('losses', lang)}: {team_data[3]} | {get_translation('draws', lang)}: {team_data[4]}",
+                    value=f"{labels['points']}: {team_data[1]} | {labels['wins']}: {team_data[2]} | {labels['losses']}: {team_data[3]} | {labels['draws']}: {team_data[4]} | {labels['rating']}: {team_data[5]:.0f}"
+                          f"\n{labels['form']}: {self.bot.head_to_head.form(guild_id, team_data[0]) or '-'}",
                     inline=False
                 )
+        return embed
+    
+    @app_commands.command(
+        name="headtohead",
+        description="Show the record between two teams"
+    )
+    @app_commands.describe(team1="First team mention or name", team2="Second team mention or name")
+    async def head_to_head(self, interaction: discord.Interaction, team1: str, team2: str):
+        """Show the head-to-head record and recent meetings of two teams"""
+        lang = self.bot.get_user_language(interaction)
+        team1_name = await self.bot.mentions.team_name(interaction.guild, team1)
+        team2_name = await self.bot.mentions.team_name(interaction.guild, team2)
+        
+        record = self.bot.head_to_head.pair(interaction.guild.id, team1_name, team2_name)
+        if record is None or team1_name == team2_name:
+            embed = error_embed("no_head_to_head", lang)
+            await interaction.response.send_message(embed=embed)
+            return
+        
+        wins1, wins2, draws, goals1, goals2, recent = record
+        template = get_embed_template("head_to_head", lang)
+        labels = template.labels
+        meetings = "\n".join(
+            f"{home} {score1} - {score2} {away}" + (f" · {str(match_date)[:10]}" if match_date else "")
+            for match_date, home, score1, score2, away in recent
+        )
+        embed = template.build(
+            f"{team1_name} vs {team2_name}",
+            f"{team1_name}: {wins1}\n{team2_name}: {wins2}\n{labels['draws']}: {draws}",
+            f"{goals1} - {goals2}",
+            meetings,
+            f"{team1_name}: {self.bot.head_to_head.form(interaction.guild.id, team1_name) or '-'}\n"
+            f"{team2_name}: {self.bot.head_to_head.form(interaction.guild.id, team2_name) or '-'}"
+        )
         
         await interaction.response.send_message(embed=embed)
-        self.bot.db.log_command('teamstats', interaction.user.id, interaction.guild.id)
+        self.bot.db.log_command('headtohead', interaction.user.id, interaction.guild.id)
     
     @app_commands.command(
-        name="matchhistory",
-        description="Show recent match results"
+        name="topactive",
+        description="Show the most active members of this server"
     )
-    @app_commands.describe(limit="Number of matches to show (max 20)")
-    async def match_history(self, interaction: discord.Interaction, limit: int = 10):
-        """Show match history"""
+    @app_commands.describe(limit="Number of members to show (max 20)")
+    async def top_active(self, interaction: discord.Interaction, limit: int = 10):
+        """Show the most active members"""
         lang = self.bot.get_user_language(interaction)
         
         if limit > 20:
             limit = 20
         
-        results = self.bot.db.get_match_results(interaction.guild.id, limit)
+        leaders = self.bot.leaders.top(interaction.guild.id, limit)
         
-        if not results:
-            embed = discord.Embed(
-                title=get_translation("error", lang),
-                description=get_translation("no_match_history", lang),
-                color=0xff0000
-            )
+        if not leaders:
+            embed = error_embed("no_top_active", lang)
             await interaction.response.send_message(embed=embed)
             return
         
-        embed = discord.Embed(
-            title=get_translation("match_history", lang),
-            color=0x0099ff,
-            timestamp=datetime.utcnow()
-        )
+        template = get_embed_template("top_active", lang)
+        labels = template.labels
+        embed = template.build()
         
-        for result in results:
-            team1, team2, score1, score2, winner, match_date = result
-            
-            if winner == 'draw':
-                result_text = f"🤝 {get_translation('draw', lang)}"
-            else:
-                result_text = f"🏆 {winner}"
-            
-            embed.add_field(
-                name=f"{team1} {score1} - {score2} {team2}",
-                value=f"{result_text}\n📅 {match_date}",
-                inline=False
-            )
+        # Mentions render client-side, so no member lookups are needed
+        lines = []
+        for i, (user_id, count, error) in enumerate(leaders, 1):
+            medal = "🥇" if i == 1 else "🥈" if i == 2 else "🥉" if i == 3 else f"{i}."
+            estimate = f"~{count:,}" if error else f"{count:,}"
+            lines.append(f"{medal} <@{user_id}> - {estimate} {labels['messages']}")
+        embed.description = "\n".join(lines)
         
         await interaction.response.send_message(embed=embed)
+        self.bot.db.log_command('topactive', interaction.user.id, interaction.guild.id)
+    
+    @app_commands.command(
+        name="matchhistory",
+        description="Show recent match results"
+    )
+    @app_commands.describe(limit="Matches per page (max 20)")
+    async def match_history(self, interaction: discord.Interaction, limit: int = 10):
+        """Show match history, newest first, one page at a time"""
+        lang = self.bot.get_user_language(interaction)
+        
+        if limit > 20:
+            limit = 20
+        
+        template = get_embed_template("match_history", lang)
+        
+        def render(rows, number):
+            embed = template.build()
+            for _, team1, team2, score1, score2, winner, match_date in rows:
+                if winner == 'draw':
+                    result_text = f"🤝 {template.labels['draw']}"
+                else:
+                    result_text = f"🏆 {winner}"
+                
+                embed.add_field(
+                    name=f"{team1} {score1} - {score2} {team2}",
+                    value=f"{result_text}\n📅 {match_date}",
+                    inline=False
+                )
+            return embed.set_footer(text=template.labels["page_number"].format(page=number))
+        
+        view = KeysetPages(
+            lambda before, count: self.bot.db.get_match_results_page(interaction.guild.id, before, count),
+            lambda row: row[0],
+            render,
+            interaction.user.id,
+            per_page=max(limit, 1)
+        )
+        
+        if not view.pages:
+            embed = error_embed("no_match_history", lang)
+            await interaction.response.send_message(embed=embed)
+            return
+        
+        await interaction.response.send_message(embed=view.current(), view=view if not view.complete else discord.utils.MISSING)
         self.bot.db.log_command('matchhistory', interaction.user.id, interaction.guild.id)
     
     @app_commands.command(
@@ -199,23 +454,36 @@ class AdvancedCommands(commands.Cog):
     @app_commands.describe(
         name="Tournament name",
         start_day="Start day (1-31)",
-        end_day="End day (1-31)"
+        end_day="End day (1-31)",
+        format="Generate fixtures in this format",
+        teams="Team mentions or names, separated by commas (mentions may also be separated by spaces)",
+        hour="Kick-off hour of every fixture (0-23, default 20)",
+        minute="Kick-off minute (0-59, default 0)",
+        days_between_rounds="Days between consecutive rounds (default 1)",
+        double_round="Round robin: play every pairing home and away"
     )
+    @app_commands.choices(format=[
+        app_commands.Choice(name="Round robin", value="round_robin"),
+        app_commands.Choice(name="Single elimination", value="single_elimination"),
+        app_commands.Choice(name="Double elimination", value="double_elimination")
+    ])
     async def create_tournament(
         self,
         interaction: discord.Interaction,
         name: str,
         start_day: int,
-        end_day: int
+        end_day: int,
+        format: app_commands.Choice[str] = None,
+        teams: str = None,
+        hour: int = 20,
+        minute: int = 0,
+        days_between_rounds: int = 1,
+        double_round: bool = False
     ):
         """Create a tournament"""
         if not self.bot.is_admin(interaction.user, interaction.guild):
             lang = self.bot.get_user_language(interaction)
-            embed = discord.Embed(
-                title=get_translation("error", lang),
-                description=get_translation("admin_only", lang),
-                color=0xff0000
-            )
+            embed = build_embed("admin_only", lang)
             await interaction.response.send_message(embed=embed, ephemeral=True)
             return
         
@@ -223,11 +491,7 @@ class AdvancedCommands(commands.Cog):
         
         # Validate dates
         if not (1 <= start_day <= 31) or not (1 <= end_day <= 31):
-            embed = discord.Embed(
-                title=get_translation("error", lang),
-                description=get_translation("invalid_date", lang),
-                color=0xff0000
-            )
+            embed = error_embed("invalid_date", lang)
             await interaction.response.send_message(embed=embed, ephemeral=True)
             return
         
@@ -240,28 +504,111 @@ class AdvancedCommands(commands.Cog):
             start_date = start_date.replace(month=now.month + 1 if now.month < 12 else 1, year=now.year + 1 if now.month == 12 else now.year)
             end_date = end_date.replace(month=now.month + 1 if now.month < 12 else 1, year=now.year + 1 if now.month == 12 else now.year)
         
+        # Validate the fixture options before anything is stored
+        team_list = []
+        if format:
+            separator = ',' if ',' in (teams or '') else None
+            team_list = [team.strip() for team in (teams or '').split(separator) if team.strip()]
+            minimum = 3 if format.value == 'double_elimination' else 2
+            if len(set(team_list)) != len(team_list) or len(team_list) < minimum:
+                embed = error_embed("invalid_teams", lang, minimum=minimum)
+                await interaction.response.send_message(embed=embed, ephemeral=True)
+                return
+            if not (0 <= hour <= 23) or not (0 <= minute <= 59) or days_between_rounds < 0:
+                embed = error_embed("invalid_date", lang)
+                await interaction.response.send_message(embed=embed, ephemeral=True)
+                return
+        
         # Save tournament
         tournament_id = self.bot.db.create_tournament(
             interaction.guild.id,
             name,
             start_date,
             end_date,
-            interaction.user.id
+            interaction.user.id,
+            format.value if format else None
+        )
+        
+        embed = build_embed(
+            "tournament_created",
+            lang,
+            name,
+            f"#{tournament_id}",
+            start_date.strftime("%d/%m/%Y"),
+            end_date.strftime("%d/%m/%Y")
         )
         
-        embed = discord.Embed(
-            title=get_translation("tournament_created", lang),
-            color=0x00ff00,
-            timestamp=datetime.utcnow()
+        if format:
+            # Large fields can take a while to schedule; acknowledge first
+            await interaction.response.defer()
+            fixtures = await self._create_fixtures(interaction, tournament_id, format.value, team_list, start_date.replace(hour=hour, minute=minute), days_between_rounds, double_round, lang)
+            embed.add_field(
+                name=get_translation("fixtures", lang),
+                value=get_translation("fixtures_generated", lang).format(count=fixtures, format=format.name),
+                inline=False
+            )
+            await interaction.followup.send(embed=embed)
+        else:
+            await interaction.response.send_message(embed=embed)
+        self.bot.db.log_command('createtournament', interaction.user.id, interaction.guild.id)
+    
+    async def _create_fixtures(self, interaction, tournament_id, format_name, teams, first_kickoff, days_between_rounds, double_round, lang):
+        """Seed teams by Elo, generate the schedule and store it with its reminders; returns the fixture count"""
+        # Seed by rating so the strongest teams meet as late as possible (stable for unrated teams)
+        ratings = {row[0]: row[5] for row in self.bot.db.get_team_stats(interaction.guild.id)}
+        names = {team: await self.bot.mentions.team_name(interaction.guild, team) for team in teams}
+        seeded = sorted(teams, key=lambda team: ratings.get(names[team], INITIAL_RATING), reverse=True)
+        
+        fixtures = generate_fixtures(format_name, seeded, double_round)
+        for fixture in fixtures:
+            fixture['match_date'] = first_kickoff + timedelta(days=fixture['stage'] * days_between_rounds)
+        
+        match_ids = self.bot.db.create_fixtures(
+            tournament_id, interaction.guild.id, interaction.channel.id, interaction.user.id, lang, fixtures
         )
         
-        embed.add_field(name=get_translation("tournament_name", lang), value=name, inline=False)
-        embed.add_field(name=get_translation("tournament_id", lang), value=f"#{tournament_id}", inline=True)
-        embed.add_field(name=get_translation("start_date", lang), value=start_date.strftime("%d/%m/%Y"), inline=True)
-        embed.add_field(name=get_translation("end_date", lang), value=end_date.strftime("%d/%m/%Y"), inline=True)
+        # Fixtures whose teams are already known become active matches with reminders
+        match_commands_cog = self.bot.get_cog('MatchCommands')
+        if match_commands_cog:
+            for match_id, fixture in zip(match_ids, fixtures):
+                if fixture['team1'] is not None and fixture['team2'] is not None:
+                    match_commands_cog.add_active_match((
+                        match_id, interaction.guild.id, interaction.channel.id, fixture['team1'], fixture['team2'],
+                        fixture['match_date'].isoformat(' '), interaction.user.id, lang, tournament_id, fixture['bracket']
+                    ))
+        return len(fixtures)
+    
+    @app_commands.command(
+        name="fixtures",
+        description="Show a tournament's fixtures"
+    )
+    @app_commands.describe(tournament_id="ID of the tournament")
+    async def tournament_fixtures(self, interaction: discord.Interaction, tournament_id: int):
+        """List the next fixtures of a tournament"""
+        lang = self.bot.get_user_language(interaction)
+        
+        fixtures = self.bot.db.get_tournament_matches(tournament_id, interaction.guild.id)
+        if not fixtures:
+            embed = error_embed("no_fixtures", lang)
+            await interaction.response.send_message(embed=embed, ephemeral=True)
+            return
+        
+        template = get_embed_template("tournament_fixtures", lang)
+        labels = template.labels
+        embed = template.build(description=f"#{tournament_id}")
+        
+        # Unplayed fixtures first; embeds hold at most 25 fields
+        pending = [fixture for fixture in fixtures if fixture[4] == 'scheduled']
+        for match_id, team1, team2, match_date, status, bracket, round_number in pending[:25]:
+            embed.add_field(
+                name=f"#{match_id} · {bracket} {labels['round']} {round_number}",
+                value=f"{team1 or labels['tbd']} vs {team2 or labels['tbd']}\n{format_datetime(datetime.fromisoformat(match_date), lang)}",
+                inline=False
+            )
+        embed.set_footer(text=labels["fixtures_played"].format(played=len(fixtures) - len(pending), total=len(fixtures)))
         
         await interaction.response.send_message(embed=embed)
-        self.bot.db.log_command('createtournament', interaction.user.id, interaction.guild.id)
+        self.bot.db.log_command('fixtures', interaction.user.id, interaction.guild.id)
     
     @app_commands.command(
         name="tournaments",
@@ -270,23 +617,26 @@ class AdvancedCommands(commands.Cog):
     async def list_tournaments(self, interaction: discord.Interaction):
         """List tournaments"""
         lang = self.bot.get_user_language(interaction)
+        embed = self.bot.responses.get_or_build(
+            'tournaments', interaction.guild.id, lang, (), ('tournaments',),
+            lambda: self._tournaments_embed(interaction.guild.id, lang),
+            stale=interaction.extras.get('throttled', False)
+        )
+        if embed is None:
+            await self.bot.admission.reject(interaction)
+            return
         
-        tournaments = self.bot.db.get_tournaments(interaction.guild.id, status='active')
+        await interaction.response.send_message(embed=embed)
+        self.bot.db.log_command('tournaments', interaction.user.id, interaction.guild.id)
+    
+    def _tournaments_embed(self, guild_id, lang):
+        """Active tournaments of a guild"""
+        tournaments = self.bot.db.get_tournaments(guild_id, status='active')
         
         if not tournaments:
-            embed = discord.Embed(
-                title=get_translation("active_tournaments", lang),
-                description=get_translation("no_active_tournaments", lang),
-                color=0x0099ff
-            )
-            await interaction.response.send_message(embed=embed)
-            return
+            return build_embed("no_active_tournaments", lang)
         
-        embed = discord.Embed(
-            title=get_translation("active_tournaments", lang),
-            color=0x0099ff,
-            timestamp=datetime.utcnow()
-        )
+        embed = build_embed("active_tournaments", lang)
         
         for tournament in tournaments:
             t_id, t_name, t_status, t_start, t_end = tournament
@@ -295,9 +645,152 @@ class AdvancedCommands(commands.Cog):
                 value=f"📅 {t_start[:10]} - {t_end[:10]}",
                 inline=False
             )
+        return embed
+    
+    @app_commands.command(
+        name="startseason",
+        description="Start a new season, freezing the standings of the current one"
+    )
+    @app_commands.describe(name="Season name")
+    async def start_season(self, interaction: discord.Interaction, name: str):
+        """Open a new season"""
+        lang = self.bot.get_user_language(interaction)
+        if not self.bot.is_admin(interaction.user, interaction.guild):
+            embed = build_embed("admin_only", lang)
+            await interaction.response.send_message(embed=embed, ephemeral=True)
+            return
+        
+        today = datetime.now().strftime('%Y-%m-%d')
+        season_id, closed_id = self.bot.db.start_season(interaction.guild.id, name, today)
+        
+        template = get_embed_template("season_started", lang)
+        embed = template.build(name, f"#{season_id}", today)
+        if closed_id is not None:
+            embed.add_field(name=template.labels["season_closed"], value=f"#{closed_id} - /standings season_id:{closed_id}", inline=False)
+        
+        await interaction.response.send_message(embed=embed)
+        self.bot.db.log_command('startseason', interaction.user.id, interaction.guild.id)
+    
+    @app_commands.command(
+        name="endseason",
+        description="Close the current season and freeze its standings"
+    )
+    async def end_season(self, interaction: discord.Interaction):
+        """Close the open season without starting another"""
+        lang = self.bot.get_user_language(interaction)
+        if not self.bot.is_admin(interaction.user, interaction.guild):
+            embed = build_embed("admin_only", lang)
+            await interaction.response.send_message(embed=embed, ephemeral=True)
+            return
+        
+        season_id = self.bot.db.close_season(interaction.guild.id, datetime.now().strftime('%Y-%m-%d'))
+        if season_id is None:
+            embed = error_embed("no_active_season", lang)
+            await interaction.response.send_message(embed=embed, ephemeral=True)
+            return
+        
+        embed = self._standings_embed(interaction.guild.id, 'season', season_id, lang)
+        await interaction.response.send_message(embed=embed)
+        self.bot.db.log_command('endseason', interaction.user.id, interaction.guild.id)
+    
+    @app_commands.command(
+        name="standings",
+        description="Show the table for the season or a recent period"
+    )
+    @app_commands.describe(
+        period="Time window (default: current season)",
+        season_id="A past season's frozen table (see /seasons)"
+    )
+    @app_commands.choices(period=[
+        app_commands.Choice(name="Current season", value="season"),
+        app_commands.Choice(name="This month", value="month"),
+        app_commands.Choice(name="Last 7 days", value="week"),
+        app_commands.Choice(name="All time", value="all")
+    ])
+    async def standings(self, interaction: discord.Interaction, period: app_commands.Choice[str] = None, season_id: int = None):
+        """Show windowed or frozen standings"""
+        lang = self.bot.get_user_language(interaction)
+        period_value = period.value if period else 'season'
+        embed = self.bot.responses.get_or_build(
+            'standings', interaction.guild.id, lang, (period_value, season_id, datetime.now().strftime('%Y-%m-%d')),
+            ('match_results', 'seasons'),
+            lambda: self._standings_embed(interaction.guild.id, period_value, season_id, lang),
+            stale=interaction.extras.get('throttled', False)
+        )
+        if embed is None:
+            await self.bot.admission.reject(interaction)
+            return
+        
+        await interaction.response.send_message(embed=embed)
+        self.bot.db.log_command('standings', interaction.user.id, interaction.guild.id)
+    
+    def _standings_embed(self, guild_id, period, season_id, lang):
+        """Standings of a frozen season, the open season, or a window ending today"""
+        template = get_embed_template("standings", lang)
+        labels = template.labels
+        today = datetime.now()
+        
+        if season_id is not None:
+            season = next((row for row in self.bot.db.get_seasons(guild_id) if row[0] == season_id), None)
+            if season is None:
+                return error_embed("season_not_found", lang)
+            _, name, start_day, end_day, status = season
+            if status == 'closed':
+                rows = self.bot.db.get_season_standings(season_id, guild_id)
+                heading = labels["standings_closed_season"].format(name=name, start=start_day, end=end_day)
+            else:
+                rows = self.bot.db.get_windowed_standings(guild_id, start_day)
+                heading = labels["standings_season"].format(name=name, start=start_day)
+        elif period == 'season':
+            season = self.bot.db.get_active_season(guild_id)
+            if season is None:
+                return error_embed("no_active_season", lang)
+            _, name, start_day = season
+            rows = self.bot.db.get_windowed_standings(guild_id, start_day)
+            heading = labels["standings_season"].format(name=name, start=start_day)
+        else:
+            starts = {
+                'month': today.strftime('%Y-%m-01'),
+                'week': (today - timedelta(days=6)).strftime('%Y-%m-%d'),
+                'all': None
+            }
+            rows = self.bot.db.get_windowed_standings(guild_id, starts[period])
+            heading = labels[f"standings_{period}"]
+        
+        if not rows:
+            return template.build(description=f"{heading}\n\n{labels['no_standings']}")
+        
+        lines = []
+        for i, (team, points, wins, losses, draws, goals_for, goals_against) in enumerate(rows[:15], 1):
+            medal = "🥇" if i == 1 else "🥈" if i == 2 else "🥉" if i == 3 else f"{i}."
+            lines.append(
+                f"{medal} **{team}** - {points} {labels['points']} · {wins}-{draws}-{losses} · {labels['goals']} {goals_for}:{goals_against}"
+            )
+        return template.build(description=f"{heading}\n\n" + "\n".join(lines))
+    
+    @app_commands.command(
+        name="seasons",
+        description="List this server's seasons"
+    )
+    async def list_seasons(self, interaction: discord.Interaction):
+        """List seasons, newest first"""
+        lang = self.bot.get_user_language(interaction)
+        seasons = self.bot.db.get_seasons(interaction.guild.id)
+        
+        if not seasons:
+            embed = error_embed("no_active_season", lang)
+            await interaction.response.send_message(embed=embed)
+            return
+        
+        template = get_embed_template("season_list", lang)
+        lines = [
+            f"**#{season_id}** {name} · {start_day} - {end_day or template.labels['season_open']}"
+            for season_id, name, start_day, end_day, status in seasons[:20]
+        ]
+        embed = template.build(description="\n".join(lines))
         
         await interaction.response.send_message(embed=embed)
-        self.bot.db.log_command('tournaments', interaction.user.id, interaction.guild.id)
+        self.bot.db.log_command('seasons', interaction.user.id, interaction.guild.id)
     
     @app_commands.command(
         name="scheduleannouncement",
@@ -308,7 +801,8 @@ class AdvancedCommands(commands.Cog):
         message="Message to announce",
         day="Day to send (1-31)",
         hour="Hour to send (0-23)",
-        minute="Minute to send (0-59)"
+        minute="Minute to send (0-59)",
+        repeat="Repeat rule: 'every 1w', 'every 12h', or cron like '0 20 * * 5' (first run from the given time)"
     )
     async def schedule_announcement(
         self,
@@ -317,16 +811,13 @@ class AdvancedCommands(commands.Cog):
         message: str,
         day: int,
         hour: int,
-        minute: int
+        minute: int,
+        repeat: str = None
     ):
         """Schedule an announcement"""
         if not self.bot.is_admin(interaction.user, interaction.guild):
             lang = self.bot.get_user_language(interaction)
-            embed = discord.Embed(
-                title=get_translation("error", lang),
-                description=get_translation("admin_only", lang),
-                color=0xff0000
-            )
+            embed = build_embed("admin_only", lang)
             await interaction.response.send_message(embed=embed, ephemeral=True)
             return
         
@@ -334,11 +825,7 @@ class AdvancedCommands(commands.Cog):
         
         # Validate time
         if not (1 <= day <= 31) or not (0 <= hour <= 23) or not (0 <= minute <= 59):
-            embed = discord.Embed(
-                title=get_translation("error", lang),
-                description=get_translation("invalid_time", lang),
-                color=0xff0000
-            )
+            embed = error_embed("invalid_time", lang)
             await interaction.response.send_message(embed=embed, ephemeral=True)
             return
         
@@ -352,54 +839,39 @@ class AdvancedCommands(commands.Cog):
                 else:
                     schedule_time = datetime(now.year, now.month + 1, day, hour, minute)
         except ValueError:
-            embed = discord.Embed(
-                title=get_translation("error", lang),
-                description=get_translation("invalid_date", lang),
-                color=0xff0000
-            )
+            embed = error_embed("invalid_date", lang)
             await interaction.response.send_message(embed=embed, ephemeral=True)
             return
         
+        recurrence = None
+        if repeat:
+            try:
+                recurrence = Recurrence(repeat)
+                schedule_time = recurrence.first_at_or_after(schedule_time)
+            except ValueError:
+                embed = error_embed("invalid_recurrence", lang)
+                await interaction.response.send_message(embed=embed, ephemeral=True)
+                return
+        
         # Schedule announcement
         announcement_id = self.bot.db.schedule_announcement(
             interaction.guild.id,
             channel.id,
             message,
             schedule_time,
-            interaction.user.id
+            interaction.user.id,
+            recurrence.text if recurrence else None
         )
         
-        embed = discord.Embed(
-            title=get_translation("announcement_scheduled", lang),
-            color=0x00ff00,
-            timestamp=datetime.utcnow()
+        embed = build_embed(
+            "announcement_scheduled",
+            lang,
+            channel.mention,
+            schedule_time.strftime("%d/%m/%Y %H:%M"),
+            message[:100] + "..." if len(message) > 100 else message
         )
-        
-        embed.add_field(name=get_translation("channel", lang), value=channel.mention, inline=True)
-        embed.add_field(name=get_translation("schedule_time", lang), value=schedule_time.strftime("%d/%m/%Y %H:%M"), inline=True)
-        embed.add_field(name=get_translation("message", lang), value=message[:100] + "..." if len(message) > 100 else message, inline=False)
+        if recurrence:
+            embed.add_field(name=get_translation("repeats", lang), value=f"`{recurrence.text}`", inline=True)
         
         await interaction.response.send_message(embed=embed)
         self.bot.db.log_command('scheduleannouncement', interaction.user.id, interaction.guild.id)
-    
-    async def _extract_team_name(self, guild, team_mention):
-        """Extract team name from mention or return as is"""
-        # Check if it's a role mention
-        if team_mention.startswith('<@&') and team_mention.endswith('>'):
-            try:
-                role_id = int(team_mention[3:-1])
-                role = guild.get_role(role_id)
-                return role.name if role else team_mention
-            except ValueError:
-                return team_mention
-        
-        # Check if it's a user mention
-        elif team_mention.startswith('<@') and team_mention.endswith('>'):
-            try:
-                user_id = int(team_mention[2:-1])
-                user = guild.get_member(user_id)
-                return user.display_name if user else team_mention
-            except ValueError:
-                return team_mention
-        
-        return team_mention
\ No newline at end of file
@@ -1,7 +1,12 @@
 import discord
 from discord.ext import commands
 from discord import app_commands
-from bot.utils.translations import get_translation
+from bot.utils.translations import build_embed, get_translation, language_names
+
+# Offered in /language and /serverlanguage; "auto" clears the stored override
+LANGUAGE_CHOICES = [
+    app_commands.Choice(name=name, value=code) for code, name in language_names().items()
+] + [app_commands.Choice(name="Auto", value="auto")]
 
 class HelpCommands(commands.Cog):
     def __init__(self, bot):
@@ -15,67 +20,36 @@ class HelpCommands(commands.Cog):
         """Show all available commands and help"""
         lang = self.bot.get_user_language(interaction)
         
-        embed = discord.Embed(
-            title=get_translation("help_title", lang),
-            description=get_translation("help_description", lang),
-            color=0x0099ff,
-            timestamp=discord.utils.utcnow()
-        )
-        
-        # Match commands
-        match_commands = [
-            "**`/creatematch`** - " + get_translation("help_creatematch", lang),
-            "**`/endmatch`** - " + get_translation("help_endmatch", lang),
-            "**`/listmatches`** - " + get_translation("help_listmatches", lang)
-        ]
-        
-        embed.add_field(
-            name=get_translation("match_commands", lang),
-            value="\n".join(match_commands),
-            inline=False
-        )
-        
-        # Admin commands  
-        admin_commands = [
-            "**`/setlogchannel`** - " + get_translation("help_setlogchannel", lang),
-            "**`/setchannels`** - " + get_translation("help_setchannels", lang),
-            "**`/dmuser`** - " + get_translation("help_dmuser", lang),
-            "**`/dmrole`** - " + get_translation("help_dmrole", lang),
-            "**`/customembed`** - " + get_translation("help_customembed", lang)
-        ]
-        
-        embed.add_field(
-            name=get_translation("admin_commands", lang),
-            value="\n".join(admin_commands),
-            inline=False
-        )
-        
-        # General commands
-        general_commands = [
-            "**`/ayuda`** - " + get_translation("help_help", lang)
-        ]
-        
-        embed.add_field(
-            name=get_translation("general_commands", lang),
-            value="\n".join(general_commands),
-            inline=False
+        # Static per language, so only the TTL/LRU bounds apply
+        embed = self.bot.responses.get_or_build(
+            'ayuda', None, lang, (), (),
+            lambda: build_embed("help", lang),
+            stale=interaction.extras.get('throttled', False)
         )
+        if embed is None:
+            await self.bot.admission.reject(interaction)
+            return
         
-        # Support info
-        embed.add_field(
-            name=get_translation("support", lang),
-            value=get_translation("support_info", lang),
-            inline=False
-        )
-        
-        # Server invite
-        embed.add_field(
-            name=get_translation("server_invite", lang),
-            value="https://discord.gg/5BHpgnG8QP",
-            inline=False
-        )
+        await interaction.response.send_message(embed=embed, ephemeral=True)
+        self.bot.db.log_command('ayuda', interaction.user.id, interaction.guild.id)
+    
+    @app_commands.command(
+        name="language",
+        description="Choose your language for bot replies and reminders"
+    )
+    @app_commands.describe(language="Language to use, or Auto to follow your Discord client")
+    @app_commands.choices(language=LANGUAGE_CHOICES)
+    async def set_language(self, interaction: discord.Interaction, language: app_commands.Choice[str]):
+        """Store the user's language override"""
+        code = None if language.value == "auto" else language.value
+        self.bot.language_prefs.set_user_language(interaction.user.id, code)
         
-        embed.set_footer(text=get_translation("help_footer", lang))
+        lang = self.bot.get_user_language(interaction)
+        if code:
+            description = get_translation("language_set", lang).format(language=language.name)
+        else:
+            description = get_translation("language_reset", lang)
         
+        embed = build_embed("success", lang, description=description)
         await interaction.response.send_message(embed=embed, ephemeral=True)
-        self.bot.db.log_command('ayuda', interaction.user.id, interaction.guild.id)
+        self.bot.db.log_command('language', interaction.user.id, interaction.guild_id)
@@ -1,9 +1,11 @@
 import discord
 from discord.ext import commands
 from discord import app_commands
-from bot.utils.translations import get_translation
+from bot.utils.translations import build_embed, error_embed, format_datetime, get_embed_template, get_translation
+from bot.utils.imports import parse_matches, MAX_IMPORT_BYTES
+from bot.utils.pagination import EmbedPages, KeysetPages, paginate_lines
+from bot.utils.predictions import prediction_view
 from datetime import datetime, timedelta
-import calendar
 import asyncio
 
 class MatchCommands(commands.Cog):
@@ -11,6 +13,41 @@ class MatchCommands(commands.Cog):
         self.bot = bot
         self.active_matches = {}
     
+    async def cog_load(self):
+        """Restore scheduled matches and their reminders from the database"""
+        for row in self.bot.db.get_active_matches():
+            self.add_active_match(row)
+    
+    def add_active_match(self, row):
+        """Cache a match row (Database.MATCH_COLUMNS) and schedule its reminders"""
+        match_id, guild_id, channel_id, team1, team2, match_date, creator_id, language, tournament_id, bracket = row
+        match_date = datetime.fromisoformat(match_date)
+        self.active_matches[match_id] = {
+            'team1': team1,
+            'team2': team2,
+            'datetime': match_date,
+            'guild_id': guild_id,
+            'channel_id': channel_id,
+            'creator_id': creator_id,
+            'lang': language,
+            'tournament_id': tournament_id,
+            'bracket': bracket
+        }
+        self.bot.scheduler.schedule_match_reminders(match_id, match_date, language, guild_id)
+    
+    def get_guild_match(self, guild_id, match_id):
+        """Get an active match of this guild, or None"""
+        match_info = self.active_matches.get(match_id)
+        if match_info is None or match_info['guild_id'] != guild_id:
+            return None
+        return match_info
+    
+    def claim_guild_match(self, guild_id, match_id):
+        """Remove and return an active match of this guild (None if missing), so concurrent commands can't both use it"""
+        if self.get_guild_match(guild_id, match_id) is None:
+            return None
+        return self.active_matches.pop(match_id)
+    
     @app_commands.command(
         name="creatematch",
         description="Create a new match with teams, date, time and image"
@@ -36,11 +73,7 @@ class MatchCommands(commands.Cog):
         """Create a new match"""
         if not self.bot.is_admin(interaction.user, interaction.guild):
             lang = self.bot.get_user_language(interaction)
-            embed = discord.Embed(
-                title=get_translation("error", lang),
-                description=get_translation("admin_only", lang),
-                color=0xff0000
-            )
+            embed = build_embed("admin_only", lang)
             await interaction.response.send_message(embed=embed, ephemeral=True)
             return
         
@@ -48,29 +81,17 @@ class MatchCommands(commands.Cog):
         
         # Validate date/time inputs
         if not (1 <= day <= 31):
-            embed = discord.Embed(
-                title=get_translation("error", lang),
-                description=get_translation("invalid_day", lang),
-                color=0xff0000
-            )
+            embed = error_embed("invalid_day", lang)
             await interaction.response.send_message(embed=embed, ephemeral=True)
             return
         
         if not (0 <= hour <= 23):
-            embed = discord.Embed(
-                title=get_translation("error", lang),
-                description=get_translation("invalid_hour", lang),
-                color=0xff0000
-            )
+            embed = error_embed("invalid_hour", lang)
             await interaction.response.send_message(embed=embed, ephemeral=True)
             return
         
         if not (0 <= minute <= 59):
-            embed = discord.Embed(
-                title=get_translation("error", lang),
-                description=get_translation("invalid_minute", lang),
-                color=0xff0000
-            )
+            embed = error_embed("invalid_minute", lang)
             await interaction.response.send_message(embed=embed, ephemeral=True)
             return
         
@@ -87,88 +108,123 @@ class MatchCommands(commands.Cog):
                     match_date = datetime(now.year, now.month + 1, day, hour, minute)
         
         except ValueError:
-            embed = discord.Embed(
-                title=get_translation("error", lang),
-                description=get_translation("invalid_date", lang),
-                color=0xff0000
-            )
+            embed = error_embed("invalid_date", lang)
             await interaction.response.send_message(embed=embed, ephemeral=True)
             return
         
-        # Generate match ID
-        match_id = len(self.active_matches) + 1
-        
-        # Create match embed
-        embed = discord.Embed(
-            title=get_translation("match_created", lang),
-            color=0x00ff00,
-            timestamp=datetime.utcnow()
-        )
-        
-        # Format time based on language
-        if lang == 'en':
-            time_str = match_date.strftime("%B %d, %Y at %H:%M GMT")
-        elif lang == 'pt':
-            time_str = match_date.strftime("%d de %B, %Y às %H:%M (Portugal)")
-        else:  # Spanish
-            months_es = {
-                1: "enero", 2: "febrero", 3: "marzo", 4: "abril",
-                5: "mayo", 6: "junio", 7: "julio", 8: "agosto",
-                9: "septiembre", 10: "octubre", 11: "noviembre", 12: "diciembre"
-            }
-            month_name = months_es[match_date.month]
-            time_str = f"{match_date.day} de {month_name}, {match_date.year} a las {match_date.strftime('%H:%M')} (España)"
-        
-        embed.add_field(
-            name=get_translation("teams", lang),
-            value=f"🔴 {team1}\n🔵 {team2}",
-            inline=False
-        )
-        
-        embed.add_field(
-            name=get_translation("match_time", lang),
-            value=time_str,
-            inline=False
+        # Store the match; its database ID is the match ID
+        match_id = self.bot.db.create_match(
+            interaction.guild.id, interaction.channel.id, team1, team2, match_date, interaction.user.id, lang
         )
         
-        embed.add_field(
-            name=get_translation("match_id", lang),
-            value=f"#{match_id}",
-            inline=True
-        )
+        # Create match embed
+        time_str = format_datetime(match_date, lang, 'long')
+        embed = build_embed("match_created", lang, f"🔴 {team1}\n🔵 {team2}", time_str, f"#{match_id}")
         
         # Add image if provided
         if image and image.content_type and image.content_type.startswith('image/'):
             embed.set_image(url=image.url)
         
-        # Store match info
-        self.active_matches[match_id] = {
-            'team1': team1,
-            'team2': team2,
-            'datetime': match_date,
-            'guild_id': interaction.guild.id,
-            'channel_id': interaction.channel.id,
-            'creator_id': interaction.user.id,
-            'lang': lang
-        }
-        
-        # Schedule reminders (10 and 3 minutes before)
-        reminder_10 = match_date - timedelta(minutes=10)
-        reminder_3 = match_date - timedelta(minutes=3)
+        # Cache match info and schedule reminders (10 and 3 minutes before)
+        self.add_active_match((
+            match_id, interaction.guild.id, interaction.channel.id, team1, team2,
+            match_date.isoformat(' '), interaction.user.id, lang, None, None
+        ))
         
-        if reminder_10 > datetime.now():
-            self.bot.scheduler.schedule_reminder(match_id, reminder_10, 10, lang)
+        # "Who wins?" buttons; button labels can't render mentions, so use display names
+        self.bot.predictions.apply_tally(embed, match_id, lang)
+        view = prediction_view(match_id, {
+            'team1': await self.bot.mentions.display_text(interaction.guild, team1),
+            'draw': get_translation('draw', lang),
+            'team2': await self.bot.mentions.display_text(interaction.guild, team2)
+        })
         
-        if reminder_3 > datetime.now():
-            self.bot.scheduler.schedule_reminder(match_id, reminder_3, 3, lang)
-        
-        await interaction.response.send_message(embed=embed)
+        await interaction.response.send_message(embed=embed, view=view)
         
         # Send DM to mentioned teams/users
-        await self._send_match_dm(interaction.guild, team1, team2, embed, lang)
+        image_url = embed.image.url if embed.image else None
+        await self._send_match_dm(interaction.guild, team1, team2, match_date, match_id, image_url, lang)
         
         self.bot.db.log_command('creatematch', interaction.user.id, interaction.guild.id)
     
+    @app_commands.command(
+        name="importmatches",
+        description="Create many matches from a CSV or JSON file"
+    )
+    @app_commands.describe(file="CSV (team1,team2,date,time) or JSON list of {team1, team2, date, time}; dates as YYYY-MM-DD HH:MM")
+    async def import_matches(self, interaction: discord.Interaction, file: discord.Attachment):
+        """Validate and create every match of an attachment at once"""
+        lang = self.bot.get_user_language(interaction)
+        if not self.bot.is_admin(interaction.user, interaction.guild):
+            embed = build_embed("admin_only", lang)
+            await interaction.response.send_message(embed=embed, ephemeral=True)
+            return
+        
+        if file.size > MAX_IMPORT_BYTES:
+            embed = error_embed("import_too_large", lang, limit=MAX_IMPORT_BYTES // 1024)
+            await interaction.response.send_message(embed=embed, ephemeral=True)
+            return
+        
+        # Downloading, resolving recipients and scheduling can outlast the 3s deadline
+        await interaction.response.defer()
+        
+        matches, errors = parse_matches(await file.read(), file.filename)
+        if errors or not matches:
+            row_label = get_translation('import_row', lang)
+            lines = [f"{row_label} {row}: {get_translation(key, lang)}" for row, key in errors[:15]]
+            if len(errors) > 15:
+                lines.append("…")
+            embed = error_embed("import_failed", lang, count=len(errors))
+            embed.description += "\n\n" + "\n".join(lines)
+            await interaction.followup.send(embed=embed)
+            return
+        
+        match_ids = self.bot.db.create_matches(interaction.guild.id, interaction.channel.id, interaction.user.id, lang, matches)
+        for match_id, match in zip(match_ids, matches):
+            self.add_active_match((
+                match_id, interaction.guild.id, interaction.channel.id, match['team1'], match['team2'],
+                match['match_date'].isoformat(' '), interaction.user.id, lang, None, None
+            ))
+        
+        # One summary, paged 15 matches at a time
+        template = get_embed_template("matches_imported", lang)
+        lines = [
+            f"**#{match_id}** {match['team1']} vs {match['team2']} · {format_datetime(match['match_date'], lang)}"
+            for match_id, match in zip(match_ids, matches)
+        ]
+        summary = template.labels["matches_imported"].format(count=len(matches))
+        pages = paginate_lines(lines, 15, lambda text, number, count: template.build(
+            description=f"{summary}\n\n{text}"
+        ).set_footer(text=template.labels["page"].format(page=number, pages=count)))
+        
+        view = EmbedPages(pages, interaction.user.id) if len(pages) > 1 else discord.utils.MISSING
+        await interaction.followup.send(embed=pages[0], view=view)
+        
+        await self._queue_import_dms(interaction.guild, list(zip(match_ids, matches)), lang)
+        self.bot.db.log_command('importmatches', interaction.user.id, interaction.guild.id)
+    
+    async def _queue_import_dms(self, guild, imported, language):
+        """Queue one DM per recipient listing all of their imported matches"""
+        schedules = {}  # member_id -> (member, [(match_id, match), ...])
+        for match_id, match in imported:
+            for member in await self.bot.mentions.recipients(guild, match['team1'], match['team2']):
+                schedules.setdefault(member.id, (member, []))[1].append((match_id, match))
+        
+        for member, member_matches in schedules.values():
+            member_language = self.bot.language_prefs.language_for(member.id, guild.id, default=language)
+            lines = []
+            for match_id, match in member_matches:
+                team1 = await self.bot.mentions.display_text(guild, match['team1'])
+                team2 = await self.bot.mentions.display_text(guild, match['team2'])
+                lines.append(f"**#{match_id}** {team1} vs {team2} · {format_datetime(match['match_date'], member_language)}")
+            
+            # Embed descriptions are capped at 4096 characters
+            description = "\n".join(lines)
+            if len(description) > 4000:
+                description = description[:4000].rsplit("\n", 1)[0] + "\n…"
+            embed = build_embed("matches_scheduled_dm", member_language, description=description)
+            self.bot.dm_queue.enqueue([member], embed=embed)
+    
     @app_commands.command(
         name="endmatch",
         description="End an active match"
@@ -178,37 +234,27 @@ class MatchCommands(commands.Cog):
         """End an active match"""
         if not self.bot.is_admin(interaction.user, interaction.guild):
             lang = self.bot.get_user_language(interaction)
-            embed = discord.Embed(
-                title=get_translation("error", lang),
-                description=get_translation("admin_only", lang),
-                color=0xff0000
-            )
+            embed = build_embed("admin_only", lang)
             await interaction.response.send_message(embed=embed, ephemeral=True)
             return
         
         lang = self.bot.get_user_language(interaction)
         
-        if match_id not in self.active_matches:
-            embed = discord.Embed(
-                title=get_translation("error", lang),
-                description=get_translation("match_not_found", lang),
-                color=0xff0000
-            )
+        match_info = self.get_guild_match(interaction.guild.id, match_id)
+        if match_info is None:
+            embed = error_embed("match_not_found", lang)
             await interaction.response.send_message(embed=embed, ephemeral=True)
             return
         
-        match_info = self.active_matches[match_id]
         del self.active_matches[match_id]
-        
-        embed = discord.Embed(
-            title=get_translation("match_ended", lang),
-            description=get_translation("match_ended_desc", lang).format(
-                team1=match_info['team1'],
-                team2=match_info['team2'],
-                match_id=match_id
-            ),
-            color=0xff9900,
-            timestamp=datetime.utcnow()
+        self.bot.db.end_match(match_id)
+        
+        embed = build_embed(
+            "match_ended",
+            lang,
+            team1=match_info['team1'],
+            team2=match_info['team2'],
+            match_id=match_id
         )
         
         await interaction.response.send_message(embed=embed)
@@ -219,135 +265,72 @@ class MatchCommands(commands.Cog):
         description="List all active matches"
     )
     async def list_matches(self, interaction: discord.Interaction):
-        """List all active matches"""
+        """List all active matches, soonest first, 10 per page"""
         lang = self.bot.get_user_language(interaction)
-        
-        if not self.active_matches:
-            embed = discord.Embed(
-                title=get_translation("active_matches", lang),
-                description=get_translation("no_active_matches", lang),
-                color=0x0099ff
+        if interaction.extras.get('throttled', False):
+            # Over the rate limit: the first page as last rendered, without buttons or queries
+            embed = self.bot.responses.get_or_build(
+                'listmatches', interaction.guild.id, lang, (), ('matches',), None, stale=True
             )
+            if embed is None:
+                await self.bot.admission.reject(interaction)
+                return
             await interaction.response.send_message(embed=embed)
+            self.bot.db.log_command('listmatches', interaction.user.id, interaction.guild.id)
             return
         
-        embed = discord.Embed(
-            title=get_translation("active_matches", lang),
-            color=0x0099ff,
-            timestamp=datetime.utcnow()
+        template = get_embed_template("active_matches", lang)
+        
+        def render(rows, number):
+            embed = template.build()
+            for match_id, team1, team2, match_date in rows:
+                embed.add_field(
+                    name=f"#{match_id} - {team1} vs {team2}",
+                    value=format_datetime(datetime.fromisoformat(match_date), lang),
+                    inline=False
+                )
+            return embed.set_footer(text=template.labels["page_number"].format(page=number))
+        
+        view = KeysetPages(
+            lambda after, limit: self.bot.db.get_scheduled_matches_page(interaction.guild.id, after, limit),
+            lambda row: (row[3], row[0]),
+            render,
+            interaction.user.id
         )
         
-        for match_id, match_info in self.active_matches.items():
-            match_date = match_info['datetime']
-            
-            # Format time based on language
-            if lang == 'en':
-                time_str = match_date.strftime("%B %d at %H:%M GMT")
-            elif lang == 'pt':
-                time_str = match_date.strftime("%d de %B às %H:%M")
-            else:  # Spanish
-                months_es = {
-                    1: "enero", 2: "febrero", 3: "marzo", 4: "abril",
-                    5: "mayo", 6: "junio", 7: "julio", 8: "agosto",
-                    9: "septiembre", 10: "octubre", 11: "noviembre", 12: "diciembre"
-                }
-                month_name = months_es[match_date.month]
-                time_str = f"{match_date.day} de {month_name} a las {match_date.strftime('%H:%M')}"
-            
-            embed.add_field(
-                name=f"#{match_id} - {match_info['team1']} vs {match_info['team2']}",
-                value=time_str,
-                inline=False
-            )
+        # Keep the first page for callers who are throttled later
+        first_page = view.current() if view.pages else build_embed("no_active_matches", lang)
+        self.bot.responses.get_or_build(
+            'listmatches', interaction.guild.id, lang, (), ('matches',), lambda: first_page
+        )
         
-        await interaction.response.send_message(embed=embed)
+        if not view.pages:
+            await interaction.response.send_message(embed=first_page)
+            return
+        
+        await interaction.response.send_message(embed=first_page, view=view if not view.complete else discord.utils.MISSING)
         self.bot.db.log_command('listmatches', interaction.user.id, interaction.guild.id)
     
-    async def _send_match_dm(self, guild, team1, team2, embed, language):
-        """Send DM notifications to mentioned teams/users"""
-        teams = [team1, team2]
-        
-        # Create a modified embed for DM with converted mentions
-        dm_embed = discord.Embed(
-            title=embed.title,
-            color=embed.color,
-            timestamp=embed.timestamp
-        )
-        
+    async def _send_match_dm(self, guild, team1, team2, match_date, match_id, image_url, language):
+        """Send DM notifications to mentioned teams/users, rendered once per recipient language"""
         # Convert mentions to text for DM
-        team1_text = await self._convert_mention_to_text(guild, team1)
-        team2_text = await self._convert_mention_to_text(guild, team2)
-        
-        # Add fields with converted text
-        for field in embed.fields:
-            if field.name and "teams" in field.name.lower():
-                dm_embed.add_field(
-                    name=field.name,
-                    value=f"🔴 {team1_text}\n🔵 {team2_text}",
-                    inline=field.inline
-                )
-            else:
-                dm_embed.add_field(
-                    name=field.name,
-                    value=field.value,
-                    inline=field.inline
-                )
-        
-        # Copy image if exists
-        if embed.image:
-            dm_embed.set_image(url=embed.image.url)
-        
-        for team in teams:
-            # Check if it's a role mention (<@&role_id>)
-            if team.startswith('<@&') and team.endswith('>'):
-                try:
-                    role_id = int(team[3:-1])
-                    role = guild.get_role(role_id)
-                    if role:
-                        # Send DM to all members of the role
-                        for member in role.members:
-                            try:
-                                await member.send(embed=dm_embed)
-                                await asyncio.sleep(1)  # Rate limiting
-                            except:
-                                continue
-                except ValueError:
-                    continue
+        team1_text = await self.bot.mentions.display_text(guild, team1)
+        team2_text = await self.bot.mentions.display_text(guild, team2)
+        
+        recipients = await self.bot.mentions.recipients(guild, team1, team2)
+        groups = self.bot.language_prefs.group_by_language(recipients, guild.id, default=language)
+        
+        for recipient_language, members in groups.items():
+            dm_embed = build_embed(
+                "match_created",
+                recipient_language,
+                f"🔴 {team1_text}\n🔵 {team2_text}",
+                format_datetime(match_date, recipient_language, 'long'),
+                f"#{match_id}"
+            )
             
-            # Check if it's a user mention (<@user_id>)
-            elif team.startswith('<@') and team.endswith('>'):
-                try:
-                    user_id = int(team[2:-1])
-                    user = guild.get_member(user_id)
-                    if user:
-                        try:
-                            await user.send(embed=dm_embed)
-                        except:
-                            continue
-                except ValueError:
-                    continue
-    
-    async def _convert_mention_to_text(self, guild, mention_text):
-        """Convert mention to readable text"""
-        # Check if it's a role mention (<@&role_id>)
-        if mention_text.startswith('<@&') and mention_text.endswith('>'):
-            try:
-                role_id = int(mention_text[3:-1])
-                role = guild.get_role(role_id)
-                if role:
-                    return f"@{role.name}"
-            except ValueError:
-                pass
-        
-        # Check if it's a user mention (<@user_id>)
-        elif mention_text.startswith('<@') and mention_text.endswith('>'):
-            try:
-                user_id = int(mention_text[2:-1])
-                user = guild.get_member(user_id)
-                if user:
-                    return f"@{user.display_name}"
-            except ValueError:
-                pass
-        
-        # Return original text if not a mention
-        return mention_text
+            # Copy image if exists
+            if image_url:
+                dm_embed.set_image(url=image_url)
+            
+            self.bot.dm_queue.enqueue(members, embed=dm_embed)
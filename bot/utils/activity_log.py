@@ -0,0 +1,102 @@
+import asyncio
+from collections import OrderedDict
+
+import discord
+
+from bot.utils.translations import get_embed_template
+
+
+class ActivityLog:
+    """Per-guild buffer of log-channel events, posted as one digest embed at a time
+
+    Repeated events of the same kind in the same channel are coalesced into a
+    count, a guild's buffer is posted every `interval` seconds or as soon as it
+    holds `max_events` events, and distinct entries past `max_entries` are dropped
+    (and counted) so a flood can't grow the buffer or the digest.
+    """
+
+    def __init__(self, bot, interval=30, max_events=50, max_entries=20):
+        self.bot = bot
+        self.interval = interval
+        self.max_events = max_events
+        self.max_entries = max_entries
+        self.buffers = {}  # guild_id -> {'entries': OrderedDict[(kind, channel_id)] -> count, 'events', 'coalesced', 'dropped'}
+        self.flushing = {}  # guild_id -> early flush task
+        self.digests = 0
+        self.events = 0
+        self.coalesced = 0
+        self.dropped = 0
+
+    def record(self, guild_id, kind, channel_id):
+        """Buffer one event for the guild's log channel (ignored when it has none)"""
+        if guild_id not in self.bot.log_channels:
+            return
+        buffer = self.buffers.get(guild_id)
+        if buffer is None:
+            buffer = self.buffers[guild_id] = {'entries': OrderedDict(), 'events': 0, 'coalesced': 0, 'dropped': 0}
+
+        self.events += 1
+        buffer['events'] += 1
+        key = (kind, channel_id)
+        if key in buffer['entries']:
+            buffer['entries'][key] += 1
+            buffer['coalesced'] += 1
+            self.coalesced += 1
+        elif len(buffer['entries']) < self.max_entries:
+            buffer['entries'][key] = 1
+        else:
+            buffer['dropped'] += 1
+            self.dropped += 1
+
+        if buffer['events'] >= self.max_events and guild_id not in self.flushing:
+            self.flushing[guild_id] = asyncio.create_task(self._flush_early(guild_id))
+
+    async def _flush_early(self, guild_id):
+        try:
+            await self.flush(guild_id)
+        finally:
+            self.flushing.pop(guild_id, None)
+
+    async def flush(self, guild_id):
+        """Post the guild's buffered events as one digest"""
+        buffer = self.buffers.pop(guild_id, None)
+        channel_id = self.bot.log_channels.get(guild_id)
+        channel = self.bot.get_channel(channel_id) if channel_id else None
+        if buffer is None or channel is None:
+            return
+
+        language = self.bot.language_prefs.language_for(guild_id=guild_id)
+        template = get_embed_template("activity_digest", language)
+        labels = template.labels
+        lines = [
+            labels[f"activity_{kind}"].format(count=count, channel=f"<#{event_channel_id}>")
+            for (kind, event_channel_id), count in buffer['entries'].items()
+        ]
+        embed = template.build(description="\n".join(lines))
+        embed.set_footer(text=labels["activity_digest_footer"].format(
+            events=buffer['events'], coalesced=buffer['coalesced'], dropped=buffer['dropped']
+        ))
+        try:
+            await channel.send(embed=embed)
+            self.digests += 1
+        except discord.HTTPException as e:
+            print(f"Error posting activity digest for guild {guild_id}: {e}")
+
+    async def run(self):
+        """Post every buffered guild's digest each interval while the bot runs"""
+        await self.bot.wait_until_ready()
+        while not self.bot.is_closed():
+            await asyncio.sleep(self.interval)
+            for guild_id in list(self.buffers):
+                if guild_id not in self.flushing:
+                    await self.flush(guild_id)
+
+    def stats(self):
+        """Counters for the stats snapshot"""
+        return {
+            'buffered_guilds': len(self.buffers),
+            'events': self.events,
+            'coalesced': self.coalesced,
+            'dropped': self.dropped,
+            'digests': self.digests
+        }
@@ -0,0 +1,121 @@
+import math
+import os
+import time
+from collections import OrderedDict
+
+from discord import app_commands
+
+from bot.utils.translations import get_translation
+
+# Read-only commands that answer from the response cache (even past its TTL)
+# instead of being rejected when their caller is over the limit
+DEGRADABLE_COMMANDS = {'teamstats', 'tournaments', 'standings', 'predictions', 'ayuda', 'listmatches'}
+
+
+def parse_rate(text, default):
+    """'burst/seconds' (e.g. '5/10': 5 calls, refilled over 10 s) -> (capacity, tokens per second)"""
+    try:
+        burst, seconds = (float(part) for part in (text or default).split('/'))
+    except ValueError:
+        burst, seconds = (float(part) for part in default.split('/'))
+    return burst, burst / seconds
+
+
+class TokenBuckets:
+    """Token buckets by key, refilled lazily, least recently used evicted past max_keys
+
+    An evicted bucket had been idle longest; it would be (nearly) full again, so
+    recreating it full loses little.
+    """
+
+    def __init__(self, capacity, rate, max_keys=10000):
+        self.capacity = capacity
+        self.rate = rate
+        self.max_keys = max_keys
+        self.buckets = OrderedDict()  # key -> [tokens, last refill]
+
+    def available(self, key, now):
+        """Refill and return the bucket of key"""
+        bucket = self.buckets.get(key)
+        if bucket is None:
+            bucket = self.buckets[key] = [self.capacity, now]
+            if len(self.buckets) > self.max_keys:
+                self.buckets.popitem(last=False)
+        else:
+            self.buckets.move_to_end(key)
+            bucket[0] = min(self.capacity, bucket[0] + (now - bucket[1]) * self.rate)
+            bucket[1] = now
+        return bucket
+
+    def retry_after(self, bucket):
+        """Seconds until a bucket holds one token"""
+        return max(0.0, (1 - bucket[0]) / self.rate)
+
+
+class AdmissionControl:
+    """Per-user, per-guild and global token buckets in front of every app command"""
+
+    def __init__(self, max_keys=10000):
+        self.scopes = {
+            'user': TokenBuckets(*parse_rate(os.getenv("RATE_LIMIT_USER"), '5/10'), max_keys),
+            'guild': TokenBuckets(*parse_rate(os.getenv("RATE_LIMIT_GUILD"), '30/10'), max_keys),
+            'global': TokenBuckets(*parse_rate(os.getenv("RATE_LIMIT_GLOBAL"), '200/10'), 1)
+        }
+        self.admitted = 0
+        self.limited = dict.fromkeys(self.scopes, 0)  # over-limit calls by the scope that limited them
+        self.degraded = 0  # over-limit calls let through to answer from the cache
+        self.rejected = 0  # calls answered with rate_limited
+
+    def admit(self, user_id, guild_id):
+        """Take a token from every bucket, or none; returns (None, 0) or (limiting scope, retry seconds)"""
+        now = time.monotonic()
+        keys = {'user': user_id, 'guild': guild_id, 'global': None}
+        buckets = {scope: self.scopes[scope].available(key, now) for scope, key in keys.items()}
+        for scope, bucket in buckets.items():
+            if bucket[0] < 1:
+                return scope, self.scopes[scope].retry_after(bucket)
+        for bucket in buckets.values():
+            bucket[0] -= 1
+        return None, 0
+
+    async def check(self, interaction):
+        """Tree-wide check: True to run the command (possibly marked throttled), False after rejecting"""
+        command = interaction.command.name if interaction.command else None
+        scope, retry_after = self.admit(interaction.user.id, interaction.guild_id)
+        if scope is None:
+            self.admitted += 1
+            return True
+
+        self.limited[scope] += 1
+        if command in DEGRADABLE_COMMANDS:
+            # Let it through; the command answers only from the cache
+            interaction.extras['throttled'] = True
+            self.degraded += 1
+            return True
+        await self.reject(interaction, retry_after)
+        return False
+
+    async def reject(self, interaction, retry_after=1):
+        """Tell the caller to slow down (also used by a throttled command with nothing cached)"""
+        self.rejected += 1
+        lang = interaction.client.get_user_language(interaction)
+        text = get_translation('rate_limited', lang).format(seconds=math.ceil(retry_after))
+        if not interaction.response.is_done():
+            await interaction.response.send_message(text, ephemeral=True)
+
+    def stats(self):
+        """Counters for the stats snapshot"""
+        return {
+            'admitted': self.admitted,
+            'limited': dict(self.limited),
+            'degraded': self.degraded,
+            'rejected': self.rejected,
+            'tracked': {scope: len(buckets.buckets) for scope, buckets in self.scopes.items()}
+        }
+
+
+class AdmissionTree(app_commands.CommandTree):
+    """Command tree that runs every app command through the bot's admission control"""
+
+    async def interaction_check(self, interaction):
+        return await self.client.admission.check(interaction)
@@ -0,0 +1,217 @@
+import argparse
+import asyncio
+import glob
+import hashlib
+import os
+import sqlite3
+import time
+from datetime import datetime
+
+
+class TooManyRestarts(Exception):
+    """Raised from the progress callback to stop an incremental copy that keeps restarting"""
+
+
+def file_checksum(path):
+    """SHA-256 of a file, read in 1 MB chunks"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def copy_database(source_path, dest_path, pages=256, pause=0.01, max_restarts=3):
+    """Copy a live SQLite database with the online backup API, a few pages at a time
+
+    The source is only read-locked while a step runs; between steps the copy sleeps
+    for `pause` seconds so writers get the database. A write from another connection
+    makes SQLite restart the copy, so after `max_restarts` the rest is copied in one
+    step. Returns a report with throughput and the longest step (the worst-case time
+    a writer could have waited on the copy).
+    """
+    report = {'pages': 0, 'steps': 0, 'restarts': 0, 'max_step_ms': 0.0}
+    state = {'remaining': None, 'step_started': time.perf_counter()}
+
+    def progress(status, remaining, total):
+        report['steps'] += 1
+        report['pages'] = total
+        step_ms = (time.perf_counter() - state['step_started']) * 1000
+        report['max_step_ms'] = max(report['max_step_ms'], step_ms)
+
+        if state['remaining'] is not None and remaining > state['remaining']:
+            report['restarts'] += 1
+            if report['restarts'] > max_restarts:
+                raise TooManyRestarts()
+        state['remaining'] = remaining
+
+        if remaining:
+            time.sleep(pause)
+        state['step_started'] = time.perf_counter()
+
+    started = time.perf_counter()
+    source = sqlite3.connect(source_path, timeout=30)
+    dest = sqlite3.connect(dest_path)
+    try:
+        # In WAL mode an open read transaction pins one snapshot for the whole copy,
+        # so concurrent commits neither restart it nor wait for it
+        source.execute('BEGIN')
+        source.execute('SELECT COUNT(*) FROM sqlite_master').fetchone()
+        try:
+            source.backup(dest, pages=pages, progress=progress)
+        except TooManyRestarts:
+            step_started = time.perf_counter()
+            source.backup(dest)
+            report['steps'] += 1
+            report['max_step_ms'] = max(report['max_step_ms'], (time.perf_counter() - step_started) * 1000)
+
+        # Snapshots are standalone files; the restored database switches back to WAL on startup
+        dest.execute('PRAGMA journal_mode=DELETE')
+    finally:
+        dest.close()
+        source.close()
+
+    report['seconds'] = time.perf_counter() - started
+    report['bytes'] = os.path.getsize(dest_path)
+    report['mb_per_second'] = report['bytes'] / 1024 / 1024 / report['seconds'] if report['seconds'] else 0.0
+    return report
+
+
+def verify_snapshot(path):
+    """Check a snapshot against its .sha256 file and run SQLite's quick_check; returns an error or None"""
+    checksum_path = path + '.sha256'
+    if not os.path.exists(checksum_path):
+        return "missing checksum file"
+
+    with open(checksum_path) as f:
+        expected = f.read().split()[0]
+    if file_checksum(path) != expected:
+        return "checksum mismatch"
+
+    conn = sqlite3.connect(f"file:{path}?mode=ro", uri=True)
+    try:
+        result = conn.execute('PRAGMA quick_check').fetchone()[0]
+    finally:
+        conn.close()
+    return None if result == 'ok' else f"quick_check: {result}"
+
+
+def restore_snapshot(snapshot_path, db_path):
+    """Verify a snapshot and copy it over the database (stop the bot first)"""
+    error = verify_snapshot(snapshot_path)
+    if error:
+        raise ValueError(f"Refusing to restore {snapshot_path}: {error}")
+
+    # Copying through the backup API (not the file) also resets the target's WAL
+    source = sqlite3.connect(f"file:{snapshot_path}?mode=ro", uri=True)
+    dest = sqlite3.connect(db_path)
+    try:
+        source.backup(dest)
+    finally:
+        dest.close()
+        source.close()
+
+
+class BackupManager:
+    """Scheduled, rotated and verified snapshots of the bot database"""
+
+    def __init__(self, db_path, directory='backups', keep=7, interval_hours=24, pages=256, pause=0.01):
+        self.db_path = db_path
+        self.directory = directory
+        self.keep = keep
+        self.interval_hours = interval_hours
+        self.pages = pages
+        self.pause = pause
+        self.last_report = None
+        self.running = False
+
+    def list_snapshots(self):
+        """Snapshot paths, newest first"""
+        name = os.path.splitext(os.path.basename(self.db_path))[0]
+        return sorted(glob.glob(os.path.join(self.directory, f"{name}-*.db")), reverse=True)
+
+    def create_snapshot(self):
+        """Copy, checksum, verify and rotate; returns the copy report (blocking)"""
+        os.makedirs(self.directory, exist_ok=True)
+        name = os.path.splitext(os.path.basename(self.db_path))[0]
+        path = os.path.join(self.directory, f"{name}-{datetime.utcnow().strftime('%Y%m%d-%H%M%S')}.db")
+        partial = path + '.partial'
+
+        report = copy_database(self.db_path, partial, self.pages, self.pause)
+        checksum = file_checksum(partial)
+        os.replace(partial, path)
+        with open(path + '.sha256', 'w') as f:
+            f.write(f"{checksum}  {os.path.basename(path)}\n")
+
+        error = verify_snapshot(path)
+        if error:
+            raise RuntimeError(f"Snapshot {path} failed verification: {error}")
+
+        report['path'] = path
+        report['sha256'] = checksum
+        self.last_report = report
+        self.rotate()
+        return report
+
+    def rotate(self):
+        """Delete all but the newest `keep` snapshots"""
+        for path in self.list_snapshots()[self.keep:]:
+            for stale in (path, path + '.sha256'):
+                if os.path.exists(stale):
+                    os.remove(stale)
+
+    async def snapshot(self):
+        """Create a snapshot in a worker thread so the event loop keeps running"""
+        if self.running:
+            raise RuntimeError("A backup is already running")
+        self.running = True
+        try:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(None, self.create_snapshot)
+        finally:
+            self.running = False
+
+    async def run_schedule(self, bot):
+        """Take a snapshot every `interval_hours` while the bot runs"""
+        await bot.wait_until_ready()
+        while not bot.is_closed():
+            await asyncio.sleep(self.interval_hours * 3600)
+            try:
+                report = await self.snapshot()
+                print(f"Backup {report['path']}: {report['bytes'] / 1024 / 1024:.1f} MB in {report['seconds']:.1f}s "
+                      f"({report['mb_per_second']:.1f} MB/s, longest step {report['max_step_ms']:.1f} ms, "
+                      f"{report['restarts']} restarts)")
+            except Exception as e:
+                print(f"Error creating backup: {e}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Create, list, verify and restore database snapshots")
+    parser.add_argument('--db', default='bot_data.db')
+    parser.add_argument('--dir', default=os.getenv('BACKUP_DIR', 'backups'))
+    parser.add_argument('--keep', type=int, default=int(os.getenv('BACKUP_KEEP', '7')))
+    subparsers = parser.add_subparsers(dest='action', required=True)
+    subparsers.add_parser('create')
+    subparsers.add_parser('list')
+    subparsers.add_parser('verify').add_argument('snapshot', nargs='?')
+    subparsers.add_parser('restore').add_argument('snapshot')
+    args = parser.parse_args()
+
+    manager = BackupManager(args.db, args.dir, keep=args.keep)
+    if args.action == 'create':
+        report = manager.create_snapshot()
+        print(f"{report['path']}: {report['pages']} pages, {report['mb_per_second']:.1f} MB/s, "
+              f"longest step {report['max_step_ms']:.1f} ms, {report['restarts']} restarts")
+    elif args.action == 'list':
+        for path in manager.list_snapshots():
+            print(f"{path}  {os.path.getsize(path) / 1024 / 1024:.1f} MB")
+    elif args.action == 'verify':
+        for path in [args.snapshot] if args.snapshot else manager.list_snapshots():
+            print(f"{path}: {verify_snapshot(path) or 'ok'}")
+    elif args.action == 'restore':
+        restore_snapshot(args.snapshot, args.db)
+        print(f"Restored {args.db} from {args.snapshot}")
+
+
+if __name__ == '__main__':
+    main()
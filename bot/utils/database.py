@@ -1,20 +1,64 @@
 import sqlite3
 import os
-from datetime import datetime
+from datetime import datetime, timedelta
 import threading
+from itertools import groupby
+from bot.utils.ratings import INITIAL_RATING, K_FACTOR, elo_update, match_score, replay_ratings
+from bot.utils.recurrence import Recurrence, parse_time
+
+# Full-text indexes kept in sync with their content tables by triggers:
+# name -> (content table, indexed columns)
+FTS_INDEXES = {
+    'event_logs_fts': ('event_logs', ('event_type', 'description')),
+    'announcements_fts': ('scheduled_announcements', ('message',))
+}
+
+
+def fts_query(text):
+    """Turn free text into an FTS5 query: every word must match; 'word*' matches as a prefix"""
+    terms = []
+    for word in text.split():
+        prefix = len(word) > 1 and word.endswith('*')
+        word = word.rstrip('*')
+        if word:
+            terms.append('"' + word.replace('"', '""') + '"' + ('*' if prefix else ''))
+    return ' '.join(terms)
 
 class Database:
+    # Seconds a connection waits on another process's write lock before failing
+    BUSY_TIMEOUT = 30
+    # Searches rank only the most recent matches, so common words stay fast on huge logs
+    SEARCH_WINDOW = 200
+    
     def __init__(self, db_path="bot_data.db"):
         self.db_path = db_path
         self.lock = threading.Lock()
+        self.change_listeners = []
         self.init_database()
     
+    def add_change_listener(self, callback):
+        """Call callback(guild_id, tables) after writes to tables that cached replies read"""
+        self.change_listeners.append(callback)
+    
+    def _changed(self, guild_id, *tables):
+        """Notify listeners that tables changed for a guild (None: every guild)"""
+        for callback in self.change_listeners:
+            callback(guild_id, tables)
+    
+    def _connect(self):
+        """Open a connection that waits for other processes' locks instead of failing"""
+        return sqlite3.connect(self.db_path, timeout=self.BUSY_TIMEOUT)
+    
     def init_database(self):
         """Initialize database tables"""
         with self.lock:
-            conn = sqlite3.connect(self.db_path)
+            conn = self._connect()
             cursor = conn.cursor()
             
+            # WAL lets cluster workers read while another process writes;
+            # the setting is persistent, so it only has to be applied once
+            cursor.execute('PRAGMA journal_mode=WAL')
+            
             # Commands log table
             cursor.execute('''
                 CREATE TABLE IF NOT EXISTS command_logs (
@@ -47,6 +91,14 @@ class Database:
                 )
             ''')
             
+            # Per-user settings table
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS user_settings (
+                    user_id INTEGER PRIMARY KEY,
+                    language TEXT
+                )
+            ''')
+            
             # Teams table
             cursor.execute('''
                 CREATE TABLE IF NOT EXISTS teams (
@@ -57,10 +109,15 @@ class Database:
                     wins INTEGER DEFAULT 0,
                     losses INTEGER DEFAULT 0,
                     draws INTEGER DEFAULT 0,
+                    rating REAL DEFAULT 1500,
                     created_at DATETIME DEFAULT CURRENT_TIMESTAMP
                 )
             ''')
             
+            # Databases created before ratings existed get the column; the owner replays history once
+            # (see ratings_pending) so the replay doesn't run inside this constructor
+            ratings_added = self._ensure_column(cursor, 'teams', 'rating', 'REAL DEFAULT 1500')
+            
             # Matches results table
             cursor.execute('''
                 CREATE TABLE IF NOT EXISTS match_results (
@@ -87,9 +144,42 @@ class Database:
                     start_date DATETIME,
                     end_date DATETIME,
                     created_by INTEGER,
+                    format TEXT,
+                    created_at DATETIME DEFAULT CURRENT_TIMESTAMP
+                )
+            ''')
+            self._ensure_column(cursor, 'tournaments', 'format', 'TEXT')
+            
+            # Matches table (standalone matches and tournament fixtures); a fixture
+            # whose teams depend on earlier results links to where its winner/loser goes
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS matches (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    guild_id INTEGER NOT NULL,
+                    channel_id INTEGER,
+                    team1 TEXT,
+                    team2 TEXT,
+                    match_date DATETIME,
+                    created_by INTEGER,
+                    language TEXT,
+                    status TEXT DEFAULT 'scheduled',
+                    tournament_id INTEGER,
+                    bracket TEXT,
+                    round INTEGER,
+                    stage INTEGER,
+                    winner_to_match INTEGER,
+                    winner_to_side INTEGER,
+                    loser_to_match INTEGER,
+                    loser_to_side INTEGER,
                     created_at DATETIME DEFAULT CURRENT_TIMESTAMP
                 )
             ''')
+            cursor.execute('CREATE INDEX IF NOT EXISTS idx_matches_status ON matches (status)')
+            cursor.execute('CREATE INDEX IF NOT EXISTS idx_matches_tournament ON matches (tournament_id, stage)')
+            cursor.execute('CREATE INDEX IF NOT EXISTS idx_matches_guild_date ON matches (guild_id, status, match_date, id)')
+            # Keyset pages of a guild's results walk this index by id
+            cursor.execute('DROP INDEX IF EXISTS idx_match_results_guild')
+            cursor.execute('CREATE INDEX IF NOT EXISTS idx_match_results_guild_id ON match_results (guild_id, id)')
             
             # Scheduled announcements table
             cursor.execute('''
@@ -104,6 +194,15 @@ class Database:
                     created_at DATETIME DEFAULT CURRENT_TIMESTAMP
                 )
             ''')
+            # recurrence: NULL for one-shot, else an interval or cron rule (bot.utils.recurrence);
+            # next_fire: when the announcement is next due, NULL once a one-shot has been sent or retired as undeliverable
+            self._ensure_column(cursor, 'scheduled_announcements', 'recurrence', 'TEXT')
+            if self._ensure_column(cursor, 'scheduled_announcements', 'next_fire', 'DATETIME'):
+                cursor.execute('UPDATE scheduled_announcements SET next_fire = schedule_time WHERE NOT is_sent')
+            cursor.execute('''
+                CREATE INDEX IF NOT EXISTS idx_announcements_next_fire
+                ON scheduled_announcements (next_fire) WHERE next_fire IS NOT NULL
+            ''')
             
             # Member activity table
             cursor.execute('''
@@ -116,13 +215,169 @@ class Database:
                 )
             ''')
             
+            # Unique-active-member sketches (HyperLogLog registers per guild and UTC day)
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS activity_sketches (
+                    guild_id INTEGER NOT NULL,
+                    day TEXT NOT NULL,
+                    registers BLOB NOT NULL,
+                    PRIMARY KEY (guild_id, day)
+                )
+            ''')
+            
+            # Checkpointed Space-Saving counters behind /topactive
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS activity_leaders (
+                    guild_id INTEGER NOT NULL,
+                    user_id INTEGER NOT NULL,
+                    count INTEGER NOT NULL,
+                    error INTEGER NOT NULL DEFAULT 0,
+                    PRIMARY KEY (guild_id, user_id)
+                )
+            ''')
+            
+            # Per-day standings rollups, so windowed tables never scan match_results
+            cursor.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'standings_rollups'")
+            rollups_exist = cursor.fetchone() is not None
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS standings_rollups (
+                    guild_id INTEGER NOT NULL,
+                    day TEXT NOT NULL,
+                    team_name TEXT NOT NULL,
+                    points INTEGER NOT NULL DEFAULT 0,
+                    wins INTEGER NOT NULL DEFAULT 0,
+                    losses INTEGER NOT NULL DEFAULT 0,
+                    draws INTEGER NOT NULL DEFAULT 0,
+                    goals_for INTEGER NOT NULL DEFAULT 0,
+                    goals_against INTEGER NOT NULL DEFAULT 0,
+                    PRIMARY KEY (guild_id, day, team_name)
+                )
+            ''')
+            if not rollups_exist:
+                self._backfill_rollups(cursor)
+            
+            # Season boundaries and the standings frozen when a season closes
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS seasons (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    guild_id INTEGER NOT NULL,
+                    name TEXT NOT NULL,
+                    start_day TEXT NOT NULL,
+                    end_day TEXT,
+                    status TEXT DEFAULT 'active',
+                    created_at DATETIME DEFAULT CURRENT_TIMESTAMP
+                )
+            ''')
+            cursor.execute('CREATE INDEX IF NOT EXISTS idx_seasons_guild ON seasons (guild_id, status)')
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS season_standings (
+                    season_id INTEGER NOT NULL,
+                    team_name TEXT NOT NULL,
+                    points INTEGER NOT NULL,
+                    wins INTEGER NOT NULL,
+                    losses INTEGER NOT NULL,
+                    draws INTEGER NOT NULL,
+                    goals_for INTEGER NOT NULL,
+                    goals_against INTEGER NOT NULL,
+                    rating REAL,
+                    PRIMARY KEY (season_id, team_name)
+                )
+            ''')
+            
+            # Match winner predictions and each member's running accuracy
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS match_predictions (
+                    match_id INTEGER NOT NULL,
+                    user_id INTEGER NOT NULL,
+                    guild_id INTEGER NOT NULL,
+                    choice TEXT NOT NULL,
+                    PRIMARY KEY (match_id, user_id)
+                )
+            ''')
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS prediction_scores (
+                    guild_id INTEGER NOT NULL,
+                    user_id INTEGER NOT NULL,
+                    correct INTEGER NOT NULL DEFAULT 0,
+                    total INTEGER NOT NULL DEFAULT 0,
+                    PRIMARY KEY (guild_id, user_id)
+                )
+            ''')
+            
+            # Full-text search over event logs and announcements
+            for fts_table, (content_table, columns) in FTS_INDEXES.items():
+                self._create_fts_index(cursor, fts_table, content_table, columns)
+            
             conn.commit()
             conn.close()
+        
+        self.ratings_pending = ratings_added
+    
+    def _ensure_column(self, cursor, table, column, definition):
+        """Add a column to an existing table if it is missing; returns True when added"""
+        cursor.execute(f'PRAGMA table_info({table})')
+        if any(row[1] == column for row in cursor.fetchall()):
+            return False
+        cursor.execute(f'ALTER TABLE {table} ADD COLUMN {column} {definition}')
+        return True
+    
+    def _backfill_rollups(self, cursor):
+        """Build per-day standings rollups from every stored result (one-off migration)"""
+        sides = []
+        for team, goals_for, goals_against in (('team1_name', 'team1_score', 'team2_score'),
+                                               ('team2_name', 'team2_score', 'team1_score')):
+            sides.append(f'''
+                SELECT guild_id, substr(COALESCE(match_date, created_at), 1, 10) AS day, {team} AS team_name,
+                    CASE WHEN {goals_for} > {goals_against} THEN 3 WHEN {goals_for} = {goals_against} THEN 1 ELSE 0 END AS points,
+                    {goals_for} > {goals_against} AS win, {goals_for} < {goals_against} AS loss, {goals_for} = {goals_against} AS draw,
+                    {goals_for} AS goals_for, {goals_against} AS goals_against
+                FROM match_results
+                WHERE team1_score IS NOT NULL AND team2_score IS NOT NULL
+            ''')
+        cursor.execute(f'''
+            INSERT INTO standings_rollups (guild_id, day, team_name, points, wins, losses, draws, goals_for, goals_against)
+            SELECT guild_id, day, team_name, SUM(points), SUM(win), SUM(loss), SUM(draw), SUM(goals_for), SUM(goals_against)
+            FROM ({' UNION ALL '.join(sides)})
+            GROUP BY guild_id, day, team_name
+        ''')
+    
+    def _create_fts_index(self, cursor, fts_table, content_table, columns):
+        """Create an external-content FTS5 index with sync triggers, backfilling existing rows once"""
+        cursor.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", (fts_table,))
+        exists = cursor.fetchone() is not None
+        
+        column_list = ', '.join(columns)
+        new_values = ', '.join(f'new.{column}' for column in columns)
+        old_values = ', '.join(f'old.{column}' for column in columns)
+        
+        cursor.execute(f'''
+            CREATE VIRTUAL TABLE IF NOT EXISTS {fts_table}
+            USING fts5({column_list}, content='{content_table}', content_rowid='id')
+        ''')
+        cursor.execute(f'''
+            CREATE TRIGGER IF NOT EXISTS {fts_table}_insert AFTER INSERT ON {content_table} BEGIN
+                INSERT INTO {fts_table} (rowid, {column_list}) VALUES (new.id, {new_values});
+            END
+        ''')
+        cursor.execute(f'''
+            CREATE TRIGGER IF NOT EXISTS {fts_table}_delete AFTER DELETE ON {content_table} BEGIN
+                INSERT INTO {fts_table} ({fts_table}, rowid, {column_list}) VALUES ('delete', old.id, {old_values});
+            END
+        ''')
+        cursor.execute(f'''
+            CREATE TRIGGER IF NOT EXISTS {fts_table}_update AFTER UPDATE OF {column_list} ON {content_table} BEGIN
+                INSERT INTO {fts_table} ({fts_table}, rowid, {column_list}) VALUES ('delete', old.id, {old_values});
+                INSERT INTO {fts_table} (rowid, {column_list}) VALUES (new.id, {new_values});
+            END
+        ''')
+        
+        if not exists:
+            cursor.execute(f"INSERT INTO {fts_table} ({fts_table}) VALUES ('rebuild')")
     
     def log_command(self, command_name, user_id, guild_id=None):
         """Log a command usage"""
         with self.lock:
-            conn = sqlite3.connect(self.db_path)
+            conn = self._connect()
             cursor = conn.cursor()
             
             cursor.execute('''
@@ -136,7 +391,7 @@ class Database:
     def log_event(self, event_type, guild_id=None, description=None):
         """Log a bot event"""
         with self.lock:
-            conn = sqlite3.connect(self.db_path)
+            conn = self._connect()
             cursor = conn.cursor()
             
             cursor.execute('''
@@ -150,7 +405,7 @@ class Database:
     def get_command_stats(self, guild_id=None, limit=10):
         """Get command usage statistics"""
         with self.lock:
-            conn = sqlite3.connect(self.db_path)
+            conn = self._connect()
             cursor = conn.cursor()
             
             if guild_id:
@@ -178,7 +433,7 @@ class Database:
     def get_recent_events(self, guild_id=None, limit=10):
         """Get recent bot events"""
         with self.lock:
-            conn = sqlite3.connect(self.db_path)
+            conn = self._connect()
             cursor = conn.cursor()
             
             if guild_id:
@@ -204,7 +459,7 @@ class Database:
     def save_guild_settings(self, guild_id, log_channel_id=None, allowed_channels=None, language=None):
         """Save guild-specific settings"""
         with self.lock:
-            conn = sqlite3.connect(self.db_path)
+            conn = self._connect()
             cursor = conn.cursor()
             
             cursor.execute('''
@@ -219,7 +474,7 @@ class Database:
     def get_guild_settings(self, guild_id):
         """Get guild-specific settings"""
         with self.lock:
-            conn = sqlite3.connect(self.db_path)
+            conn = self._connect()
             cursor = conn.cursor()
             
             cursor.execute('''
@@ -232,11 +487,60 @@ class Database:
             conn.close()
             return result
     
+    # Language preference methods
+    def set_guild_language(self, guild_id, language):
+        """Set or clear (None) a guild's language override"""
+        with self.lock:
+            conn = self._connect()
+            cursor = conn.cursor()
+            
+            cursor.execute('''
+                INSERT INTO bot_settings (guild_id, language)
+                VALUES (?, ?)
+                ON CONFLICT(guild_id) DO UPDATE SET language = excluded.language
+            ''', (guild_id, language))
+            
+            conn.commit()
+            conn.close()
+    
+    def set_user_language(self, user_id, language):
+        """Set or clear (None) a user's language override"""
+        with self.lock:
+            conn = self._connect()
+            cursor = conn.cursor()
+            
+            if language:
+                cursor.execute('''
+                    INSERT INTO user_settings (user_id, language)
+                    VALUES (?, ?)
+                    ON CONFLICT(user_id) DO UPDATE SET language = excluded.language
+                ''', (user_id, language))
+            else:
+                cursor.execute('DELETE FROM user_settings WHERE user_id = ?', (user_id,))
+            
+            conn.commit()
+            conn.close()
+    
+    def get_language_preferences(self):
+        """Get all stored (guild_id, language) and (user_id, language) overrides"""
+        with self.lock:
+            conn = self._connect()
+            cursor = conn.cursor()
+            
+            cursor.execute('SELECT guild_id, language FROM bot_settings WHERE language IS NOT NULL')
+            guild_rows = cursor.fetchall()
+            
+            cursor.execute('SELECT user_id, language FROM user_settings WHERE language IS NOT NULL')
+            user_rows = cursor.fetchall()
+            
+            conn.close()
+            return guild_rows, user_rows
+    
     # Team management methods
     def add_team(self, guild_id, team_name):
         """Add a new team"""
         with self.lock:
-            conn = sqlite3.connect(self.db_path)
+            conn = self._connect()
             cursor = conn.cursor()
             
             cursor.execute('''
@@ -246,22 +550,23 @@ class Database:
             
             conn.commit()
             conn.close()
+            self._changed(guild_id, 'teams')
     
     def get_team_stats(self, guild_id, team_name=None):
         """Get team statistics"""
         with self.lock:
-            conn = sqlite3.connect(self.db_path)
+            conn = self._connect()
             cursor = conn.cursor()
             
             if team_name:
                 cursor.execute('''
-                    SELECT team_name, points, wins, losses, draws
+                    SELECT team_name, points, wins, losses, draws, rating
                     FROM teams
                     WHERE guild_id = ? AND team_name = ?
                 ''', (guild_id, team_name))
             else:
                 cursor.execute('''
-                    SELECT team_name, points, wins, losses, draws
+                    SELECT team_name, points, wins, losses, draws, rating
                     FROM teams
                     WHERE guild_id = ?
                     ORDER BY points DESC, wins DESC
@@ -274,7 +579,7 @@ class Database:
     def update_team_stats(self, guild_id, team_name, points_change, win=False, loss=False, draw=False):
         """Update team statistics"""
         with self.lock:
-            conn = sqlite3.connect(self.db_path)
+            conn = self._connect()
             cursor = conn.cursor()
             
             # Check if team exists, if not create it
@@ -299,53 +604,431 @@ class Database:
             cursor.execute(update_query, params)
             conn.commit()
             conn.close()
+            self._changed(guild_id, 'teams')
     
     # Match results methods
     def save_match_result(self, match_id, guild_id, team1_name, team2_name, team1_score, team2_score, match_date):
-        """Save match result"""
+        """Save match result; returns ((old, new) team1 rating, (old, new) team2 rating)"""
         with self.lock:
-            conn = sqlite3.connect(self.db_path)
+            conn = self._connect()
             cursor = conn.cursor()
             
-            # Determine winner
-            if team1_score > team2_score:
-                winner = team1_name
-            elif team2_score > team1_score:
-                winner = team2_name
-            else:
-                winner = 'draw'
+            changes = self._apply_results(cursor, guild_id, [{
+                'match_id': match_id, 'team1': team1_name, 'team2': team2_name,
+                'team1_score': team1_score, 'team2_score': team2_score, 'match_date': match_date
+            }])
             
-            cursor.execute('''
-                INSERT INTO match_results 
-                (match_id, guild_id, team1_name, team2_name, team1_score, team2_score, winner, match_date)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-            ''', (match_id, guild_id, team1_name, team2_name, team1_score, team2_score, winner, match_date))
+            conn.commit()
+            conn.close()
+            self._changed(guild_id, 'match_results', 'teams')
+            return changes[0]
+    
+    def record_results(self, guild_id, results):
+        """Save many results and finish their matches in one transaction
+        
+        results are dicts with match_id, team1, team2 (team names), team1_score,
+        team2_score, match_date and advance ((winner, loser) bracket entries, or None),
+        in the order they were played. Returns (rating changes per result, matches that
+        now have both teams, IDs of tournaments that are now complete), or None without
+        writing anything when a match is missing or already finished.
+        """
+        with self.lock:
+            conn = self._connect()
+            cursor = conn.cursor()
+            
+            match_ids = [result['match_id'] for result in results]
+            cursor.execute(f'''
+                SELECT COUNT(*) FROM matches
+                WHERE id IN ({', '.join('?' * len(match_ids))}) AND guild_id = ? AND status != 'finished'
+            ''', [*match_ids, guild_id])
+            if len(set(match_ids)) != len(match_ids) or cursor.fetchone()[0] != len(match_ids):
+                conn.close()
+                return None
+            
+            changes = self._apply_results(cursor, guild_id, results)
+            ready, completed = self._finish_matches(cursor, [
+                (result['match_id'], *(result.get('advance') or (None, None))) for result in results
+            ])
             
             conn.commit()
             conn.close()
+            self._changed(guild_id, 'matches', 'match_results', 'teams', *(('tournaments',) if completed else ()))
+            return changes, ready, completed
+    
+    def _apply_results(self, cursor, guild_id, results):
+        """Insert results and fold them into standings and ratings with one update per team
+        
+        Points and ratings are accumulated in memory, so the writes depend on the
+        number of distinct teams rather than on the number of results.
+        """
+        cursor.executemany('''
+            INSERT INTO match_results 
+            (match_id, guild_id, team1_name, team2_name, team1_score, team2_score, winner, match_date)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+        ''', [
+            (result['match_id'], guild_id, result['team1'], result['team2'], result['team1_score'], result['team2_score'],
+             self._winner(result), result['match_date'])
+            for result in results
+        ])
+        
+        names = list(dict.fromkeys(name for result in results for name in (result['team1'], result['team2'])))
+        cursor.execute(f'''
+            SELECT team_name, rating FROM teams
+            WHERE guild_id = ? AND team_name IN ({', '.join('?' * len(names))})
+        ''', [guild_id, *names])
+        ratings = dict(cursor.fetchall())
+        
+        # Teams seen for the first time start from scratch
+        new_teams = [name for name in names if name not in ratings]
+        cursor.executemany('INSERT INTO teams (guild_id, team_name) VALUES (?, ?)', [(guild_id, name) for name in new_teams])
+        ratings.update((name, INITIAL_RATING) for name in new_teams)
+        
+        # points, wins, losses, draws (lifetime), and the same plus goals per (day, team)
+        totals = {name: [0, 0, 0, 0] for name in names}
+        rollups = {}
+        today = datetime.now().strftime('%Y-%m-%d')
+        changes = []
+        for result in results:
+            team1, team2 = result['team1'], result['team2']
+            score = match_score(result['team1_score'], result['team2_score'])
+            day = str(result['match_date'])[:10] if result['match_date'] else today
+            for name, outcome, goals_for, goals_against in (
+                (team1, score, result['team1_score'], result['team2_score']),
+                (team2, 1.0 - score, result['team2_score'], result['team1_score'])
+            ):
+                row = rollups.setdefault((day, name), [0, 0, 0, 0, 0, 0])
+                if outcome == 1.0:
+                    changed = (3, 1, 0, 0)
+                elif outcome == 0.0:
+                    changed = (0, 0, 1, 0)
+                else:
+                    changed = (1, 0, 0, 1)
+                for index, value in enumerate(changed):
+                    totals[name][index] += value
+                    row[index] += value
+                row[4] += goals_for
+                row[5] += goals_against
             
-            # Update team stats
-            if winner == team1_name:
-                self.update_team_stats(guild_id, team1_name, 3, win=True)
-                self.update_team_stats(guild_id, team2_name, 0, loss=True)
-            elif winner == team2_name:
-                self.update_team_stats(guild_id, team2_name, 3, win=True)
-                self.update_team_stats(guild_id, team1_name, 0, loss=True)
-            else:  # draw
-                self.update_team_stats(guild_id, team1_name, 1, draw=True)
-                self.update_team_stats(guild_id, team2_name, 1, draw=True)
+            old1, old2 = ratings[team1], ratings[team2]
+            ratings[team1], ratings[team2] = elo_update(old1, old2, score)
+            changes.append(((old1, ratings[team1]), (old2, ratings[team2])))
+        
+        cursor.executemany('''
+            UPDATE teams
+            SET points = points + ?, wins = wins + ?, losses = losses + ?, draws = draws + ?, rating = ?
+            WHERE guild_id = ? AND team_name = ?
+        ''', [(*totals[name], ratings[name], guild_id, name) for name in names])
+        
+        cursor.executemany('''
+            INSERT INTO standings_rollups (guild_id, day, team_name, points, wins, losses, draws, goals_for, goals_against)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+            ON CONFLICT (guild_id, day, team_name) DO UPDATE SET
+                points = points + excluded.points, wins = wins + excluded.wins, losses = losses + excluded.losses,
+                draws = draws + excluded.draws, goals_for = goals_for + excluded.goals_for,
+                goals_against = goals_against + excluded.goals_against
+        ''', [(guild_id, day, name, *row) for (day, name), row in rollups.items()])
+        return changes
+    
+    @staticmethod
+    def _winner(result):
+        """Winning team name of a result dict, or 'draw'"""
+        if result['team1_score'] > result['team2_score']:
+            return result['team1']
+        if result['team2_score'] > result['team1_score']:
+            return result['team2']
+        return 'draw'
     
     def get_match_results(self, guild_id, limit=10):
         """Get recent match results"""
         with self.lock:
-            conn = sqlite3.connect(self.db_path)
+            conn = self._connect()
             cursor = conn.cursor()
             
             cursor.execute('''
                 SELECT team1_name, team2_name, team1_score, team2_score, winner, match_date
                 FROM match_results
                 WHERE guild_id = ?
-                ORDER BY created_at DESC
+                ORDER BY id DESC
+                LIMIT ?
+            ''', (guild_id, limit))
+            
+            results = cursor.fetchall()
+            conn.close()
+            return results
+    
+    def get_match_results_page(self, guild_id, before_id=None, limit=10):
+        """(id, team1, team2, score1, score2, winner, match_date) results older than before_id, newest first"""
+        with self.lock:
+            conn = self._connect()
+            cursor = conn.cursor()
+            
+            cursor.execute('''
+                SELECT id, team1_name, team2_name, team1_score, team2_score, winner, match_date
+                FROM match_results
+                WHERE guild_id = ? AND id < ?
+                ORDER BY id DESC
+                LIMIT ?
+            ''', (guild_id, before_id if before_id is not None else 2 ** 63 - 1, limit))
+            
+            results = cursor.fetchall()
+            conn.close()
+            return results
+    
+    def get_all_match_results(self):
+        """Every result of every guild, oldest first, for rebuilding in-memory indexes"""
+        with self.lock:
+            conn = self._connect()
+            cursor = conn.cursor()
+            
+            cursor.execute('''
+                SELECT guild_id, team1_name, team2_name, team1_score, team2_score, match_date
+                FROM match_results
+                WHERE team1_score IS NOT NULL AND team2_score IS NOT NULL
+                ORDER BY id
+            ''')
+            
+            results = cursor.fetchall()
+            conn.close()
+            return results
+    
+    # Rating methods
+    def recompute_ratings(self, guild_id=None, k=K_FACTOR):
+        """Replay match history to rebuild Elo ratings (every guild by default); returns matches replayed"""
+        with self.lock:
+            conn = self._connect()
+            cursor = conn.cursor()
+            
+            if guild_id:
+                cursor.execute('''
+                    SELECT guild_id, team1_name, team2_name, team1_score, team2_score
+                    FROM match_results
+                    WHERE guild_id = ?
+                    ORDER BY id
+                ''', (guild_id,))
+            else:
+                cursor.execute('''
+                    SELECT guild_id, team1_name, team2_name, team1_score, team2_score
+                    FROM match_results
+                    ORDER BY guild_id, id
+                ''')
+            history = cursor.fetchall()
+            
+            updates = []
+            for history_guild, rows in groupby(history, key=lambda row: row[0]):
+                ratings = replay_ratings((row[1:] for row in rows), k)
+                updates.extend((rating, history_guild, team) for team, rating in ratings.items())
+            
+            # Teams without history go back to the initial rating
+            if guild_id:
+                cursor.execute('UPDATE teams SET rating = ? WHERE guild_id = ?', (INITIAL_RATING, guild_id))
+            else:
+                cursor.execute('UPDATE teams SET rating = ?', (INITIAL_RATING,))
+            cursor.executemany('UPDATE teams SET rating = ? WHERE guild_id = ? AND team_name = ?', updates)
+            
+            conn.commit()
+            conn.close()
+            self._changed(guild_id, 'teams')
+            return len(history)
+    
+    # Season and windowed standings methods
+    STANDINGS_COLUMNS = '''
+        team_name, SUM(points) AS points, SUM(wins) AS wins, SUM(losses) AS losses, SUM(draws) AS draws,
+        SUM(goals_for) AS goals_for, SUM(goals_against) AS goals_against
+    '''
+    
+    def get_windowed_standings(self, guild_id, start_day=None, end_day=None):
+        """Standings summed from daily rollups between two 'YYYY-MM-DD' days (inclusive, open-ended if None)
+        
+        Rows are (team, points, wins, losses, draws, goals for, goals against).
+        """
+        with self.lock:
+            conn = self._connect()
+            cursor = conn.cursor()
+            
+            cursor.execute(f'''
+                SELECT {self.STANDINGS_COLUMNS}
+                FROM standings_rollups
+                WHERE guild_id = ? AND day >= ? AND day <= ?
+                GROUP BY team_name
+                ORDER BY points DESC, wins DESC, goals_for - goals_against DESC
+            ''', (guild_id, start_day or '', end_day or '9999-12-31'))
+            
+            results = cursor.fetchall()
+            conn.close()
+            return results
+    
+    def get_active_season(self, guild_id):
+        """(id, name, start_day) of the guild's open season, or None"""
+        with self.lock:
+            conn = self._connect()
+            cursor = conn.cursor()
+            
+            cursor.execute('''
+                SELECT id, name, start_day FROM seasons
+                WHERE guild_id = ? AND status = 'active'
+                ORDER BY id DESC LIMIT 1
+            ''', (guild_id,))
+            
+            result = cursor.fetchone()
+            conn.close()
+            return result
+    
+    def start_season(self, guild_id, name, day):
+        """Close the open season (freezing its standings) and open a new one; returns (new ID, closed ID or None)"""
+        with self.lock:
+            conn = self._connect()
+            cursor = conn.cursor()
+            
+            # The previous season ends the day before, so no day counts for both
+            previous_day = (datetime.strptime(day, '%Y-%m-%d') - timedelta(days=1)).strftime('%Y-%m-%d')
+            closed_id = self._close_season(cursor, guild_id, previous_day)
+            cursor.execute('''
+                INSERT INTO seasons (guild_id, name, start_day) VALUES (?, ?, ?)
+            ''', (guild_id, name, day))
+            season_id = cursor.lastrowid
+            
+            conn.commit()
+            conn.close()
+            self._changed(guild_id, 'seasons')
+            return season_id, closed_id
+    
+    def close_season(self, guild_id, day):
+        """Close the open season on `day`, freezing its standings; returns its ID or None"""
+        with self.lock:
+            conn = self._connect()
+            cursor = conn.cursor()
+            
+            season_id = self._close_season(cursor, guild_id, day)
+            
+            conn.commit()
+            conn.close()
+            self._changed(guild_id, 'seasons')
+            return season_id
+    
+    def _close_season(self, cursor, guild_id, day):
+        """Snapshot the open season's standings from the rollups and mark it closed"""
+        cursor.execute('''
+            SELECT id, start_day FROM seasons WHERE guild_id = ? AND status = 'active'
+        ''', (guild_id,))
+        season = cursor.fetchone()
+        if season is None:
+            return None
+        
+        season_id, start_day = season
+        cursor.execute(f'''
+            INSERT INTO season_standings (season_id, team_name, points, wins, losses, draws, goals_for, goals_against, rating)
+            SELECT ?, standings.*, teams.rating
+            FROM (
+                SELECT {self.STANDINGS_COLUMNS}
+                FROM standings_rollups
+                WHERE guild_id = ? AND day >= ? AND day <= ?
+                GROUP BY team_name
+            ) AS standings
+            LEFT JOIN teams ON teams.guild_id = ? AND teams.team_name = standings.team_name
+        ''', (season_id, guild_id, start_day, day, guild_id))
+        cursor.execute('''
+            UPDATE seasons SET status = 'closed', end_day = ? WHERE id = ?
+        ''', (day, season_id))
+        return season_id
+    
+    def get_seasons(self, guild_id):
+        """(id, name, start_day, end_day, status) of every season, newest first"""
+        with self.lock:
+            conn = self._connect()
+            cursor = conn.cursor()
+            
+            cursor.execute('''
+                SELECT id, name, start_day, end_day, status FROM seasons
+                WHERE guild_id = ?
+                ORDER BY id DESC
+            ''', (guild_id,))
+            
+            results = cursor.fetchall()
+            conn.close()
+            return results
+    
+    def get_season_standings(self, season_id, guild_id):
+        """Frozen standings of a closed season, in the same row shape as get_windowed_standings"""
+        with self.lock:
+            conn = self._connect()
+            cursor = conn.cursor()
+            
+            cursor.execute('''
+                SELECT standings.team_name, standings.points, standings.wins, standings.losses, standings.draws,
+                    standings.goals_for, standings.goals_against
+                FROM season_standings AS standings
+                JOIN seasons ON seasons.id = standings.season_id
+                WHERE standings.season_id = ? AND seasons.guild_id = ?
+                ORDER BY standings.points DESC, standings.wins DESC, standings.goals_for - standings.goals_against DESC
+            ''', (season_id, guild_id))
+            
+            results = cursor.fetchall()
+            conn.close()
+            return results
+    
+    # Prediction methods
+    def save_predictions(self, rows):
+        """Upsert (match_id, user_id, guild_id, choice) votes in one transaction"""
+        with self.lock:
+            conn = self._connect()
+            cursor = conn.cursor()
+            
+            cursor.executemany('''
+                INSERT INTO match_predictions (match_id, user_id, guild_id, choice)
+                VALUES (?, ?, ?, ?)
+                ON CONFLICT (match_id, user_id) DO UPDATE SET choice = excluded.choice
+            ''', rows)
+            
+            conn.commit()
+            conn.close()
+    
+    def get_open_predictions(self):
+        """(match_id, user_id, choice) votes on matches that haven't been played"""
+        with self.lock:
+            conn = self._connect()
+            cursor = conn.cursor()
+            
+            cursor.execute('''
+                SELECT match_predictions.match_id, match_predictions.user_id, match_predictions.choice
+                FROM match_predictions
+                JOIN matches ON matches.id = match_predictions.match_id
+                WHERE matches.status = 'scheduled'
+            ''')
+            
+            results = cursor.fetchall()
+            conn.close()
+            return results
+    
+    def settle_predictions(self, guild_id, outcomes):
+        """Add each voter's hit or miss for [(match_id, winning choice)] to their score"""
+        with self.lock:
+            conn = self._connect()
+            cursor = conn.cursor()
+            
+            cursor.executemany('''
+                INSERT INTO prediction_scores (guild_id, user_id, correct, total)
+                SELECT guild_id, user_id, choice = ?, 1
+                FROM match_predictions
+                WHERE match_id = ?
+                ON CONFLICT (guild_id, user_id) DO UPDATE SET
+                    correct = correct + excluded.correct, total = total + 1
+            ''', [(outcome, match_id) for match_id, outcome in outcomes])
+            
+            conn.commit()
+            conn.close()
+            self._changed(guild_id, 'prediction_scores')
+    
+    def get_prediction_leaders(self, guild_id, limit=10):
+        """(user_id, correct, total) of the best predictors"""
+        with self.lock:
+            conn = self._connect()
+            cursor = conn.cursor()
+            
+            cursor.execute('''
+                SELECT user_id, correct, total
+                FROM prediction_scores
+                WHERE guild_id = ?
+                ORDER BY correct DESC, CAST(correct AS REAL) / total DESC
                 LIMIT ?
             ''', (guild_id, limit))
             
@@ -354,26 +1037,27 @@ class Database:
             return results
     
     # Tournament methods
-    def create_tournament(self, guild_id, tournament_name, start_date, end_date, created_by):
+    def create_tournament(self, guild_id, tournament_name, start_date, end_date, created_by, format=None):
         """Create a new tournament"""
         with self.lock:
-            conn = sqlite3.connect(self.db_path)
+            conn = self._connect()
             cursor = conn.cursor()
             
             cursor.execute('''
-                INSERT INTO tournaments (guild_id, tournament_name, start_date, end_date, created_by)
-                VALUES (?, ?, ?, ?, ?)
-            ''', (guild_id, tournament_name, start_date, end_date, created_by))
+                INSERT INTO tournaments (guild_id, tournament_name, start_date, end_date, created_by, format)
+                VALUES (?, ?, ?, ?, ?, ?)
+            ''', (guild_id, tournament_name, start_date, end_date, created_by, format))
             
             tournament_id = cursor.lastrowid
             conn.commit()
             conn.close()
+            self._changed(guild_id, 'tournaments')
             return tournament_id
     
     def get_tournaments(self, guild_id, status=None):
         """Get tournaments"""
         with self.lock:
-            conn = sqlite3.connect(self.db_path)
+            conn = self._connect()
             cursor = conn.cursor()
             
             if status:
@@ -395,60 +1079,316 @@ class Database:
             conn.close()
             return results
     
+    # Match methods
+    MATCH_COLUMNS = 'id, guild_id, channel_id, team1, team2, match_date, created_by, language, tournament_id, bracket'
+    
+    def create_match(self, guild_id, channel_id, team1, team2, match_date, created_by, language):
+        """Create a standalone match; returns its ID"""
+        with self.lock:
+            conn = self._connect()
+            cursor = conn.cursor()
+            
+            cursor.execute('''
+                INSERT INTO matches (guild_id, channel_id, team1, team2, match_date, created_by, language)
+                VALUES (?, ?, ?, ?, ?, ?, ?)
+            ''', (guild_id, channel_id, team1, team2, match_date.isoformat(' '), created_by, language))
+            
+            match_id = cursor.lastrowid
+            conn.commit()
+            conn.close()
+            self._changed(guild_id, 'matches')
+            return match_id
+    
+    def create_matches(self, guild_id, channel_id, created_by, language, matches):
+        """Create many standalone matches in one transaction; returns their IDs in order"""
+        with self.lock:
+            conn = self._connect()
+            cursor = conn.cursor()
+            
+            match_ids = []
+            for match in matches:
+                cursor.execute('''
+                    INSERT INTO matches (guild_id, channel_id, team1, team2, match_date, created_by, language)
+                    VALUES (?, ?, ?, ?, ?, ?, ?)
+                ''', (guild_id, channel_id, match['team1'], match['team2'], match['match_date'].isoformat(' '), created_by, language))
+                match_ids.append(cursor.lastrowid)
+            
+            conn.commit()
+            conn.close()
+            self._changed(guild_id, 'matches')
+            return match_ids
+    
+    def create_fixtures(self, tournament_id, guild_id, channel_id, created_by, language, fixtures):
+        """Insert generated fixtures and their advancement links in one transaction
+        
+        Returns the IDs of the inserted matches, in fixture order.
+        """
+        with self.lock:
+            conn = self._connect()
+            cursor = conn.cursor()
+            
+            match_ids = []
+            for fixture in fixtures:
+                cursor.execute('''
+                    INSERT INTO matches
+                    (guild_id, channel_id, team1, team2, match_date, created_by, language,
+                     tournament_id, bracket, round, stage)
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                ''', (
+                    guild_id, channel_id, fixture['team1'], fixture['team2'], fixture['match_date'].isoformat(' '),
+                    created_by, language, tournament_id, fixture['bracket'], fixture['round'], fixture['stage']
+                ))
+                match_ids.append(cursor.lastrowid)
+            
+            # Links refer to fixture keys (list positions) until the real IDs are known
+            links = []
+            for match_id, fixture in zip(match_ids, fixtures):
+                winner_to = fixture['winner_to'] or (None, None)
+                loser_to = fixture['loser_to'] or (None, None)
+                if fixture['winner_to'] or fixture['loser_to']:
+                    links.append((
+                        match_ids[winner_to[0]] if winner_to[0] is not None else None, winner_to[1],
+                        match_ids[loser_to[0]] if loser_to[0] is not None else None, loser_to[1],
+                        match_id
+                    ))
+            cursor.executemany('''
+                UPDATE matches
+                SET winner_to_match = ?, winner_to_side = ?, loser_to_match = ?, loser_to_side = ?
+                WHERE id = ?
+            ''', links)
+            
+            conn.commit()
+            conn.close()
+            self._changed(guild_id, 'matches')
+            return match_ids
+    
+    def get_active_matches(self):
+        """Get scheduled matches whose teams are both known, for the in-memory match cache"""
+        with self.lock:
+            conn = self._connect()
+            cursor = conn.cursor()
+            
+            cursor.execute(f'''
+                SELECT {self.MATCH_COLUMNS}
+                FROM matches
+                WHERE status = 'scheduled' AND team1 IS NOT NULL AND team2 IS NOT NULL
+                ORDER BY match_date
+            ''')
+            
+            results = cursor.fetchall()
+            conn.close()
+            return results
+    
+    def get_scheduled_matches_page(self, guild_id, after=None, limit=10):
+        """(id, team1, team2, match_date) of upcoming matches after the (match_date, id) cursor, soonest first"""
+        with self.lock:
+            conn = self._connect()
+            cursor = conn.cursor()
+            
+            after_date, after_id = after or ('', 0)
+            cursor.execute('''
+                SELECT id, team1, team2, match_date
+                FROM matches
+                WHERE guild_id = ? AND status = 'scheduled' AND (match_date, id) > (?, ?)
+                    AND team1 IS NOT NULL AND team2 IS NOT NULL
+                ORDER BY match_date, id
+                LIMIT ?
+            ''', (guild_id, after_date, after_id, limit))
+            
+            results = cursor.fetchall()
+            conn.close()
+            return results
+    
+    def end_match(self, match_id):
+        """Mark a match as ended without a result"""
+        with self.lock:
+            conn = self._connect()
+            cursor = conn.cursor()
+            
+            cursor.execute('SELECT guild_id FROM matches WHERE id = ?', (match_id,))
+            row = cursor.fetchone()
+            cursor.execute("UPDATE matches SET status = 'ended' WHERE id = ?", (match_id,))
+            
+            conn.commit()
+            conn.close()
+            if row is not None:
+                self._changed(row[0], 'matches')
+    
+    def finish_match(self, match_id, winner=None, loser=None):
+        """Mark a match as played and advance its teams through the bracket
+        
+        Returns (matches that now have both teams, whether the tournament is complete).
+        """
+        with self.lock:
+            conn = self._connect()
+            cursor = conn.cursor()
+            
+            # Already ended elsewhere (or deleted): nothing to advance
+            cursor.execute("SELECT guild_id FROM matches WHERE id = ? AND status != 'finished'", (match_id,))
+            row = cursor.fetchone()
+            if row is None:
+                conn.close()
+                return [], False
+            guild_id = row[0]
+            ready, completed = self._finish_matches(cursor, [(match_id, winner, loser)])
+            
+            conn.commit()
+            conn.close()
+            self._changed(guild_id, 'matches', *(('tournaments',) if completed else ()))
+            return ready, bool(completed)
+    
+    def _finish_matches(self, cursor, finished):
+        """Finish (match_id, winner, loser) entries; returns (ready match rows, completed tournament IDs)"""
+        targets = []
+        tournaments = set()
+        for match_id, winner, loser in finished:
+            cursor.execute('''
+                SELECT tournament_id, winner_to_match, winner_to_side, loser_to_match, loser_to_side
+                FROM matches WHERE id = ? AND status != 'finished'
+            ''', (match_id,))
+            row = cursor.fetchone()
+            if row is None:
+                continue
+            cursor.execute("UPDATE matches SET status = 'finished' WHERE id = ?", (match_id,))
+            tournament_id, winner_match, winner_side, loser_match, loser_side = row
+            if tournament_id is not None:
+                tournaments.add(tournament_id)
+            
+            for target, side, team in ((winner_match, winner_side, winner), (loser_match, loser_side, loser)):
+                if target is not None and team is not None:
+                    cursor.execute(f'UPDATE matches SET team{int(side)} = ? WHERE id = ?', (team, target))
+                    targets.append(target)
+        
+        ready = []
+        if targets:
+            cursor.execute(f'''
+                SELECT {self.MATCH_COLUMNS}
+                FROM matches
+                WHERE id IN ({', '.join('?' * len(targets))}) AND team1 IS NOT NULL AND team2 IS NOT NULL
+                    AND status = 'scheduled'
+            ''', targets)
+            ready = cursor.fetchall()
+        
+        completed = []
+        for tournament_id in sorted(tournaments):
+            cursor.execute('''
+                SELECT COUNT(*) FROM matches WHERE tournament_id = ? AND status = 'scheduled'
+            ''', (tournament_id,))
+            if cursor.fetchone()[0] == 0:
+                cursor.execute("UPDATE tournaments SET status = 'finished' WHERE id = ?", (tournament_id,))
+                completed.append(tournament_id)
+        return ready, completed
+    
+    def get_tournament_matches(self, tournament_id, guild_id):
+        """Get a tournament's fixtures in schedule order"""
+        with self.lock:
+            conn = self._connect()
+            cursor = conn.cursor()
+            
+            cursor.execute('''
+                SELECT id, team1, team2, match_date, status, bracket, round
+                FROM matches
+                WHERE tournament_id = ? AND guild_id = ?
+                ORDER BY stage, id
+            ''', (tournament_id, guild_id))
+            
+            results = cursor.fetchall()
+            conn.close()
+            return results
+    
     # Scheduled announcements methods
-    def schedule_announcement(self, guild_id, channel_id, message, schedule_time, created_by):
-        """Schedule an announcement"""
+    def schedule_announcement(self, guild_id, channel_id, message, schedule_time, created_by, recurrence=None):
+        """Schedule an announcement, first due at schedule_time and repeating by recurrence if given"""
         with self.lock:
-            conn = sqlite3.connect(self.db_path)
+            conn = self._connect()
             cursor = conn.cursor()
             
             cursor.execute('''
                 INSERT INTO scheduled_announcements 
-                (guild_id, channel_id, message, schedule_time, created_by)
-                VALUES (?, ?, ?, ?, ?)
-            ''', (guild_id, channel_id, message, schedule_time, created_by))
+                (guild_id, channel_id, message, schedule_time, created_by, recurrence, next_fire)
+                VALUES (?, ?, ?, ?, ?, ?, ?)
+            ''', (guild_id, channel_id, message, schedule_time, created_by, recurrence, schedule_time))
             
             announcement_id = cursor.lastrowid
             conn.commit()
             conn.close()
             return announcement_id
     
-    def get_pending_announcements(self):
-        """Get pending announcements"""
+    def get_pending_announcements(self, shard_count=None, shard_ids=None, now=None, limit=500):
+        """Get due announcements, earliest first, optionally only for guilds on the given shards
+        
+        Only the due prefix of the next_fire index is read, however many
+        announcements are scheduled further ahead.
+        """
         with self.lock:
-            conn = sqlite3.connect(self.db_path)
+            conn = self._connect()
             cursor = conn.cursor()
             
-            cursor.execute('''
-                SELECT id, guild_id, channel_id, message, schedule_time
+            query = '''
+                SELECT id, guild_id, channel_id, message, next_fire
                 FROM scheduled_announcements
-                WHERE is_sent = FALSE AND schedule_time <= datetime('now')
-            ''')
+                WHERE next_fire IS NOT NULL AND next_fire <= ?
+            '''
+            params = [now or datetime.now()]
+            
+            if shard_count and shard_ids is not None:
+                placeholders = ', '.join('?' for _ in shard_ids)
+                query += f' AND ((guild_id >> 22) % ?) IN ({placeholders})'
+                params += [shard_count, *shard_ids]
+            
+            query += ' ORDER BY next_fire, id LIMIT ?'
+            cursor.execute(query, [*params, limit])
             
             results = cursor.fetchall()
             conn.close()
             return results
     
-    def mark_announcement_sent(self, announcement_id):
-        """Mark announcement as sent"""
+    def finish_announcements(self, sent_ids, failed_ids=(), events=(), now=None):
+        """Record a dispatch cycle in one transaction: fired and undeliverable announcements plus their (event_type, guild_id, description) logs
+        
+        Either way the announcement leaves the due set: a one-shot is marked sent or
+        retired (is_sent stays FALSE), a recurring one moves to its next occurrence.
+        """
         with self.lock:
-            conn = sqlite3.connect(self.db_path)
+            conn = self._connect()
             cursor = conn.cursor()
             
-            cursor.execute('''
-                UPDATE scheduled_announcements
-                SET is_sent = TRUE
-                WHERE id = ?
-            ''', (announcement_id,))
+            now = now or datetime.now()
+            for announcement_id in sent_ids:
+                self._advance_announcement(cursor, announcement_id, now)
+            for announcement_id in failed_ids:
+                self._advance_announcement(cursor, announcement_id, now, sent=False)
+            cursor.executemany('''
+                INSERT INTO event_logs (event_type, guild_id, description)
+                VALUES (?, ?, ?)
+            ''', events)
             
             conn.commit()
             conn.close()
     
+    def _advance_announcement(self, cursor, announcement_id, now, sent=True):
+        cursor.execute('SELECT recurrence, next_fire FROM scheduled_announcements WHERE id = ?', (announcement_id,))
+        row = cursor.fetchone()
+        if row is None or row[1] is None:
+            return
+        recurrence, fired = row
+        if recurrence is None:
+            cursor.execute('''
+                UPDATE scheduled_announcements SET is_sent = ?, next_fire = NULL WHERE id = ?
+            ''', (sent, announcement_id))
+            return
+        
+        # Guarded on the fired time, so a concurrent dispatcher can't advance it twice
+        next_fire = Recurrence(recurrence).next_after(parse_time(fired), now)
+        cursor.execute('''
+            UPDATE scheduled_announcements SET next_fire = ? WHERE id = ? AND next_fire = ?
+        ''', (next_fire, announcement_id, fired))
+    
     # Member activity methods
     def log_member_activity(self, guild_id, user_id, activity_type):
         """Log member activity"""
         with self.lock:
-            conn = sqlite3.connect(self.db_path)
+            conn = self._connect()
             cursor = conn.cursor()
             
             cursor.execute('''
@@ -458,3 +1398,129 @@ class Database:
             
             conn.commit()
             conn.close()
+    
+    # Activity sketch methods
+    def merge_activity_sketches(self, rows):
+        """Merge (guild_id, day, registers) sketches into the stored ones in one transaction"""
+        with self.lock:
+            conn = self._connect()
+            cursor = conn.cursor()
+            
+            for guild_id, day, registers in rows:
+                cursor.execute('''
+                    SELECT registers FROM activity_sketches
+                    WHERE guild_id = ? AND day = ?
+                ''', (guild_id, day))
+                stored = cursor.fetchone()
+                
+                # Register-wise max makes the merge idempotent across flushes and restarts
+                if stored and len(stored[0]) == len(registers):
+                    registers = bytes(map(max, stored[0], registers))
+                
+                cursor.execute('''
+                    INSERT OR REPLACE INTO activity_sketches (guild_id, day, registers)
+                    VALUES (?, ?, ?)
+                ''', (guild_id, day, registers))
+            
+            conn.commit()
+            conn.close()
+    
+    def get_activity_sketches(self, guild_id, first_day, last_day):
+        """Get the stored sketch registers of a guild between two days (inclusive)"""
+        with self.lock:
+            conn = self._connect()
+            cursor = conn.cursor()
+            
+            cursor.execute('''
+                SELECT registers FROM activity_sketches
+                WHERE guild_id = ? AND day BETWEEN ? AND ?
+            ''', (guild_id, first_day, last_day))
+            
+            results = [row[0] for row in cursor.fetchall()]
+            conn.close()
+            return results
+    
+    def replace_activity_leaders(self, rows_by_guild):
+        """Replace the checkpointed leader counters of each guild with {guild_id: [(user_id, count, error)]}"""
+        with self.lock:
+            conn = self._connect()
+            cursor = conn.cursor()
+            
+            for guild_id, rows in rows_by_guild.items():
+                cursor.execute('DELETE FROM activity_leaders WHERE guild_id = ?', (guild_id,))
+                cursor.executemany('''
+                    INSERT INTO activity_leaders (guild_id, user_id, count, error)
+                    VALUES (?, ?, ?, ?)
+                ''', [(guild_id, user_id, count, error) for user_id, count, error in rows])
+            
+            conn.commit()
+            conn.close()
+    
+    def get_activity_leaders(self):
+        """Get every checkpointed leader counter as (guild_id, user_id, count, error)"""
+        with self.lock:
+            conn = self._connect()
+            cursor = conn.cursor()
+            
+            cursor.execute('SELECT guild_id, user_id, count, error FROM activity_leaders')
+            
+            results = cursor.fetchall()
+            conn.close()
+            return results
+    
+    # Search methods
+    def search_events(self, query, guild_id=None, limit=10):
+        """Full-text search event logs, best of the recent matches first, as (event_type, snippet, timestamp)"""
+        match = fts_query(query)
+        if not match:
+            return []
+        
+        with self.lock:
+            conn = self._connect()
+            cursor = conn.cursor()
+            
+            cursor.execute('''
+                SELECT event_type, snippet, timestamp FROM (
+                    SELECT e.event_type, snippet(event_logs_fts, 1, '**', '**', '…', 16) AS snippet,
+                           e.timestamp, rank
+                    FROM event_logs_fts
+                    JOIN event_logs e ON e.id = event_logs_fts.rowid
+                    WHERE event_logs_fts MATCH ? AND (? IS NULL OR e.guild_id = ?)
+                    ORDER BY event_logs_fts.rowid DESC
+                    LIMIT ?
+                )
+                ORDER BY rank
+                LIMIT ?
+            ''', (match, guild_id, guild_id, self.SEARCH_WINDOW, limit))
+            
+            results = cursor.fetchall()
+            conn.close()
+            return results
+    
+    def search_announcements(self, query, guild_id=None, limit=10):
+        """Full-text search announcements, best of the recent matches first, as (channel_id, snippet, schedule_time, is_sent)"""
+        match = fts_query(query)
+        if not match:
+            return []
+        
+        with self.lock:
+            conn = self._connect()
+            cursor = conn.cursor()
+            
+            cursor.execute('''
+                SELECT channel_id, snippet, schedule_time, is_sent FROM (
+                    SELECT a.channel_id, snippet(announcements_fts, 0, '**', '**', '…', 16) AS snippet,
+                           a.schedule_time, a.is_sent, rank
+                    FROM announcements_fts
+                    JOIN scheduled_announcements a ON a.id = announcements_fts.rowid
+                    WHERE announcements_fts MATCH ? AND (? IS NULL OR a.guild_id = ?)
+                    ORDER BY announcements_fts.rowid DESC
+                    LIMIT ?
+                )
+                ORDER BY rank
+                LIMIT ?
+            ''', (match, guild_id, guild_id, self.SEARCH_WINDOW, limit))
+            
+            results = cursor.fetchall()
+            conn.close()
+            return results
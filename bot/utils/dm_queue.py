@@ -0,0 +1,45 @@
+import asyncio
+import itertools
+
+# Delivery order: reminders are time-critical, bulk notifications can wait
+PRIORITY_REMINDER = 0
+PRIORITY_NOTIFICATION = 1
+
+
+class DMQueue:
+    """Shared direct-message fan-out: one paced sender instead of a sleep loop per command"""
+
+    # Seconds between two DMs, shared by every producer
+    INTERVAL = 0.5
+
+    def __init__(self, bot):
+        self.bot = bot
+        self.queue = asyncio.PriorityQueue()
+        self.counter = itertools.count()  # keeps FIFO order within a priority
+        self.sent = 0
+        self.failed = 0
+
+    def enqueue(self, members, priority=PRIORITY_NOTIFICATION, **message):
+        """Queue the same message (content= and/or embed=) for several members"""
+        for member in members:
+            self.queue.put_nowait((priority, next(self.counter), member, message))
+
+    def pending(self):
+        return self.queue.qsize()
+
+    async def run(self):
+        """Deliver queued DMs until the bot closes"""
+        await self.bot.wait_until_ready()
+        while not self.bot.is_closed():
+            _, _, member, message = await self.queue.get()
+            try:
+                await member.send(**message)
+                self.sent += 1
+            except Exception:
+                # Closed DMs and deleted users are expected; don't stall the queue
+                self.failed += 1
+            await asyncio.sleep(self.INTERVAL)
+
+    def stats(self):
+        """Counters for the stats snapshot"""
+        return {'pending': self.pending(), 'sent': self.sent, 'failed': self.failed}
@@ -0,0 +1,187 @@
+FORMATS = ('round_robin', 'single_elimination', 'double_elimination')
+
+
+def round_robin(teams, double=False):
+    """Circle-method schedule: a list of rounds, each a list of (team1, team2)
+
+    One team stays fixed while the others rotate around it, so every pair meets once
+    (twice with `double`, home and away swapped) and nobody plays twice in a round.
+    An odd field gets a bye slot that is simply dropped from the round.
+    """
+    slots = list(teams)
+    if len(slots) % 2:
+        slots.append(None)
+    count = len(slots)
+
+    rounds = []
+    for round_index in range(count - 1):
+        pairs = []
+        for i in range(count // 2):
+            home, away = slots[i], slots[count - 1 - i]
+            # Alternate the fixed team's side so it isn't always at home
+            if i == 0 and round_index % 2:
+                home, away = away, home
+            if home is not None and away is not None:
+                pairs.append((home, away))
+        rounds.append(pairs)
+        slots = [slots[0], slots[-1]] + slots[1:-1]
+
+    if double:
+        rounds += [[(away, home) for home, away in pairs] for pairs in rounds]
+    return rounds
+
+
+def bracket_order(size):
+    """Seed positions for a bracket of `size` slots so top seeds meet as late as possible"""
+    order = [1]
+    while len(order) < size:
+        total = len(order) * 2 + 1
+        order = [seed for top in order for seed in (top, total - top)]
+    return order
+
+
+class _Node:
+    """A bracket match whose sides are ('team', name), ('bye',), or ('winner' | 'loser', node)"""
+
+    def __init__(self, bracket, round_number, side1, side2):
+        self.bracket = bracket
+        self.round = round_number
+        self.sides = [side1, side2]
+
+
+BYE = ('bye',)
+
+
+def _single_bracket(teams):
+    """Winners-bracket rounds of nodes for seeded teams (seed order = list order)"""
+    size = 1
+    while size < len(teams):
+        size *= 2
+
+    order = bracket_order(size)
+    entrants = [('team', teams[seed - 1]) if seed <= len(teams) else BYE for seed in order]
+    rounds = [[_Node('W', 1, entrants[i], entrants[i + 1]) for i in range(0, size, 2)]]
+    while len(rounds[-1]) > 1:
+        previous = rounds[-1]
+        rounds.append([
+            _Node('W', len(rounds) + 1, ('winner', previous[i]), ('winner', previous[i + 1]))
+            for i in range(0, len(previous), 2)
+        ])
+    return rounds
+
+
+def _losers_bracket(winners_rounds):
+    """Losers-bracket rounds fed by the winners bracket, ending in the losers' final"""
+    first = winners_rounds[0]
+    rounds = [[
+        _Node('L', 1, ('loser', first[i]), ('loser', first[i + 1]))
+        for i in range(0, len(first), 2)
+    ]]
+
+    for index, winners_round in enumerate(winners_rounds[1:], 1):
+        # Drop-down round: survivors meet this round's winners-bracket losers,
+        # in reverse order every other round to postpone rematches
+        dropped = [('loser', node) for node in winners_round]
+        if index % 2:
+            dropped.reverse()
+        rounds.append([
+            _Node('L', len(rounds) + 1, ('winner', survivor), drop)
+            for survivor, drop in zip(rounds[-1], dropped)
+        ])
+
+        if index < len(winners_rounds) - 1:
+            previous = rounds[-1]
+            rounds.append([
+                _Node('L', len(rounds) + 1, ('winner', previous[i]), ('winner', previous[i + 1]))
+                for i in range(0, len(previous), 2)
+            ])
+    return rounds
+
+
+def _flatten(nodes):
+    """Collapse byes and turn real nodes into fixture dicts with advancement links
+
+    A node with a bye on one side is not played: its winner is the other side and
+    its loser is a bye. Remaining nodes become fixtures; a side fed by another
+    fixture is left empty (None) and that fixture gets a winner_to/loser_to link.
+    """
+    outcomes = {}
+
+    def resolve(side):
+        if side[0] in ('team', 'bye'):
+            return side
+        return outcome(side[1], side[0])
+
+    def outcome(node, which):
+        key = (id(node), which)
+        if key not in outcomes:
+            first, second = resolve(node.sides[0]), resolve(node.sides[1])
+            if first == BYE or second == BYE:
+                result = (second if first == BYE else first) if which == 'winner' else BYE
+            else:
+                result = (which, node)
+            outcomes[key] = result
+        return outcomes[key]
+
+    real = [node for node in nodes if outcome(node, 'winner') == ('winner', node)]
+    keys = {id(node): key for key, node in enumerate(real)}
+    fixtures = []
+    for key, node in enumerate(real):
+        fixture = {
+            'key': key, 'bracket': node.bracket, 'round': node.round,
+            'team1': None, 'team2': None, 'winner_to': None, 'loser_to': None, 'stage': 0
+        }
+        fixtures.append(fixture)
+
+    for key, node in enumerate(real):
+        for side_index, side in enumerate(node.sides):
+            resolved = resolve(side)
+            if resolved[0] == 'team':
+                fixtures[key][f'team{side_index + 1}'] = resolved[1]
+            else:
+                source = fixtures[keys[id(resolved[1])]]
+                source[f'{resolved[0]}_to'] = (key, side_index + 1)
+                fixtures[key]['stage'] = max(fixtures[key]['stage'], source['stage'] + 1)
+    return fixtures
+
+
+def single_elimination(teams):
+    """Knockout fixtures for seeded teams; byes go to the top seeds"""
+    rounds = _single_bracket(list(teams))
+    return _flatten([node for nodes in rounds for node in nodes])
+
+
+def double_elimination(teams):
+    """Winners bracket, losers bracket and a grand final (no bracket reset)"""
+    winners_rounds = _single_bracket(list(teams))
+    losers_rounds = _losers_bracket(winners_rounds)
+    final = _Node('GF', 1, ('winner', winners_rounds[-1][0]), ('winner', losers_rounds[-1][0]))
+
+    # Nodes must be listed sources-first so stages can be derived in one pass
+    ordered = []
+    for index in range(max(len(winners_rounds), len(losers_rounds))):
+        if index < len(winners_rounds):
+            ordered += winners_rounds[index]
+        # Losers round 2i-1 and 2i both depend on at most winners round i
+        for losers_index in (2 * index - 1, 2 * index):
+            if 0 <= losers_index < len(losers_rounds):
+                ordered += losers_rounds[losers_index]
+    return _flatten(ordered + [final])
+
+
+def generate_fixtures(format_name, teams, double=False):
+    """Fixture dicts (key, bracket, round, stage, team1, team2, winner_to, loser_to) for a format"""
+    if format_name == 'round_robin':
+        return [
+            {
+                'key': None, 'bracket': 'RR', 'round': round_index + 1, 'stage': round_index,
+                'team1': home, 'team2': away, 'winner_to': None, 'loser_to': None
+            }
+            for round_index, pairs in enumerate(round_robin(teams, double))
+            for home, away in pairs
+        ]
+    if format_name == 'single_elimination':
+        return single_elimination(teams)
+    if format_name == 'double_elimination':
+        return double_elimination(teams)
+    raise ValueError(f"Unknown tournament format: {format_name}")
@@ -0,0 +1,91 @@
+from collections import deque
+
+# Results kept per team for the form guide and per pair for recent meetings
+FORM_LENGTH = 5
+FORM_SYMBOLS = {'W': '🟢', 'D': '🟡', 'L': '🔴'}
+
+
+class PairRecord:
+    """Head-to-head counters of two teams, stored from the alphabetically first team's side"""
+
+    __slots__ = ('wins', 'losses', 'draws', 'goals_for', 'goals_against', 'recent')
+
+    def __init__(self):
+        self.wins = 0
+        self.losses = 0
+        self.draws = 0
+        self.goals_for = 0
+        self.goals_against = 0
+        self.recent = deque(maxlen=FORM_LENGTH)  # (match_date, team1, team1_score, team2_score, team2)
+
+    @property
+    def played(self):
+        return self.wins + self.losses + self.draws
+
+
+class HeadToHead:
+    """Per-guild pair index and team form ring buffers over match_results
+
+    Both are rebuilt from the results table in one pass at startup and then kept
+    current by record(), so lookups never scan the history.
+    """
+
+    def __init__(self, db):
+        self.db = db
+        self.pairs = {}  # (guild_id, first_team, second_team) -> PairRecord, names sorted
+        self.forms = {}  # (guild_id, team) -> deque of 'W' | 'D' | 'L', oldest first
+
+    def load(self):
+        """Rebuild every index from stored results, oldest first"""
+        self.pairs.clear()
+        self.forms.clear()
+        for row in self.db.get_all_match_results():
+            self.record(*row)
+
+    def record(self, guild_id, team1, team2, team1_score, team2_score, match_date=None):
+        """Fold one result into the pair record and both teams' form"""
+        if team1_score > team2_score:
+            outcome1, outcome2 = 'W', 'L'
+        elif team1_score < team2_score:
+            outcome1, outcome2 = 'L', 'W'
+        else:
+            outcome1 = outcome2 = 'D'
+
+        for team, outcome in ((team1, outcome1), (team2, outcome2)):
+            form = self.forms.get((guild_id, team))
+            if form is None:
+                form = self.forms[(guild_id, team)] = deque(maxlen=FORM_LENGTH)
+            form.append(outcome)
+
+        if team1 <= team2:
+            first_outcome, goals_for, goals_against = outcome1, team1_score, team2_score
+        else:
+            first_outcome, goals_for, goals_against = outcome2, team2_score, team1_score
+        key = (guild_id, *sorted((team1, team2)))
+        record = self.pairs.get(key)
+        if record is None:
+            record = self.pairs[key] = PairRecord()
+        if first_outcome == 'W':
+            record.wins += 1
+        elif first_outcome == 'L':
+            record.losses += 1
+        else:
+            record.draws += 1
+        record.goals_for += goals_for
+        record.goals_against += goals_against
+        record.recent.append((match_date, team1, team1_score, team2_score, team2))
+
+    def pair(self, guild_id, team1, team2):
+        """(team1 wins, team2 wins, draws, team1 goals, team2 goals, recent meetings newest first), or None"""
+        record = self.pairs.get((guild_id, *sorted((team1, team2))))
+        if record is None:
+            return None
+        if team1 <= team2:
+            wins, losses, goals_for, goals_against = record.wins, record.losses, record.goals_for, record.goals_against
+        else:
+            wins, losses, goals_for, goals_against = record.losses, record.wins, record.goals_against, record.goals_for
+        return wins, losses, record.draws, goals_for, goals_against, list(reversed(record.recent))
+
+    def form(self, guild_id, team):
+        """A team's last results as emoji, oldest first ('' when it hasn't played)"""
+        return "".join(FORM_SYMBOLS[outcome] for outcome in self.forms.get((guild_id, team), ()))
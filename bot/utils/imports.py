@@ -0,0 +1,81 @@
+import csv
+import io
+import json
+from datetime import datetime
+
+# Upper bounds for one /importmatches attachment
+MAX_IMPORT_BYTES = 1024 * 1024
+MAX_IMPORT_ROWS = 1000
+
+DATE_FORMATS = ('%Y-%m-%d %H:%M', '%Y-%m-%dT%H:%M', '%d/%m/%Y %H:%M')
+
+
+def parse_match_date(date_text, time_text=None):
+    """Parse 'YYYY-MM-DD HH:MM' (or separate date and time) into a datetime, or None"""
+    text = f"{date_text} {time_text}" if time_text else date_text
+    for date_format in DATE_FORMATS:
+        try:
+            return datetime.strptime(text.strip(), date_format)
+        except ValueError:
+            continue
+    return None
+
+
+def _iter_rows(data, filename):
+    """Yield (row_number, dict) from a CSV, JSON array or JSON Lines payload
+
+    CSV and JSON Lines are decoded and read one line at a time.
+    """
+    name = filename.lower()
+    if name.endswith('.json'):
+        rows = json.loads(data.decode('utf-8-sig'))
+        if not isinstance(rows, list):
+            raise ValueError("JSON must be a list of matches")
+        yield from enumerate(rows, 1)
+        return
+
+    text = io.TextIOWrapper(io.BytesIO(data), encoding='utf-8-sig', newline='')
+    if name.endswith('.jsonl'):
+        for number, line in enumerate(text, 1):
+            if line.strip():
+                yield number, json.loads(line)
+        return
+
+    # Header is line 1, so data rows start at 2 like in a spreadsheet
+    for number, row in enumerate(csv.DictReader(text), 2):
+        yield number, row
+
+
+def parse_matches(data, filename, now=None):
+    """Validate every row of an import; returns (matches, errors)
+
+    Each match is {'team1', 'team2', 'match_date'}; errors are (row_number, message_key)
+    pairs. Callers should import nothing when any error is returned.
+    """
+    now = now or datetime.now()
+    matches, errors = [], []
+    try:
+        for number, row in _iter_rows(data, filename):
+            if len(matches) + len(errors) >= MAX_IMPORT_ROWS:
+                errors.append((number, 'import_too_many_rows'))
+                break
+            if not isinstance(row, dict):
+                errors.append((number, 'import_invalid_row'))
+                continue
+
+            team1 = str(row.get('team1') or '').strip()
+            team2 = str(row.get('team2') or '').strip()
+            match_date = parse_match_date(str(row.get('date') or ''), row.get('time'))
+
+            if not team1 or not team2 or team1 == team2:
+                errors.append((number, 'import_invalid_teams'))
+            elif match_date is None:
+                errors.append((number, 'import_invalid_date'))
+            elif match_date <= now:
+                errors.append((number, 'import_past_date'))
+            else:
+                matches.append({'team1': team1, 'team2': team2, 'match_date': match_date})
+    except (ValueError, csv.Error, UnicodeDecodeError):
+        errors.append((0, 'import_unreadable'))
+
+    return matches, errors
@@ -0,0 +1,122 @@
+import asyncio
+import os
+import time
+import discord
+
+# Member cache modes:
+#   full - chunk every guild at startup and keep all members cached (discord.py default)
+#   lazy - chunk a guild only when a role fan-out needs its members, evict idle guilds
+MEMBER_CACHE_MODES = ('full', 'lazy')
+
+
+def get_member_cache_mode():
+    """Read the configured member cache mode from MEMBER_CACHE_MODE"""
+    mode = os.getenv("MEMBER_CACHE_MODE", "full").lower()
+    return mode if mode in MEMBER_CACHE_MODES else 'full'
+
+
+def member_cache_options(mode):
+    """Client options for a member cache mode"""
+    if mode == 'lazy':
+        return {'chunk_guilds_at_startup': False}
+    return {}
+
+
+class MemberCacheManager:
+    """Chunks guilds on demand and evicts member caches of idle guilds"""
+
+    def __init__(self, bot, mode='full', idle_seconds=1800):
+        self.bot = bot
+        self.mode = mode
+        self.idle_seconds = idle_seconds
+        self.last_used = {}
+        self.locks = {}
+        self.chunk_count = 0
+        self.evict_count = 0
+
+    @property
+    def lazy(self):
+        return self.mode == 'lazy'
+
+    def touch(self, guild_id):
+        """Mark a guild's member cache as recently used"""
+        self.last_used[guild_id] = time.monotonic()
+
+    async def ensure_chunked(self, guild):
+        """Make sure a guild's members are cached before iterating role.members"""
+        if not self.lazy:
+            return
+
+        self.touch(guild.id)
+        if guild.chunked:
+            return
+
+        lock = self.locks.setdefault(guild.id, asyncio.Lock())
+        async with lock:
+            # Another fan-out may have chunked the guild while we waited
+            if guild.chunked:
+                return
+            try:
+                await guild.chunk(cache=True)
+                self.chunk_count += 1
+            except Exception as e:
+                print(f"Error chunking guild {guild.id}: {e}")
+
+    async def get_member(self, guild, user_id):
+        """Get a member from cache, fetching just that member when it isn't cached"""
+        member = guild.get_member(user_id)
+        if member is not None or not self.lazy:
+            return member
+
+        try:
+            return await guild.fetch_member(user_id)
+        except discord.HTTPException:
+            return None
+
+    def evict_idle(self):
+        """Drop cached members of guilds that haven't needed them recently"""
+        if not self.lazy:
+            return 0
+
+        now = time.monotonic()
+        evicted = 0
+        for guild_id, last_used in list(self.last_used.items()):
+            if now - last_used < self.idle_seconds:
+                continue
+
+            del self.last_used[guild_id]
+            self.locks.pop(guild_id, None)
+            guild = self.bot.get_guild(guild_id)
+            if guild is None:
+                continue
+
+            # discord.py has no public API to clear a guild's member cache
+            me = guild.me
+            for member in list(guild.members):
+                if member != me:
+                    guild._remove_member(member)
+            evicted += 1
+
+        self.evict_count += evicted
+        return evicted
+
+    async def run_evictions(self, interval=300):
+        """Periodically evict idle guilds' member caches"""
+        await self.bot.wait_until_ready()
+        while not self.bot.is_closed():
+            await asyncio.sleep(interval)
+            try:
+                evicted = self.evict_idle()
+                if evicted:
+                    print(f"Evicted member cache of {evicted} idle guilds")
+            except Exception as e:
+                print(f"Error evicting member caches: {e}")
+
+    def stats(self):
+        """Member cache counters for the stats snapshot"""
+        return {
+            'mode': self.mode,
+            'cached_guilds': len(self.last_used),
+            'chunks': self.chunk_count,
+            'evictions': self.evict_count
+        }
@@ -0,0 +1,125 @@
+import re
+import time
+from collections import OrderedDict
+
+# <@&role_id>, <@user_id> and the legacy nickname form <@!user_id>
+MENTION_PATTERN = re.compile(r'<@(&|!)?(\d+)>')
+
+
+def parse_mention(text):
+    """Parse a role/user mention into ('role' | 'user', id), or None for plain text"""
+    match = MENTION_PATTERN.fullmatch(text.strip())
+    if not match:
+        return None
+    return ('role' if match.group(1) == '&' else 'user', int(match.group(2)))
+
+
+class MentionResolver:
+    """Resolves team mentions to names and recipients, caching names with LRU eviction
+
+    Names of cached members and roles stay valid until an update event drops them.
+    Members fetched from the API (lazy member mode) get no update events, so their
+    names expire after fetched_ttl seconds instead.
+    """
+
+    def __init__(self, bot, maxsize=10000, fetched_ttl=300):
+        self.bot = bot
+        self.maxsize = maxsize
+        self.fetched_ttl = fetched_ttl
+        self.names = OrderedDict()  # (guild_id, kind, id) -> (name, expires or None)
+        self.hits = 0
+        self.misses = 0
+
+    async def resolve_name(self, guild, text):
+        """Get the role name or member display name for a mention, or None"""
+        parsed = parse_mention(text)
+        if parsed is None:
+            return None
+
+        key = (guild.id, *parsed)
+        entry = self.names.get(key)
+        if entry is not None and (entry[1] is None or entry[1] > time.monotonic()):
+            self.names.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+        self.misses += 1
+        kind, target_id = parsed
+        expires = None
+        if kind == 'role':
+            role = guild.get_role(target_id)
+            name = role.name if role else None
+        else:
+            if guild.get_member(target_id) is None:
+                expires = time.monotonic() + self.fetched_ttl
+            member = await self.bot.member_cache.get_member(guild, target_id)
+            name = member.display_name if member else None
+
+        if name is not None:
+            self.names[key] = (name, expires)
+            self.names.move_to_end(key)
+            if len(self.names) > self.maxsize:
+                self.names.popitem(last=False)
+        else:
+            self.names.pop(key, None)
+        return name
+
+    async def display_text(self, guild, text):
+        """Convert a mention to readable '@name' text, leaving plain text untouched"""
+        name = await self.resolve_name(guild, text)
+        return f"@{name}" if name is not None else text
+
+    async def team_name(self, guild, text):
+        """Convert a mention to a bare team name, leaving plain text untouched"""
+        name = await self.resolve_name(guild, text)
+        return name if name is not None else text
+
+    async def recipients(self, guild, *mentions):
+        """Resolve team mentions to the set of members to DM, without duplicates"""
+        members = {}
+        for text in mentions:
+            parsed = parse_mention(text)
+            if parsed is None:
+                continue
+
+            kind, target_id = parsed
+            if kind == 'role':
+                role = guild.get_role(target_id)
+                if role is None:
+                    continue
+                await self.bot.member_cache.ensure_chunked(guild)
+                for member in role.members:
+                    members[member.id] = member
+            else:
+                member = await self.bot.member_cache.get_member(guild, target_id)
+                if member is not None:
+                    members[member.id] = member
+
+        return list(members.values())
+
+    def invalidate_role(self, guild_id, role_id):
+        """Forget a role's cached name"""
+        self.names.pop((guild_id, 'role', role_id), None)
+
+    def invalidate_member(self, guild_id, user_id):
+        """Forget a member's cached display name in one guild"""
+        self.names.pop((guild_id, 'user', user_id), None)
+
+    def invalidate_user(self, user_id):
+        """Forget a user's cached display name in every guild"""
+        for key in [key for key in self.names if key[1] == 'user' and key[2] == user_id]:
+            del self.names[key]
+
+    def invalidate_guild(self, guild_id):
+        """Forget every cached name of a guild"""
+        for key in [key for key in self.names if key[0] == guild_id]:
+            del self.names[key]
+
+    def stats(self):
+        """Cache counters for the stats snapshot"""
+        return {
+            'guilds': len({key[0] for key in self.names}),
+            'entries': len(self.names),
+            'hits': self.hits,
+            'misses': self.misses
+        }
@@ -0,0 +1,83 @@
+import discord
+
+
+class EmbedPages(discord.ui.View):
+    """Previous/next buttons over a list of prebuilt embeds, usable by the invoking user only"""
+
+    def __init__(self, pages, author_id, timeout=180):
+        super().__init__(timeout=timeout)
+        self.pages = pages
+        self.author_id = author_id
+        self.index = 0
+        self._update_buttons()
+
+    def _update_buttons(self):
+        self.previous_page.disabled = self.index == 0
+        self.next_page.disabled = self.index >= len(self.pages) - 1
+
+    def current(self):
+        return self.pages[self.index]
+
+    async def interaction_check(self, interaction):
+        return interaction.user.id == self.author_id
+
+    async def _show(self, interaction, index):
+        self.index = index
+        self._update_buttons()
+        await interaction.response.edit_message(embed=self.current(), view=self)
+
+    @discord.ui.button(emoji="◀️", style=discord.ButtonStyle.secondary)
+    async def previous_page(self, interaction, button):
+        await self._show(interaction, self.index - 1)
+
+    @discord.ui.button(emoji="▶️", style=discord.ButtonStyle.secondary)
+    async def next_page(self, interaction, button):
+        await self._show(interaction, self.index + 1)
+
+
+class KeysetPages(EmbedPages):
+    """EmbedPages whose pages are fetched and rendered on first view, then kept for the view's life
+
+    fetch(after, limit) returns rows following the keyset cursor `after` (None for the
+    first page), key(row) gives the cursor of a row and render(rows, page_number)
+    builds the embed. Each new page costs one query for per_page + 1 rows.
+    """
+
+    def __init__(self, fetch, key, render, author_id, per_page=10, timeout=180):
+        self.fetch = fetch
+        self.key = key
+        self.render = render
+        self.per_page = per_page
+        self.cursors = [None]  # cursor before each page that can still be loaded
+        self.complete = False
+        super().__init__([], author_id, timeout)
+        self._load_next()
+        self._update_buttons()
+
+    def _load_next(self):
+        rows = self.fetch(self.cursors[len(self.pages)], self.per_page + 1)
+        if len(rows) > self.per_page:
+            rows = rows[:self.per_page]
+            self.cursors.append(self.key(rows[-1]))
+        else:
+            self.complete = True
+        if rows:
+            self.pages.append(self.render(rows, len(self.pages) + 1))
+
+    def _update_buttons(self):
+        self.previous_page.disabled = self.index == 0
+        self.next_page.disabled = self.complete and self.index >= len(self.pages) - 1
+
+    async def _show(self, interaction, index):
+        if index == len(self.pages):
+            self._load_next()
+            if index == len(self.pages):
+                # The rows ran out since the cursor was taken; stay on the last page
+                index -= 1
+        await super()._show(interaction, index)
+
+
+def paginate_lines(lines, per_page, build_page):
+    """Split lines into pages; build_page(text, page_number, page_count) returns each embed"""
+    chunks = [lines[i:i + per_page] for i in range(0, len(lines), per_page)] or [[]]
+    return [build_page("\n".join(chunk), number, len(chunks)) for number, chunk in enumerate(chunks, 1)]
@@ -0,0 +1,175 @@
+import asyncio
+from datetime import datetime
+
+import discord
+
+from bot.utils.translations import get_translation
+
+CHOICES = ('team1', 'draw', 'team2')
+CHOICE_EMOJI = {'team1': '🔴', 'draw': '🤝', 'team2': '🔵'}
+
+
+class PredictionVotes:
+    """Match winner predictions: counted in memory, persisted in batches, tallies re-rendered on a debounce
+
+    A click only touches dictionaries; the database sees one batched upsert per
+    flush interval and a match message is edited at most once per RENDER_DELAY.
+    """
+
+    # Seconds between the first unrendered vote and the tally edit
+    RENDER_DELAY = 5
+
+    def __init__(self, bot):
+        self.bot = bot
+        self.votes = {}  # match_id -> {user_id: choice}
+        self.counts = {}  # match_id -> {choice: count}
+        self.pending = {}  # (match_id, user_id) -> (guild_id, choice), not yet persisted
+        self.messages = {}  # match_id -> latest message showing the tally
+        self.renders = {}  # match_id -> scheduled render task
+
+    def load(self):
+        """Restore votes of matches that haven't been played yet"""
+        for match_id, user_id, choice in self.bot.db.get_open_predictions():
+            self._count(match_id, user_id, choice)
+
+    def _count(self, match_id, user_id, choice):
+        """Apply a vote to the counters; returns False when it repeats the user's current vote"""
+        ballots = self.votes.setdefault(match_id, {})
+        previous = ballots.get(user_id)
+        if previous == choice:
+            return False
+        counts = self.counts.setdefault(match_id, dict.fromkeys(CHOICES, 0))
+        if previous is not None:
+            counts[previous] -= 1
+        counts[choice] += 1
+        ballots[user_id] = choice
+        return True
+
+    def record(self, guild_id, match_id, user_id, choice):
+        """Count a vote (one per user and match, changeable); returns whether anything changed"""
+        if not self._count(match_id, user_id, choice):
+            return False
+        self.pending[(match_id, user_id)] = (guild_id, choice)
+        return True
+
+    def tally(self, match_id):
+        """{choice: count} for a match"""
+        return self.counts.get(match_id) or dict.fromkeys(CHOICES, 0)
+
+    def tally_text(self, match_id, draws=True):
+        """One line per choice with its share of the votes"""
+        counts = self.tally(match_id)
+        total = sum(counts.values())
+        lines = []
+        for choice in CHOICES:
+            if choice == 'draw' and not draws and not counts[choice]:
+                continue
+            share = counts[choice] * 100 / total if total else 0
+            lines.append(f"{CHOICE_EMOJI[choice]} {share:.0f}% ({counts[choice]:,})")
+        return "\n".join(lines)
+
+    def apply_tally(self, embed, match_id, language, draws=True):
+        """Add or replace the predictions field of a match embed"""
+        name = get_translation('predictions_field', language)
+        value = self.tally_text(match_id, draws)
+        for index, field in enumerate(embed.fields):
+            if field.name == name:
+                embed.set_field_at(index, name=name, value=value, inline=False)
+                return embed
+        return embed.add_field(name=name, value=value, inline=False)
+
+    def schedule_render(self, match_id, message, language, draws=True):
+        """Edit the match message with the current tally once the debounce delay has passed"""
+        self.messages[match_id] = message
+        if match_id not in self.renders:
+            self.renders[match_id] = asyncio.create_task(self._render(match_id, language, draws))
+
+    async def _render(self, match_id, language, draws):
+        await asyncio.sleep(self.RENDER_DELAY)
+        self.renders.pop(match_id, None)
+        message = self.messages.pop(match_id, None)
+        if message is None or not message.embeds:
+            return
+        try:
+            embed = self.apply_tally(message.embeds[0], match_id, language, draws)
+            await message.edit(embed=embed)
+        except discord.HTTPException as e:
+            print(f"Error updating prediction tally for match {match_id}: {e}")
+
+    async def handle(self, interaction, match_id, choice):
+        """Button callback: validate, count and acknowledge a vote"""
+        lang = self.bot.get_user_language(interaction)
+        match_commands_cog = self.bot.get_cog('MatchCommands')
+        match_info = match_commands_cog.get_guild_match(interaction.guild_id, match_id) if match_commands_cog else None
+        draws = match_info is not None and match_info.get('bracket') in (None, 'RR')
+
+        if match_info is None or match_info['datetime'] <= datetime.now() or (choice == 'draw' and not draws):
+            await interaction.response.send_message(get_translation('predictions_closed', lang), ephemeral=True)
+            return
+
+        self.record(interaction.guild_id, match_id, interaction.user.id, choice)
+        label = get_translation('draw', lang) if choice == 'draw' else await self.bot.mentions.display_text(
+            interaction.guild, match_info[choice]
+        )
+        await interaction.response.send_message(
+            get_translation('prediction_saved', lang).format(choice=f"{CHOICE_EMOJI[choice]} {label}"),
+            ephemeral=True
+        )
+        if interaction.message is not None:
+            self.schedule_render(match_id, interaction.message, match_info['lang'], draws)
+
+    def flush(self):
+        """Persist votes cast since the last flush in one batch"""
+        if not self.pending:
+            return
+        rows = [(match_id, user_id, guild_id, choice) for (match_id, user_id), (guild_id, choice) in self.pending.items()]
+        self.pending = {}
+        self.bot.db.save_predictions(rows)
+
+    def settle(self, guild_id, outcomes):
+        """Score predictions of played matches, given [(match_id, 'team1' | 'draw' | 'team2')]"""
+        self.flush()
+        self.bot.db.settle_predictions(guild_id, outcomes)
+        for match_id, _ in outcomes:
+            self.votes.pop(match_id, None)
+            self.counts.pop(match_id, None)
+
+    async def run_flusher(self, interval=10):
+        """Periodically persist pending votes while the bot runs"""
+        await self.bot.wait_until_ready()
+        while not self.bot.is_closed():
+            await asyncio.sleep(interval)
+            try:
+                self.flush()
+            except Exception as e:
+                print(f"Error flushing prediction votes: {e}")
+
+
+class PredictionButton(discord.ui.DynamicItem[discord.ui.Button], template=r'predict:(?P<match_id>[0-9]+):(?P<choice>team1|draw|team2)'):
+    """A vote button whose custom ID carries the match, so it keeps working after restarts"""
+
+    def __init__(self, match_id, choice, label=None):
+        super().__init__(discord.ui.Button(
+            label=label[:80] if label else None,
+            emoji=CHOICE_EMOJI[choice],
+            style=discord.ButtonStyle.secondary,
+            custom_id=f'predict:{match_id}:{choice}'
+        ))
+        self.match_id = match_id
+        self.choice = choice
+
+    @classmethod
+    async def from_custom_id(cls, interaction, item, match):
+        return cls(int(match['match_id']), match['choice'])
+
+    async def callback(self, interaction):
+        await interaction.client.predictions.handle(interaction, self.match_id, self.choice)
+
+
+def prediction_view(match_id, labels, draws=True):
+    """A persistent view with one button per choice; labels maps choice -> button text"""
+    view = discord.ui.View(timeout=None)
+    for choice in CHOICES:
+        if choice != 'draw' or draws:
+            view.add_item(PredictionButton(match_id, choice, labels[choice]))
+    return view
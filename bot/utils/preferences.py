@@ -0,0 +1,66 @@
+from bot.utils.translations import resolve_language, DEFAULT_LANGUAGE
+
+
+class LanguagePreferences:
+    """In-memory cache of stored guild and user language overrides
+
+    In cluster mode every worker holds its own copy; on_change(scope, id, language)
+    is called after each stored change so the supervisor can relay it to the
+    other workers, which apply() it.
+    """
+
+    def __init__(self, db):
+        self.db = db
+        self.guilds = {}
+        self.users = {}
+        self.on_change = None
+
+    def load(self):
+        """Load every stored override from the database"""
+        guild_rows, user_rows = self.db.get_language_preferences()
+        self.guilds = {guild_id: language for guild_id, language in guild_rows}
+        self.users = {user_id: language for user_id, language in user_rows}
+
+    def set_guild_language(self, guild_id, language):
+        """Store a guild's language; None clears the override"""
+        self.db.set_guild_language(guild_id, language)
+        self._changed('guild', guild_id, language)
+
+    def set_user_language(self, user_id, language):
+        """Store a user's language; None clears the override"""
+        self.db.set_user_language(user_id, language)
+        self._changed('user', user_id, language)
+
+    def _changed(self, scope, target_id, language):
+        self.apply(scope, target_id, language)
+        if self.on_change is not None:
+            self.on_change(scope, target_id, language)
+
+    def apply(self, scope, target_id, language):
+        """Update the cache for an override stored elsewhere (another worker)"""
+        overrides = self.guilds if scope == 'guild' else self.users
+        if language:
+            overrides[target_id] = language
+        else:
+            overrides.pop(target_id, None)
+
+    def language_for(self, user_id=None, guild_id=None, locale=None, default=None):
+        """User override, then guild override, then the client locale, then default/Spanish"""
+        language = self.users.get(user_id)
+        if language:
+            return language
+
+        language = self.guilds.get(guild_id)
+        if language:
+            return language
+
+        if locale:
+            return resolve_language(locale)
+        return default or DEFAULT_LANGUAGE
+
+    def group_by_language(self, members, guild_id, default=None):
+        """Split recipients by the language their messages should be rendered in"""
+        groups = {}
+        for member in members:
+            groups.setdefault(self.language_for(member.id, guild_id, default=default), []).append(member)
+        return groups
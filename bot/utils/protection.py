@@ -0,0 +1,228 @@
+import asyncio
+import os
+import time
+from collections import OrderedDict
+from datetime import timedelta
+
+import discord
+
+from bot.utils.translations import get_translation
+
+RAID_ACTIONS = ('alert', 'kick')
+SPAM_ACTIONS = ('alert', 'delete', 'timeout')
+
+
+def parse_threshold(text, default):
+    """'count/seconds' (e.g. '15/30': 15 events within 30 s) -> (count, seconds)"""
+    try:
+        count, seconds = text.split('/')
+        return int(count), float(seconds)
+    except (AttributeError, ValueError):
+        count, seconds = default.split('/')
+        return int(count), float(seconds)
+
+
+class SlidingWindow:
+    """Event count over the last `window` seconds, kept in `slots` fixed buckets
+
+    Each slot remembers which time step it counts, so stale slots are reset on
+    reuse and skipped when summing; memory never depends on the event rate.
+    """
+
+    __slots__ = ('width', 'counts', 'steps')
+
+    def __init__(self, window, slots=10):
+        self.width = window / slots
+        self.counts = [0] * slots
+        self.steps = [0] * slots
+
+    def add(self, now):
+        """Count one event; returns the count over the window"""
+        step = int(now // self.width)
+        index = step % len(self.counts)
+        if self.steps[index] != step:
+            self.steps[index] = step
+            self.counts[index] = 0
+        self.counts[index] += 1
+        return self.count(now)
+
+    def count(self, now):
+        oldest = int(now // self.width) - len(self.counts) + 1
+        return sum(count for count, step in zip(self.counts, self.steps) if step >= oldest)
+
+
+class Protection:
+    """Join-flood and message-spam detection with configurable responses
+
+    A guild whose joins reach RAID_JOINS is in a raid, and a member whose messages
+    reach SPAM_MESSAGES is spamming. A burst lasts until its rate falls to half the
+    threshold. While it lasts, the per-join and per-message rows are skipped; the
+    database gets one event when it starts and one summary when it ends.
+    """
+
+    def __init__(self, bot, max_members=10000, sweep_interval=5):
+        self.bot = bot
+        self.raid_joins, self.raid_window = parse_threshold(os.getenv("RAID_JOINS"), '15/30')
+        self.spam_messages, self.spam_window = parse_threshold(os.getenv("SPAM_MESSAGES"), '8/10')
+        self.raid_action = os.getenv("RAID_ACTION", "alert")
+        self.spam_action = os.getenv("SPAM_ACTION", "alert")
+        if self.raid_action not in RAID_ACTIONS:
+            self.raid_action = 'alert'
+        if self.spam_action not in SPAM_ACTIONS:
+            self.spam_action = 'alert'
+        self.spam_timeout = timedelta(minutes=int(os.getenv("SPAM_TIMEOUT_MINUTES", "10")))
+        self.max_members = max_members
+        self.sweep_interval = sweep_interval
+
+        self.joins = {}  # guild_id -> SlidingWindow
+        self.messages = OrderedDict()  # (guild_id, user_id) -> SlidingWindow, least recently active first
+        self.raids = {}  # guild_id -> {'started', 'joins', 'leaves', 'actions'}
+        self.spammers = {}  # (guild_id, user_id) -> {'started', 'messages', 'actions'}
+        self.raid_count = 0
+        self.spam_count = 0
+        self.suppressed = 0
+        self.actions = 0
+        self.failed_actions = 0
+
+    async def member_joined(self, member):
+        """Count a join; returns True when it belongs to a raid (the caller skips its rows)"""
+        guild_id = member.guild.id
+        now = time.monotonic()
+        window = self.joins.get(guild_id)
+        if window is None:
+            window = self.joins[guild_id] = SlidingWindow(self.raid_window)
+        joins = window.add(now)
+
+        raid = self.raids.get(guild_id)
+        if raid is None:
+            if joins < self.raid_joins:
+                return False
+            raid = self.raids[guild_id] = {'started': now, 'joins': 0, 'leaves': 0, 'actions': 0}
+            self.raid_count += 1
+            self.bot.db.log_event('raid_started', guild_id, f"{joins} joins within {self.raid_window:g}s")
+            await self.alert(guild_id, 'raid_started', joins=joins, seconds=f"{self.raid_window:g}", action=self.raid_action)
+
+        raid['joins'] += 1
+        self.suppressed += 2
+        if self.raid_action == 'kick' and await self._act(member.kick(reason="Raid protection")):
+            raid['actions'] += 1
+        return True
+
+    def member_left(self, member):
+        """Returns True when the guild is in a raid, so leaves (and kicks) are only summarized"""
+        raid = self.raids.get(member.guild.id)
+        if raid is None:
+            return False
+        raid['leaves'] += 1
+        self.suppressed += 2
+        return True
+
+    async def message_sent(self, message):
+        """Count a member's message; returns True while they are spamming (the caller skips its row)"""
+        key = (message.guild.id, message.author.id)
+        now = time.monotonic()
+        window = self.messages.get(key)
+        if window is None:
+            window = self.messages[key] = SlidingWindow(self.spam_window)
+            # The least recently active member goes, even mid-burst: the sweep then ends their burst
+            while len(self.messages) > self.max_members:
+                self.messages.popitem(last=False)
+        else:
+            self.messages.move_to_end(key)
+        messages = window.add(now)
+
+        burst = self.spammers.get(key)
+        if burst is None:
+            if messages < self.spam_messages:
+                return False
+            burst = self.spammers[key] = {'started': now, 'messages': 0, 'actions': 0}
+            self.spam_count += 1
+            self.bot.db.log_event(
+                'spam_started', message.guild.id,
+                f"User {message.author.id}: {messages} messages within {self.spam_window:g}s"
+            )
+            await self.alert(
+                message.guild.id, 'spam_started', user=message.author.mention,
+                messages=messages, seconds=f"{self.spam_window:g}", action=self.spam_action
+            )
+            if self.spam_action == 'timeout' and await self._act(
+                message.author.timeout(self.spam_timeout, reason="Spam protection")
+            ):
+                burst['actions'] += 1
+
+        burst['messages'] += 1
+        self.suppressed += 1
+        if self.spam_action == 'delete' and await self._act(message.delete()):
+            burst['actions'] += 1
+        return True
+
+    async def _act(self, action):
+        """Run a moderation call; failures (e.g. missing permissions) are counted, not raised"""
+        try:
+            await action
+            self.actions += 1
+            return True
+        except discord.HTTPException as e:
+            self.failed_actions += 1
+            print(f"Protection action failed: {e}")
+            return False
+
+    async def alert(self, guild_id, key, **values):
+        """Post a protection notice to the guild's log channel, if it has one"""
+        channel_id = self.bot.log_channels.get(guild_id)
+        channel = self.bot.get_channel(channel_id) if channel_id else None
+        if channel is None:
+            return
+        language = self.bot.language_prefs.language_for(guild_id=guild_id)
+        try:
+            await channel.send(get_translation(key, language).format(**values))
+        except discord.HTTPException as e:
+            print(f"Error posting protection alert for guild {guild_id}: {e}")
+
+    async def sweep(self):
+        """End bursts whose rate has fallen to half the threshold and write their summaries"""
+        now = time.monotonic()
+        for guild_id, raid in list(self.raids.items()):
+            if self.joins[guild_id].count(now) * 2 > self.raid_joins:
+                continue
+            del self.raids[guild_id]
+            seconds = round(now - raid['started'])
+            self.bot.db.log_event(
+                'raid_ended', guild_id,
+                f"{raid['joins']} joins, {raid['leaves']} leaves in {seconds}s; {raid['actions']} {self.raid_action} actions"
+            )
+            await self.alert(guild_id, 'raid_ended', joins=raid['joins'], seconds=seconds, actions=raid['actions'])
+
+        for key, burst in list(self.spammers.items()):
+            window = self.messages.get(key)
+            if window is not None and window.count(now) * 2 > self.spam_messages:
+                continue
+            del self.spammers[key]
+            self.bot.db.log_event(
+                'spam_ended', key[0],
+                f"User {key[1]}: {burst['messages']} messages in {round(now - burst['started'])}s; "
+                f"{burst['actions']} {self.spam_action} actions"
+            )
+
+    async def run(self):
+        """Sweep finished bursts while the bot runs"""
+        await self.bot.wait_until_ready()
+        while not self.bot.is_closed():
+            await asyncio.sleep(self.sweep_interval)
+            try:
+                await self.sweep()
+            except Exception as e:
+                print(f"Error sweeping protection bursts: {e}")
+
+    def stats(self):
+        """Counters for the stats snapshot"""
+        return {
+            'active_raids': len(self.raids),
+            'active_spammers': len(self.spammers),
+            'tracked_members': len(self.messages),
+            'raids': self.raid_count,
+            'spam_bursts': self.spam_count,
+            'suppressed_rows': self.suppressed,
+            'actions': self.actions,
+            'failed_actions': self.failed_actions
+        }
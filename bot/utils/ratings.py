@@ -0,0 +1,52 @@
+import os
+
+# Elo parameters; changing K only affects new results until ratings are recomputed
+INITIAL_RATING = 1500.0
+K_FACTOR = float(os.getenv("ELO_K_FACTOR", "32"))
+SCALE = 400.0
+
+
+def match_score(team1_score, team2_score):
+    """Team 1's result as 1 (win), 0.5 (draw) or 0 (loss)"""
+    if team1_score > team2_score:
+        return 1.0
+    if team1_score < team2_score:
+        return 0.0
+    return 0.5
+
+
+def expected_score(rating, opponent_rating, scale=SCALE):
+    """Probability-like expectation of `rating` scoring against `opponent_rating`"""
+    return 1.0 / (1.0 + 10.0 ** ((opponent_rating - rating) / scale))
+
+
+def elo_update(rating1, rating2, score, k=K_FACTOR, scale=SCALE):
+    """New (rating1, rating2) after one match where team 1 scored `score`"""
+    change = k * (score - expected_score(rating1, rating2, scale))
+    return rating1 + change, rating2 - change
+
+
+def replay_ratings(matches, k=K_FACTOR, initial=INITIAL_RATING, scale=SCALE):
+    """Replay chronological (team1, team2, team1_score, team2_score) rows; returns {team: rating}
+
+    The history is first turned into flat columns (team indexes and results) so the
+    replay loop only does float arithmetic on a list; 10 ** (d / scale) in the
+    expectation is rewritten as base ** d with base precomputed.
+    """
+    index = {}
+    first, second, scores = [], [], []
+    for team1, team2, team1_score, team2_score in matches:
+        first.append(index.setdefault(team1, len(index)))
+        second.append(index.setdefault(team2, len(index)))
+        scores.append(match_score(team1_score, team2_score))
+
+    ratings = [initial] * len(index)
+    base = 10.0 ** (1.0 / scale)
+    for i, j, score in zip(first, second, scores):
+        rating_i = ratings[i]
+        rating_j = ratings[j]
+        change = k * (score - 1.0 / (1.0 + base ** (rating_j - rating_i)))
+        ratings[i] = rating_i + change
+        ratings[j] = rating_j - change
+
+    return {team: ratings[position] for team, position in index.items()}
@@ -0,0 +1,102 @@
+import re
+from datetime import datetime, timedelta
+
+# "every 30m", "every 2h", "every 1d", "every 1w"
+INTERVAL = re.compile(r'^every\s+(\d+)\s*([mhdw])$')
+INTERVAL_UNITS = {'m': 'minutes', 'h': 'hours', 'd': 'days', 'w': 'weeks'}
+
+# Cron fields: minute, hour, day of month, month, day of week (0 or 7 = Sunday)
+CRON_FIELDS = ((0, 59), (0, 23), (1, 31), (1, 12), (0, 7))
+
+# Days searched for a cron match before giving up (covers Feb 29 schedules)
+MAX_SEARCH_DAYS = 366 * 8
+
+
+def _cron_field(text, low, high):
+    """Expand one cron field ('*', '5', '1-5', '*/15', '1,15', '10-40/10') into a set"""
+    values = set()
+    for part in text.split(','):
+        step = 1
+        if '/' in part:
+            part, step = part.split('/', 1)
+            step = int(step)
+        if part == '*':
+            start, end = low, high
+        elif '-' in part:
+            start, end = (int(value) for value in part.split('-', 1))
+        else:
+            start = end = int(part)
+            if step != 1:
+                end = high
+        if step < 1 or start < low or end > high or start > end:
+            raise ValueError(f"Cron field out of range: {text}")
+        values.update(range(start, end + 1, step))
+    return values
+
+
+class Recurrence:
+    """An announcement repeat rule: a fixed interval or a five-field cron expression"""
+
+    def __init__(self, text):
+        self.text = " ".join(text.lower().split())
+        match = INTERVAL.match(self.text)
+        if match:
+            self.interval = timedelta(**{INTERVAL_UNITS[match.group(2)]: int(match.group(1))})
+            if not self.interval:
+                raise ValueError("Interval must be positive")
+            return
+
+        self.interval = None
+        parts = self.text.split(' ')
+        if len(parts) != 5:
+            raise ValueError(f"Not an interval or cron expression: {text}")
+        try:
+            fields = [_cron_field(part, low, high) for part, (low, high) in zip(parts, CRON_FIELDS)]
+        except ValueError as e:
+            raise ValueError(f"Invalid cron expression: {text}") from e
+        self.minutes, self.hours, self.days, self.months, weekdays = fields
+        # Cron counts Sunday as 0 (or 7); Python's weekday() as 6
+        self.weekdays = {(day - 1) % 7 for day in weekdays}
+        # Like cron, a restricted day of month and day of week match either one
+        self.any_day = parts[2] == '*'
+        self.any_weekday = parts[4] == '*'
+
+    def _day_matches(self, day):
+        if day.month not in self.months:
+            return False
+        in_month = day.day in self.days
+        in_week = day.weekday() in self.weekdays
+        if self.any_day or self.any_weekday:
+            return in_month and in_week
+        return in_month or in_week
+
+    def next_after(self, previous, now=None):
+        """First occurrence after both previous and now; missed occurrences are skipped, not replayed"""
+        after = max(previous, now) if now else previous
+        if self.interval is not None:
+            # Stay on the previous fire's grid so occurrences don't drift
+            steps = (after - previous) // self.interval + 1
+            return previous + steps * self.interval
+
+        start = after.replace(second=0, microsecond=0) + timedelta(minutes=1)
+        day = start.replace(hour=0, minute=0)
+        for _ in range(MAX_SEARCH_DAYS):
+            if self._day_matches(day):
+                for hour in sorted(self.hours):
+                    for minute in sorted(self.minutes):
+                        candidate = day.replace(hour=hour, minute=minute)
+                        if candidate >= start:
+                            return candidate
+            day += timedelta(days=1)
+        raise ValueError(f"Cron expression never fires: {self.text}")
+
+    def first_at_or_after(self, start):
+        """First occurrence from start on (start itself for intervals)"""
+        if self.interval is not None:
+            return start
+        return self.next_after(start - timedelta(minutes=1))
+
+
+def parse_time(value):
+    """datetime from a stored DATETIME value"""
+    return value if isinstance(value, datetime) else datetime.fromisoformat(value)
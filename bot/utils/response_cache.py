@@ -0,0 +1,84 @@
+import time
+from collections import OrderedDict
+
+
+class ResponseCache:
+    """Rendered embeds of read-only commands, kept for a TTL with LRU eviction
+
+    Each entry records the tables it was built from; Database change notifications
+    drop exactly the entries of that guild that read a changed table.
+    """
+
+    def __init__(self, maxsize=1024, ttl=60):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.entries = OrderedDict()  # (command, guild_id, language, args) -> (expires, tables, embed)
+        self.dependents = {}  # (guild_id, table) -> keys built from that table
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+        self.stale_hits = 0
+
+    def get_or_build(self, command, guild_id, language, args, tables, build, stale=False):
+        """Return a copy of the cached embed, calling build() on a miss or after expiry
+
+        With stale=True (a throttled caller) build() is never called: any entry,
+        expired or not, is returned, and None when there is none.
+        """
+        key = (command, guild_id, language, args)
+        entry = self.entries.get(key)
+        now = time.monotonic()
+        if entry is not None and (entry[0] > now or stale):
+            self.entries.move_to_end(key)
+            if entry[0] > now:
+                self.hits += 1
+            else:
+                self.stale_hits += 1
+            return entry[2].copy()
+        if stale:
+            return None
+
+        self.misses += 1
+        embed = build()
+        if entry is not None:
+            self._discard(key)
+        self.entries[key] = (now + self.ttl, tables, embed)
+        for table in tables:
+            self.dependents.setdefault((guild_id, table), set()).add(key)
+        while len(self.entries) > self.maxsize:
+            self._discard(next(iter(self.entries)))
+        return embed.copy()
+
+    def _discard(self, key):
+        _, tables, _ = self.entries.pop(key)
+        for table in tables:
+            keys = self.dependents.get((key[1], table))
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self.dependents[(key[1], table)]
+
+    def invalidate(self, guild_id, tables):
+        """Drop entries built from any of these tables; guild_id None means every guild"""
+        if guild_id is None:
+            groups = [dependency for dependency in self.dependents if dependency[1] in tables]
+        else:
+            groups = [(guild_id, table) for table in tables]
+
+        for dependency in groups:
+            for key in list(self.dependents.get(dependency, ())):
+                if key in self.entries:
+                    self._discard(key)
+                    self.invalidations += 1
+
+    def stats(self):
+        """Counters for the stats snapshot"""
+        lookups = self.hits + self.misses
+        return {
+            'entries': len(self.entries),
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': round(self.hits / lookups, 3) if lookups else 0.0,
+            'stale_hits': self.stale_hits,
+            'invalidations': self.invalidations
+        }
@@ -2,25 +2,41 @@ import asyncio
 from datetime import datetime, timedelta
 from apscheduler.schedulers.asyncio import AsyncIOScheduler
 from apscheduler.triggers.date import DateTrigger
-from bot.utils.translations import get_translation
+from bot.utils.translations import get_translation, format_datetime
+from bot.utils.dm_queue import PRIORITY_REMINDER
 
 class MatchScheduler:
     def __init__(self, bot):
         self.bot = bot
         self.scheduler = AsyncIOScheduler()
+        self.reminded = set()  # match IDs whose reminders are registered
         
     def start(self):
         """Start the scheduler"""
         self.scheduler.start()
+        self.scheduler.add_job(
+            self.refresh_reminders,
+            'interval',
+            hours=1,
+            id='refresh_reminders',
+            replace_existing=True
+        )
     
     def stop(self):
         """Stop the scheduler"""
         self.scheduler.shutdown()
     
-    def schedule_reminder(self, match_id, reminder_time, minutes_before, language='es'):
+    # Retry interval while the guild's shard is reconnecting
+    SHARD_RETRY_SECONDS = 15
+    
+    def schedule_reminder(self, match_id, reminder_time, minutes_before, language='es', guild_id=None):
         """Schedule a match reminder"""
         job_id = f"reminder_{match_id}_{minutes_before}"
         
+        # Reminders are only run by the process owning the guild's shard
+        if guild_id is not None and not self.bot.owns_guild(guild_id):
+            return
+        
         self.scheduler.add_job(
             self._send_reminder,
             DateTrigger(run_date=reminder_time),
@@ -29,6 +45,49 @@ class MatchScheduler:
             replace_existing=True
         )
     
+    # Minutes before kick-off at which match reminders are sent
+    REMINDER_MINUTES = (10, 3)
+    # Only matches starting this soon get jobs; the hourly refresh picks up the rest,
+    # so a season of fixtures doesn't fill the job store up front
+    REMINDER_HORIZON = timedelta(days=2)
+    
+    def schedule_match_reminders(self, match_id, match_date, language='es', guild_id=None):
+        """Schedule every reminder of a match that is still in the future"""
+        now = datetime.now()
+        if match_id in self.reminded or match_date - now > self.REMINDER_HORIZON:
+            return
+        
+        self.reminded.add(match_id)
+        for minutes_before in self.REMINDER_MINUTES:
+            reminder_time = match_date - timedelta(minutes=minutes_before)
+            if reminder_time > now:
+                self.schedule_reminder(match_id, reminder_time, minutes_before, language, guild_id)
+    
+    async def refresh_reminders(self):
+        """Register reminders for cached matches that have entered the horizon"""
+        match_commands_cog = self.bot.get_cog('MatchCommands')
+        if not match_commands_cog:
+            return
+        
+        # Forget matches that have been played or ended since, so the set stays bounded
+        self.reminded.intersection_update(match_commands_cog.active_matches)
+        
+        for match_id, match_info in list(match_commands_cog.active_matches.items()):
+            self.schedule_match_reminders(match_id, match_info['datetime'], match_info['lang'], match_info['guild_id'])
+    
+    def get_shard_jobs(self, shard_id):
+        """Get pending reminder jobs for guilds on a shard"""
+        match_commands_cog = self.bot.get_cog('MatchCommands')
+        if not match_commands_cog:
+            return []
+        
+        jobs = []
+        for job in self.scheduler.get_jobs():
+            match_info = match_commands_cog.active_matches.get(job.args[0]) if job.args else None
+            if match_info and self.bot.get_shard_id(match_info['guild_id']) == shard_id:
+                jobs.append(job)
+        return jobs
+    
     async def _send_reminder(self, match_id, minutes_before, language):
         """Send reminder for a match"""
         # Get match info from bot
@@ -37,91 +96,40 @@ class MatchScheduler:
             return
         
         match_info = match_commands_cog.active_matches[match_id]
+        
+        # Wait for the owning shard to come back instead of dropping the reminder
+        shard_id = self.bot.get_shard_id(match_info['guild_id'])
+        if not self.bot.is_shard_ready(shard_id):
+            retry_time = datetime.now() + timedelta(seconds=self.SHARD_RETRY_SECONDS)
+            if retry_time < match_info['datetime']:
+                self.scheduler.add_job(
+                    self._send_reminder,
+                    DateTrigger(run_date=retry_time),
+                    args=[match_id, minutes_before, language],
+                    id=f"reminder_{match_id}_{minutes_before}",
+                    replace_existing=True
+                )
+            return
+        
         guild = self.bot.get_guild(match_info['guild_id'])
         if not guild:
             return
         
         # Convert mentions to text for DM
-        team1_text = await self._convert_mention_to_text(guild, match_info['team1'])
-        team2_text = await self._convert_mention_to_text(guild, match_info['team2'])
-        
-        # Create reminder message
-        if language == 'en':
-            time_str = match_info['datetime'].strftime("%B %d at %H:%M GMT")
-            reminder_msg = f"🔔 **Match Reminder**\n\n**{team1_text} vs {team2_text}**\nStarts in {minutes_before} minutes!\n\n📅 {time_str}"
-        elif language == 'pt':
-            time_str = match_info['datetime'].strftime("%d de %B às %H:%M")
-            reminder_msg = f"🔔 **Lembrete de Partida**\n\n**{team1_text} vs {team2_text}**\nComeça em {minutes_before} minutos!\n\n📅 {time_str}"
-        else:  # Spanish
-            months_es = {
-                1: "enero", 2: "febrero", 3: "marzo", 4: "abril",
-                5: "mayo", 6: "junio", 7: "julio", 8: "agosto", 
-                9: "septiembre", 10: "octubre", 11: "noviembre", 12: "diciembre"
-            }
-            month_name = months_es[match_info['datetime'].month]
-            time_str = f"{match_info['datetime'].day} de {month_name} a las {match_info['datetime'].strftime('%H:%M')}"
-            reminder_msg = f"🔔 **Recordatorio de Partido**\n\n**{team1_text} vs {team2_text}**\n¡Comienza en {minutes_before} minutos!\n\n📅 {time_str}"
-        
-        # Send DM reminders to mentioned teams/users
-        await self._send_reminder_dm(guild, match_info['team1'], match_info['team2'], reminder_msg)
+        team1_text = await self.bot.mentions.display_text(guild, match_info['team1'])
+        team2_text = await self.bot.mentions.display_text(guild, match_info['team2'])
         
-        print(f"Sent {minutes_before}-minute reminder for match {match_id}")
-    
-    async def _send_reminder_dm(self, guild, team1, team2, message):
-        """Send reminder DM to mentioned teams/users"""
-        teams = [team1, team2]
-        
-        for team in teams:
-            # Check if it's a role mention (<@&role_id>)
-            if team.startswith('<@&') and team.endswith('>'):
-                try:
-                    role_id = int(team[3:-1])
-                    role = guild.get_role(role_id)
-                    if role:
-                        # Send DM to all members of the role
-                        for member in role.members:
-                            try:
-                                await member.send(message)
-                                await asyncio.sleep(0.5)  # Rate limiting
-                            except:
-                                continue
-                except ValueError:
-                    continue
-            
-            # Check if it's a user mention (<@user_id>)
-            elif team.startswith('<@') and team.endswith('>'):
-                try:
-                    user_id = int(team[2:-1])
-                    user = guild.get_member(user_id)
-                    if user:
-                        try:
-                            await user.send(message)
-                        except:
-                            continue
-                except ValueError:
-                    continue
-    
-    async def _convert_mention_to_text(self, guild, mention_text):
-        """Convert mention to readable text"""
-        # Check if it's a role mention (<@&role_id>)
-        if mention_text.startswith('<@&') and mention_text.endswith('>'):
-            try:
-                role_id = int(mention_text[3:-1])
-                role = guild.get_role(role_id)
-                if role:
-                    return f"@{role.name}"
-            except ValueError:
-                pass
+        # Render the reminder once per distinct language among the recipients
+        recipients = await self.bot.mentions.recipients(guild, match_info['team1'], match_info['team2'])
+        groups = self.bot.language_prefs.group_by_language(recipients, guild.id, default=language)
         
-        # Check if it's a user mention (<@user_id>)
-        elif mention_text.startswith('<@') and mention_text.endswith('>'):
-            try:
-                user_id = int(mention_text[2:-1])
-                user = guild.get_member(user_id)
-                if user:
-                    return f"@{user.display_name}"
-            except ValueError:
-                pass
+        for recipient_language, members in groups.items():
+            reminder_msg = get_translation("reminder_message", recipient_language).format(
+                team1=team1_text,
+                team2=team2_text,
+                minutes=minutes_before,
+                time=format_datetime(match_info['datetime'], recipient_language)
+            )
+            self.bot.dm_queue.enqueue(members, PRIORITY_REMINDER, content=reminder_msg)
         
-        # Return original text if not a mention
-        return mention_text
+        print(f"Queued {minutes_before}-minute reminder for match {match_id}")
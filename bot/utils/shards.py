@@ -0,0 +1,73 @@
+import time
+
+
+def shard_id_for(guild_id, shard_count):
+    """Return the shard that owns a guild (Discord's sharding formula)"""
+    if not shard_count:
+        return 0
+    return (guild_id >> 22) % shard_count
+
+
+class RateCounter:
+    """Event counter over a sliding window of one-second buckets"""
+
+    def __init__(self, window=60):
+        self.window = window
+        self.counts = [0] * window
+        self.stamps = [0] * window
+        self.total = 0
+
+    def add(self, amount=1, now=None):
+        """Count events at the given time"""
+        second = int(now if now is not None else time.monotonic())
+        index = second % self.window
+        if self.stamps[index] != second:
+            self.stamps[index] = second
+            self.counts[index] = 0
+        self.counts[index] += amount
+        self.total += amount
+
+    def count(self, now=None):
+        """Number of events seen inside the window"""
+        second = int(now if now is not None else time.monotonic())
+        return sum(
+            count for count, stamp in zip(self.counts, self.stamps)
+            if second - stamp < self.window
+        )
+
+
+class ShardStats:
+    """Per-shard event rates and connection state"""
+
+    def __init__(self, window=60):
+        self.window = window
+        self.events = {}
+        self.connected = {}
+        self.reconnects = {}
+
+    def _counter(self, shard_id):
+        counter = self.events.get(shard_id)
+        if counter is None:
+            counter = self.events[shard_id] = RateCounter(self.window)
+        return counter
+
+    def record(self, shard_id):
+        """Count one handled gateway event for a shard"""
+        self._counter(shard_id or 0).add()
+
+    def set_connected(self, shard_id, connected):
+        """Track shard connection state"""
+        shard_id = shard_id or 0
+        if connected and self.connected.get(shard_id) is False:
+            self.reconnects[shard_id] = self.reconnects.get(shard_id, 0) + 1
+        self.connected[shard_id] = connected
+
+    def snapshot(self, shard_id):
+        """Counters for a single shard"""
+        counter = self._counter(shard_id)
+        return {
+            'events_total': counter.total,
+            'events_per_minute': round(counter.count() * 60 / self.window, 1),
+            'connected': self.connected.get(shard_id, True),
+            'reconnects': self.reconnects.get(shard_id, 0)
+        }
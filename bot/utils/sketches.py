@@ -0,0 +1,274 @@
+import asyncio
+import hashlib
+import math
+import threading
+from datetime import datetime, timedelta
+
+
+def hash64(value):
+    """Stable 64-bit hash of an integer ID"""
+    digest = hashlib.blake2b(value.to_bytes(8, 'little', signed=False), digest_size=8).digest()
+    return int.from_bytes(digest, 'little')
+
+
+class HyperLogLog:
+    """Approximate distinct counter with 2**precision one-byte registers
+
+    The default precision of 12 uses 4 KB per sketch with ~1.6% standard error.
+    Sketches of the same precision merge by taking the register-wise maximum.
+    """
+
+    def __init__(self, precision=12, registers=None):
+        self.precision = precision
+        self.size = 1 << precision
+        self.registers = bytearray(registers) if registers is not None else bytearray(self.size)
+        if len(self.registers) != self.size:
+            raise ValueError("Register count doesn't match precision")
+
+    def add_hash(self, hashed):
+        """Add a 64-bit hash to the sketch; returns True if a register changed"""
+        index = hashed >> (64 - self.precision)
+        remaining_bits = 64 - self.precision
+        rest = hashed & ((1 << remaining_bits) - 1)
+        rank = remaining_bits - rest.bit_length() + 1
+        if rank > self.registers[index]:
+            self.registers[index] = rank
+            return True
+        return False
+
+    def add(self, value):
+        """Add an integer ID to the sketch"""
+        return self.add_hash(hash64(value))
+
+    def merge(self, other):
+        """Fold another sketch into this one"""
+        if other.precision != self.precision:
+            raise ValueError("Cannot merge sketches of different precision")
+        registers = self.registers
+        for index, rank in enumerate(other.registers):
+            if rank > registers[index]:
+                registers[index] = rank
+
+    def count(self):
+        """Estimated number of distinct values added"""
+        size = self.size
+        alpha = 0.7213 / (1 + 1.079 / size)
+        total = 0.0
+        zeros = 0
+        for rank in self.registers:
+            total += 2.0 ** -rank
+            if rank == 0:
+                zeros += 1
+
+        estimate = alpha * size * size / total
+        # Small-range correction: linear counting while many registers are empty
+        if estimate <= 2.5 * size and zeros:
+            estimate = size * math.log(size / zeros)
+        return int(round(estimate))
+
+    def to_bytes(self):
+        return bytes(self.registers)
+
+    @classmethod
+    def from_bytes(cls, data, precision=12):
+        return cls(precision, data)
+
+
+def utc_day(now=None):
+    """Day bucket used for sketches ('YYYY-MM-DD', UTC)"""
+    return (now or datetime.utcnow()).strftime('%Y-%m-%d')
+
+
+class ActivitySketches:
+    """Per-guild, per-day unique active member sketches with periodic persistence"""
+
+    # Named windows served by /activeusers and the dashboard, in days
+    WINDOWS = {'today': 1, 'week': 7, 'month': 30}
+
+    def __init__(self, db, precision=12):
+        self.db = db
+        self.precision = precision
+        self.sketches = {}  # (guild_id, day) -> HyperLogLog
+        self.dirty = set()
+        # The dashboard reads from its own thread; keys are only added or removed under this lock
+        self.lock = threading.Lock()
+
+    def record(self, guild_id, user_id, now=None):
+        """Count a member as active in a guild today"""
+        key = (guild_id, utc_day(now))
+        sketch = self.sketches.get(key)
+        if sketch is None:
+            with self.lock:
+                sketch = self.sketches[key] = HyperLogLog(self.precision)
+        if sketch.add(user_id):
+            self.dirty.add(key)
+
+    def flush(self, now=None):
+        """Persist changed sketches and drop finished days from memory"""
+        if self.dirty:
+            rows = [(guild_id, day, self.sketches[(guild_id, day)].to_bytes()) for guild_id, day in self.dirty]
+            self.db.merge_activity_sketches(rows)
+            self.dirty.clear()
+
+        today = utc_day(now)
+        with self.lock:
+            for key in [key for key in self.sketches if key[1] != today]:
+                del self.sketches[key]
+
+    def window_sketch(self, guild_id, days, now=None):
+        """Merge the stored and in-memory sketches of the last N days"""
+        now = now or datetime.utcnow()
+        first_day = utc_day(now - timedelta(days=days - 1))
+
+        merged = HyperLogLog(self.precision)
+        for blob in self.db.get_activity_sketches(guild_id, first_day, utc_day(now)):
+            merged.merge(HyperLogLog.from_bytes(blob, self.precision))
+
+        with self.lock:
+            recent = [
+                HyperLogLog.from_bytes(sketch.to_bytes(), self.precision)
+                for (sketch_guild, day), sketch in self.sketches.items()
+                if sketch_guild == guild_id and day >= first_day
+            ]
+        for sketch in recent:
+            merged.merge(sketch)
+        return merged
+
+    def counts(self, guild_id, now=None):
+        """Approximate unique active members for each named window"""
+        return {
+            name: self.window_sketch(guild_id, days, now).count()
+            for name, days in self.WINDOWS.items()
+        }
+
+    async def run_flusher(self, bot, interval=60):
+        """Periodically persist sketches while the bot runs"""
+        await bot.wait_until_ready()
+        while not bot.is_closed():
+            await asyncio.sleep(interval)
+            try:
+                self.flush()
+            except Exception as e:
+                print(f"Error flushing activity sketches: {e}")
+
+
+class SpaceSaving:
+    """Space-Saving heavy hitters: approximate top-K counts in at most `capacity` counters
+
+    Counters are grouped in buckets by count so increments and evictions are O(1).
+    A tracked count overestimates the true count by at most its error, and any
+    key seen more than total/capacity times is guaranteed to be tracked.
+    """
+
+    def __init__(self, capacity=100):
+        self.capacity = capacity
+        self.counts = {}  # key -> count
+        self.errors = {}  # key -> overestimation bound
+        self.buckets = {}  # count -> set of keys
+        self.min_count = 0
+        self.total = 0
+
+    def _move(self, key, old_count, new_count):
+        if old_count:
+            bucket = self.buckets[old_count]
+            bucket.discard(key)
+            if not bucket:
+                del self.buckets[old_count]
+        self.buckets.setdefault(new_count, set()).add(key)
+        self.counts[key] = new_count
+
+    def offer(self, key):
+        """Count one occurrence of key"""
+        self.total += 1
+        count = self.counts.get(key)
+        if count is not None:
+            self._move(key, count, count + 1)
+            if count == self.min_count and count not in self.buckets:
+                self.min_count = count + 1
+            return
+
+        if len(self.counts) < self.capacity:
+            self.errors[key] = 0
+            self._move(key, 0, 1)
+            self.min_count = 1
+            return
+
+        # Replace one of the smallest counters; the newcomer inherits its count as error
+        floor = self.min_count
+        bucket = self.buckets[floor]
+        victim = bucket.pop()
+        if not bucket:
+            del self.buckets[floor]
+            self.min_count = floor + 1
+        del self.counts[victim], self.errors[victim]
+        self.errors[key] = floor
+        self._move(key, 0, floor + 1)
+
+    def top(self, limit=10):
+        """[(key, count, error)] for the `limit` largest counters"""
+        keys = sorted(self.counts, key=self.counts.__getitem__, reverse=True)[:limit]
+        return [(key, self.counts[key], self.errors[key]) for key in keys]
+
+    def load(self, rows):
+        """Restore counters from (key, count, error) rows"""
+        for key, count, error in rows[:self.capacity]:
+            self.errors[key] = error
+            self._move(key, 0, count)
+        self.min_count = min(self.buckets) if self.buckets else 0
+        self.total = sum(self.counts.values())
+
+
+class ActivityLeaders:
+    """Per-guild Space-Saving summaries of message authors, checkpointed to the database"""
+
+    def __init__(self, db, capacity=100):
+        self.db = db
+        self.capacity = capacity
+        self.summaries = {}  # guild_id -> SpaceSaving
+        self.dirty = set()
+
+    def load(self):
+        """Restore every checkpointed summary"""
+        rows_by_guild = {}
+        for guild_id, user_id, count, error in self.db.get_activity_leaders():
+            rows_by_guild.setdefault(guild_id, []).append((user_id, count, error))
+
+        for guild_id, rows in rows_by_guild.items():
+            summary = SpaceSaving(self.capacity)
+            summary.load(sorted(rows, key=lambda row: row[1], reverse=True))
+            self.summaries[guild_id] = summary
+
+    def record(self, guild_id, user_id):
+        """Count one message by a member"""
+        summary = self.summaries.get(guild_id)
+        if summary is None:
+            summary = self.summaries[guild_id] = SpaceSaving(self.capacity)
+        summary.offer(user_id)
+        self.dirty.add(guild_id)
+
+    def top(self, guild_id, limit=10):
+        """[(user_id, count, error)] for a guild's most active members"""
+        summary = self.summaries.get(guild_id)
+        return summary.top(limit) if summary else []
+
+    def checkpoint(self):
+        """Write the summaries of guilds that changed since the last checkpoint"""
+        if not self.dirty:
+            return
+        rows = {
+            guild_id: [(user_id, count, self.summaries[guild_id].errors[user_id])
+                       for user_id, count in self.summaries[guild_id].counts.items()]
+            for guild_id in self.dirty
+        }
+        self.db.replace_activity_leaders(rows)
+        self.dirty.clear()
+
+    async def run_checkpointer(self, bot, interval=60):
+        """Periodically checkpoint summaries while the bot runs"""
+        await bot.wait_until_ready()
+        while not bot.is_closed():
+            await asyncio.sleep(interval)
+            try:
+                self.checkpoint()
+            except Exception as e:
+                print(f"Error checkpointing activity leaders: {e}")
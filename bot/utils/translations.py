@@ -1,214 +1,331 @@
-# Translation strings for the bot
-TRANSLATIONS = {
-    'es': {  # Spanish (Primary)
-        'error': 'Error',
-        'success': 'Éxito',
-        'admin_only': 'Este comando solo puede ser usado por administradores.',
-        'log_channel_set': 'Canal de registro establecido en {channel}',
-        'channels_set': 'Canales permitidos establecidos: {channels}',
-        'invalid_channel_ids': 'IDs de canal inválidos. Use números separados por espacios.',
-        'dm_sent': 'Mensaje directo enviado a {user}',
-        'dm_failed': 'No se pudo enviar el mensaje directo. El usuario puede tener los DMs deshabilitados.',
-        'role_dm_sent': 'Mensajes directos enviados a {count} miembros del rol {role}',
-        'invalid_image': 'Tipo de archivo inválido. Solo se permiten imágenes.',
-        'match_created': 'Partido Creado',
-        'teams': 'Equipos',
-        'match_time': 'Hora del Partido',
-        'match_id': 'ID del Partido',
-        'invalid_day': 'Día inválido. Use un número entre 1 y 31.',
-        'invalid_hour': 'Hora inválida. Use un número entre 0 y 23.',
-        'invalid_minute': 'Minuto inválido. Use un número entre 0 y 59.',
-        'invalid_date': 'Fecha inválida. Verifique el día del mes.',
-        'match_ended': 'Partido Terminado',
-        'match_ended_desc': 'El partido #{match_id} entre {team1} y {team2} ha terminado.',
-        'match_not_found': 'Partido no encontrado con ese ID.',
-        'active_matches': 'Partidos Activos',
-        'no_active_matches': 'No hay partidos activos en este momento.',
-        'help_title': 'Comandos de xSportBS',
-        'help_description': 'Aquí están todos los comandos disponibles del bot xSportBS:',
-        'match_commands': '⚽ Comandos de Partidos',
-        'admin_commands': '🛡️ Comandos de Administración',
-        'general_commands': '📖 Comandos Generales',
-        'help_creatematch': 'Crear un nuevo partido con equipos, fecha, hora e imagen',
-        'help_endmatch': 'Terminar un partido activo',
-        'help_listmatches': 'Mostrar todos los partidos activos',
-        'help_setlogchannel': 'Establecer canal para registros de actividad del bot',
-        'help_setchannels': 'Establecer canales permitidos para uso del bot',
-        'help_dmuser': 'Enviar mensaje directo a un usuario específico',
-        'help_dmrole': 'Enviar mensaje directo a todos los miembros de un rol',
-        'help_customembed': 'Enviar un embed personalizado con imagen opcional',
-        'help_help': 'Mostrar esta ayuda',
-        'support': 'Soporte Técnico',
-        'support_info': 'kokex | Wo',
-        'server_invite': 'Servidor de Discord',
-        'help_footer': 'Bot creado para el servidor xSportBS',
-        'match_result_recorded': 'Resultado de Partido Registrado',
-        'winner': 'Ganador',
-        'draw': 'Empate',
-        'result': 'Resultado',
-        'final_score': 'Resultado Final',
-        'team_statistics': 'Estadísticas de Equipos',
-        'team': 'Equipo',
-        'points': 'Puntos',
-        'wins': 'Victorias',
-        'losses': 'Derrotas',
-        'draws': 'Empates',
-        'team_rankings': 'Clasificación de Equipos',
-        'no_team_stats': 'No hay estadísticas de equipos disponibles',
-        'match_history': 'Historial de Partidos',
-        'no_match_history': 'No hay historial de partidos',
-        'tournament_created': 'Torneo Creado',
-        'tournament_name': 'Nombre del Torneo',
-        'tournament_id': 'ID del Torneo',
-        'start_date': 'Fecha de Inicio',
-        'end_date': 'Fecha de Fin',
-        'active_tournaments': 'Torneos Activos',
-        'no_active_tournaments': 'No hay torneos activos',
-        'announcement_scheduled': 'Anuncio Programado',
-        'schedule_time': 'Hora Programada',
-        'invalid_time': 'Hora inválida'
-    },
-    'en': {  # English
-        'error': 'Error',
-        'success': 'Success',
-        'admin_only': 'This command can only be used by administrators.',
-        'log_channel_set': 'Log channel set to {channel}',
-        'channels_set': 'Allowed channels set: {channels}',
-        'invalid_channel_ids': 'Invalid channel IDs. Use space-separated numbers.',
-        'dm_sent': 'Direct message sent to {user}',
-        'dm_failed': 'Could not send direct message. User may have DMs disabled.',
-        'role_dm_sent': 'Direct messages sent to {count} members of role {role}',
-        'invalid_image': 'Invalid file type. Only images are allowed.',
-        'match_created': 'Match Created',
-        'teams': 'Teams',
-        'match_time': 'Match Time',
-        'match_id': 'Match ID',
-        'invalid_day': 'Invalid day. Use a number between 1 and 31.',
-        'invalid_hour': 'Invalid hour. Use a number between 0 and 23.',
-        'invalid_minute': 'Invalid minute. Use a number between 0 and 59.',
-        'invalid_date': 'Invalid date. Check the day of the month.',
-        'match_ended': 'Match Ended',
-        'match_ended_desc': 'Match #{match_id} between {team1} and {team2} has ended.',
-        'match_not_found': 'Match not found with that ID.',
-        'active_matches': 'Active Matches',
-        'no_active_matches': 'No active matches at this time.',
-        'help_title': 'xSportBS Commands',
-        'help_description': 'Here are all available xSportBS bot commands:',
-        'match_commands': '⚽ Match Commands',
-        'admin_commands': '🛡️ Administration Commands',
-        'general_commands': '📖 General Commands',
-        'help_creatematch': 'Create a new match with teams, date, time and image',
-        'help_endmatch': 'End an active match',
-        'help_listmatches': 'Show all active matches',
-        'help_setlogchannel': 'Set channel for bot activity logs',
-        'help_setchannels': 'Set allowed channels for bot usage',
-        'help_dmuser': 'Send direct message to a specific user',
-        'help_dmrole': 'Send direct message to all members of a role',
-        'help_customembed': 'Send a custom embed with optional image',
-        'help_help': 'Show this help',
-        'support': 'Technical Support',
-        'support_info': 'kokex | Wo',
-        'server_invite': 'Discord Server',
-        'help_footer': 'Bot created for the xSportBS server',
-        'match_result_recorded': 'Match Result Recorded',
-        'winner': 'Winner',
-        'draw': 'Draw',
-        'result': 'Result',
-        'final_score': 'Final Score',
-        'team_statistics': 'Team Statistics',
-        'team': 'Team',
-        'points': 'Points',
-        'wins': 'Wins',
-        'losses': 'Losses',
-        'draws': 'Draws',
-        'team_rankings': 'Team Rankings',
-        'no_team_stats': 'No team statistics available',
-        'match_history': 'Match History',
-        'no_match_history': 'No match history available',
-        'tournament_created': 'Tournament Created',
-        'tournament_name': 'Tournament Name',
-        'tournament_id': 'Tournament ID',
-        'start_date': 'Start Date',
-        'end_date': 'End Date',
-        'active_tournaments': 'Active Tournaments',
-        'no_active_tournaments': 'No active tournaments',
-        'announcement_scheduled': 'Announcement Scheduled',
-        'schedule_time': 'Scheduled Time',
-        'invalid_time': 'Invalid time'
-    },
-    'pt': {  # Portuguese
-        'error': 'Erro',
-        'success': 'Sucesso',
-        'admin_only': 'Este comando só pode ser usado por administradores.',
-        'log_channel_set': 'Canal de registo definido para {channel}',
-        'channels_set': 'Canais permitidos definidos: {channels}',
-        'invalid_channel_ids': 'IDs de canal inválidos. Use números separados por espaços.',
-        'dm_sent': 'Mensagem direta enviada para {user}',
-        'dm_failed': 'Não foi possível enviar mensagem direta. O utilizador pode ter DMs desabilitadas.',
-        'role_dm_sent': 'Mensagens diretas enviadas para {count} membros do cargo {role}',
-        'invalid_image': 'Tipo de ficheiro inválido. Apenas imagens são permitidas.',
-        'match_created': 'Partida Criada',
-        'teams': 'Equipas',
-        'match_time': 'Hora da Partida',
-        'match_id': 'ID da Partida',
-        'invalid_day': 'Dia inválido. Use um número entre 1 e 31.',
-        'invalid_hour': 'Hora inválida. Use um número entre 0 e 23.',
-        'invalid_minute': 'Minuto inválido. Use um número entre 0 e 59.',
-        'invalid_date': 'Data inválida. Verifique o dia do mês.',
-        'match_ended': 'Partida Terminada',
-        'match_ended_desc': 'A partida #{match_id} entre {team1} e {team2} terminou.',
-        'match_not_found': 'Partida não encontrada com esse ID.',
-        'active_matches': 'Partidas Ativas',
-        'no_active_matches': 'Não há partidas ativas neste momento.',
-        'help_title': 'Comandos do xSportBS',
-        'help_description': 'Aqui estão todos os comandos disponíveis do bot xSportBS:',
-        'match_commands': '⚽ Comandos de Partidas',
-        'admin_commands': '🛡️ Comandos de Administração',
-        'general_commands': '📖 Comandos Gerais',
-        'help_creatematch': 'Criar uma nova partida com equipas, data, hora e imagem',
-        'help_endmatch': 'Terminar uma partida ativa',
-        'help_listmatches': 'Mostrar todas as partidas ativas',
-        'help_setlogchannel': 'Definir canal para registos de atividade do bot',
-        'help_setchannels': 'Definir canais permitidos para uso do bot',
-        'help_dmuser': 'Enviar mensagem direta para um utilizador específico',
-        'help_dmrole': 'Enviar mensagem direta para todos os membros de um cargo',
-        'help_customembed': 'Enviar um embed personalizado com imagem opcional',
-        'help_help': 'Mostrar esta ajuda',
-        'support': 'Suporte Técnico',
-        'support_info': 'kokex | Wo',
-        'server_invite': 'Servidor Discord',
-        'help_footer': 'Bot criado para o servidor xSportBS',
-        'match_result_recorded': 'Resultado da Partida Registrado',
-        'winner': 'Vencedor',
-        'draw': 'Empate',
-        'result': 'Resultado',
-        'final_score': 'Resultado Final',
-        'team_statistics': 'Estatísticas das Equipes',
-        'team': 'Equipe',
-        'points': 'Pontos',
-        'wins': 'Vitórias',
-        'losses': 'Derrotas',
-        'draws': 'Empates',
-        'team_rankings': 'Classificação das Equipes',
-        'no_team_stats': 'Nenhuma estatística de equipe disponível',
-        'match_history': 'Histórico de Partidas',
-        'no_match_history': 'Nenhum histórico de partidas disponível',
-        'tournament_created': 'Torneio Criado',
-        'tournament_name': 'Nome do Torneio',
-        'tournament_id': 'ID do Torneio',
-        'start_date': 'Data de Início',
-        'end_date': 'Data de Fim',
-        'active_tournaments': 'Torneios Ativos',
-        'no_active_tournaments': 'Nenhum torneio ativo',
-        'announcement_scheduled': 'Anúncio Agendado',
-        'schedule_time': 'Hora Agendada',
-        'invalid_time': 'Hora inválida'
-    }
-}
+import json
+import os
+import sys
+import discord
+
+# Translation catalogs live in bot/locales/<language>.json and are loaded on first use.
+# Keys starting with "_" hold date formatting data (_months, _date_long, _date_short).
+LOCALES_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'locales')
+DEFAULT_LANGUAGE = 'es'
+
+# Resolved catalogs: language -> flat {key: text}, with Spanish fallbacks merged in and strings interned
+_CATALOGS = {}
+DATE_FORMATTERS = {}
+
+
+def available_languages():
+    """Languages that have a catalog file"""
+    return sorted(
+        name[:-5] for name in os.listdir(LOCALES_DIR)
+        if name.endswith('.json')
+    )
+
+
+SUPPORTED_LANGUAGES = tuple(available_languages())
+
+
+def resolve_language(locale):
+    """Map a Discord locale ('pt-BR', 'en-US', 'fr'...) to a catalog, falling back to Spanish"""
+    if not locale:
+        return DEFAULT_LANGUAGE
+
+    locale = str(locale).replace('_', '-')
+    if locale in SUPPORTED_LANGUAGES:
+        return locale
+
+    base = locale.split('-', 1)[0].lower()
+    if base in SUPPORTED_LANGUAGES:
+        return base
+
+    return DEFAULT_LANGUAGE
+
+
+def _read_catalog(language):
+    """Read a catalog file without caching it"""
+    with open(os.path.join(LOCALES_DIR, f"{language}.json"), encoding='utf-8') as f:
+        return json.load(f)
+
+
+def language_names():
+    """Native name of every supported language, without keeping the catalogs loaded"""
+    return {language: _read_catalog(language)['language_name'] for language in SUPPORTED_LANGUAGES}
+
+
+def load_catalog(language):
+    """Load, resolve and cache a language's catalog"""
+    catalog = _CATALOGS.get(language)
+    if catalog is not None:
+        return catalog
+
+    if language not in SUPPORTED_LANGUAGES:
+        return load_catalog(DEFAULT_LANGUAGE)
+
+    data = _read_catalog(language)
+    fallback = load_catalog(DEFAULT_LANGUAGE) if language != DEFAULT_LANGUAGE else {}
+
+    catalog = dict(fallback)
+    for key, value in data.items():
+        if isinstance(value, str):
+            value = sys.intern(value)
+        catalog[sys.intern(key)] = value
+
+    _CATALOGS[language] = catalog
+    DATE_FORMATTERS[(language, 'long')] = _compile_date_formatter(catalog['_months'], catalog['_date_long'])
+    DATE_FORMATTERS[(language, 'short')] = _compile_date_formatter(catalog['_months'], catalog['_date_short'])
+    return catalog
+
+
+def loaded_languages():
+    """Languages whose catalogs are currently in memory"""
+    return list(_CATALOGS)
+
 
 def get_translation(key, language='es'):
     """Get translation for a key in specified language"""
-    if language not in TRANSLATIONS:
-        language = 'es'  # Fallback to Spanish
-    
-    return TRANSLATIONS[language].get(key, TRANSLATIONS['es'].get(key, key))
+    catalog = _CATALOGS.get(language) or load_catalog(language)
+    return catalog.get(key, key)
+
+
+def _compile_date_formatter(months, pattern):
+    """Bind a language's month table and pattern into a formatter function"""
+    pattern = pattern.format
+
+    def format_date(value):
+        return pattern(
+            day=value.day,
+            month=months[value.month - 1],
+            year=value.year,
+            time=f"{value.hour:02d}:{value.minute:02d}"
+        )
+
+    return format_date
+
+
+def format_datetime(value, language='es', style='short'):
+    """Format a match/announcement datetime in the given language"""
+    formatter = DATE_FORMATTERS.get((language, style))
+    if formatter is None:
+        load_catalog(language)
+        formatter = DATE_FORMATTERS.get((language, style)) or DATE_FORMATTERS[(DEFAULT_LANGUAGE, style)]
+    return formatter(value)
+
+
+# Embed templates: translation keys for title/description/field names, compiled per language.
+# Fields are (name_key, value_key, inline); a value_key of None is filled in at build time.
+# 'labels' are extra keys that commands need for dynamic rows (rankings, history...).
+EMBED_TEMPLATES = {
+    'admin_only': {'title': 'error', 'description': 'admin_only', 'color': 0xff0000},
+    'success': {'title': 'success', 'color': 0x00ff00, 'timestamp': True},
+    'match_created': {
+        'title': 'match_created', 'color': 0x00ff00, 'timestamp': True,
+        'fields': [('teams', None, False), ('match_time', None, False), ('match_id', None, True)]
+    },
+    'matches_imported': {
+        'title': 'matches_imported_title', 'color': 0x00ff00, 'timestamp': True,
+        'labels': ['matches_imported', 'page']
+    },
+    'matches_scheduled_dm': {'title': 'matches_scheduled_title', 'color': 0x00ff00, 'timestamp': True},
+    'match_ended': {'title': 'match_ended', 'description': 'match_ended_desc', 'color': 0xff9900, 'timestamp': True},
+    'active_matches': {'title': 'active_matches', 'color': 0x0099ff, 'timestamp': True, 'labels': ['page_number']},
+    'no_active_matches': {'title': 'active_matches', 'description': 'no_active_matches', 'color': 0x0099ff},
+    'match_result': {
+        'title': 'match_result_recorded', 'color': 0x00ff00, 'timestamp': True,
+        'labels': ['winner', 'result', 'draw', 'final_score', 'rating', 'next_match', 'tournament_complete']
+    },
+    'match_results': {
+        'title': 'match_results_recorded', 'color': 0x00ff00, 'timestamp': True,
+        'labels': ['next_match', 'tournament_complete']
+    },
+    'team_stats': {
+        'title': 'team_statistics', 'color': 0x0099ff, 'timestamp': True,
+        'fields': [('team', None, False), ('points', None, True), ('wins', None, True),
+                   ('losses', None, True), ('draws', None, True), ('rating', None, True),
+                   ('form', None, False)]
+    },
+    'team_rankings': {
+        'title': 'team_statistics', 'description': 'team_rankings', 'color': 0x0099ff, 'timestamp': True,
+        'labels': ['points', 'wins', 'losses', 'draws', 'rating', 'form']
+    },
+    'head_to_head': {
+        'title': 'head_to_head', 'color': 0x0099ff, 'timestamp': True,
+        'fields': [('teams', None, False), ('wins', None, True), ('goals', None, True),
+                   ('recent_meetings', None, False), ('form', None, False)],
+        'labels': ['draws']
+    },
+    'match_history': {'title': 'match_history', 'color': 0x0099ff, 'timestamp': True, 'labels': ['draw', 'page_number']},
+    'tournament_created': {
+        'title': 'tournament_created', 'color': 0x00ff00, 'timestamp': True,
+        'fields': [('tournament_name', None, False), ('tournament_id', None, True),
+                   ('start_date', None, True), ('end_date', None, True)]
+    },
+    'tournament_fixtures': {
+        'title': 'fixtures', 'color': 0x0099ff, 'timestamp': True,
+        'labels': ['round', 'tbd', 'fixtures_played']
+    },
+    'active_tournaments': {'title': 'active_tournaments', 'color': 0x0099ff, 'timestamp': True},
+    'no_active_tournaments': {'title': 'active_tournaments', 'description': 'no_active_tournaments', 'color': 0x0099ff},
+    'season_started': {
+        'title': 'season_started', 'color': 0x00ff00, 'timestamp': True,
+        'fields': [('season', None, False), ('season_id', None, True), ('start_date', None, True)],
+        'labels': ['season_closed']
+    },
+    'standings': {
+        'title': 'standings', 'color': 0x0099ff, 'timestamp': True,
+        'labels': ['standings_season', 'standings_closed_season', 'standings_month', 'standings_week', 'standings_all',
+                   'no_standings', 'points', 'goals']
+    },
+    'prediction_leaders': {'title': 'prediction_leaders', 'color': 0x0099ff, 'timestamp': True, 'labels': ['correct']},
+    'season_list': {'title': 'seasons', 'color': 0x0099ff, 'labels': ['season_open']},
+    'activity_digest': {
+        'title': 'activity_digest', 'color': 0x00ff00, 'timestamp': True,
+        'labels': ['activity_bot_message', 'activity_digest_footer']
+    },
+    'announcement_scheduled': {
+        'title': 'announcement_scheduled', 'color': 0x00ff00, 'timestamp': True,
+        'fields': [('channel', None, True), ('schedule_time', None, True), ('message', None, False)]
+    },
+    'announcement': {'title': 'announcement_title', 'color': 0x0099ff, 'timestamp': True},
+    'active_users': {
+        'title': 'active_users_title', 'color': 0x0099ff, 'timestamp': True, 'footer': 'active_users_note',
+        'fields': [('active_today', None, True), ('active_week', None, True), ('active_month', None, True)]
+    },
+    'top_active': {
+        'title': 'top_active_title', 'color': 0x0099ff, 'timestamp': True, 'footer': 'top_active_note',
+        'labels': ['messages']
+    },
+    'search_results': {
+        'title': 'search_results_title', 'color': 0x0099ff, 'timestamp': True,
+        'labels': ['events', 'announcements']
+    },
+    'help': {
+        'title': 'help_title', 'description': 'help_description', 'color': 0x0099ff, 'timestamp': True,
+        'footer': 'help_footer',
+        'fields': [
+            ('match_commands', ('creatematch', 'importmatches', 'endmatch', 'listmatches'), False),
+            ('admin_commands', ('setlogchannel', 'setchannels', 'dmuser', 'dmrole', 'customembed', 'serverlanguage', 'activeusers', 'search', 'backup', 'recomputeratings', 'recordresults', 'startseason', 'endseason'), False),
+            ('general_commands', (('ayuda', 'help'), 'language', 'topactive', 'fixtures', 'headtohead', 'standings', 'seasons', 'predictions'), False),
+            ('support', 'support_info', False),
+            ('server_invite', '=https://discord.gg/5BHpgnG8QP', False)
+        ]
+    }
+}
+
+
+def _template_keys(spec):
+    """Translation keys referenced by a template spec"""
+    keys = [spec['title']] + spec.get('labels', [])
+    for optional in ('description', 'footer'):
+        if spec.get(optional):
+            keys.append(spec[optional])
+    for name_key, value, _ in spec.get('fields', []):
+        keys.append(name_key)
+        if isinstance(value, tuple):
+            keys.extend(f"help_{entry[1] if isinstance(entry, tuple) else entry}" for entry in value)
+        elif value and not value.startswith('='):
+            keys.append(value)
+    return keys
+
+
+def _compile_field_value(value, language):
+    """Resolve a static field value: a key, a literal ('=...') or a help command list"""
+    if isinstance(value, tuple):
+        lines = []
+        for entry in value:
+            command, help_key = entry if isinstance(entry, tuple) else (entry, entry)
+            lines.append(f"**`/{command}`** - " + get_translation(f"help_{help_key}", language))
+        return "\n".join(lines)
+    if value.startswith('='):
+        return value[1:]
+    return get_translation(value, language)
+
+
+class EmbedTemplate:
+    """A (template, language) pair compiled into a reusable embed skeleton"""
+
+    __slots__ = ('title', 'description', 'color', 'timestamp', 'footer', 'fields', 'labels')
+
+    def __init__(self, spec, language):
+        self.title = get_translation(spec['title'], language)
+        self.description = get_translation(spec['description'], language) if spec.get('description') else None
+        self.color = spec.get('color', 0x0099ff)
+        self.timestamp = spec.get('timestamp', False)
+        self.footer = get_translation(spec['footer'], language) if spec.get('footer') else None
+        self.fields = tuple(
+            (get_translation(name_key, language), _compile_field_value(value, language) if value else None, inline)
+            for name_key, value, inline in spec.get('fields', [])
+        )
+        self.labels = {key: get_translation(key, language) for key in spec.get('labels', [])}
+
+    def build(self, *values, description=None, **format_args):
+        """Create an embed; positional values fill the dynamic fields in order"""
+        if description is None and self.description is not None:
+            description = self.description.format(**format_args) if format_args else self.description
+
+        embed = discord.Embed(
+            title=self.title,
+            description=description,
+            color=self.color,
+            timestamp=discord.utils.utcnow() if self.timestamp else None
+        )
+
+        values = iter(values)
+        for name, value, inline in self.fields:
+            embed.add_field(name=name, value=value if value is not None else next(values), inline=inline)
+
+        if self.footer:
+            embed.set_footer(text=self.footer)
+
+        return embed
+
+
+_COMPILED_TEMPLATES = {}
+
+
+def get_embed_template(name, language='es'):
+    """Get the compiled skeleton of a template, compiling it on first use"""
+    template = _COMPILED_TEMPLATES.get((name, language))
+    if template is None:
+        if name.startswith('error:'):
+            spec = {'title': 'error', 'description': name[6:], 'color': 0xff0000}
+        else:
+            spec = EMBED_TEMPLATES[name]
+        template = _COMPILED_TEMPLATES[(name, language)] = EmbedTemplate(spec, language)
+    return template
+
+
+def build_embed(name, language='es', *values, **kwargs):
+    """Build an embed from a compiled template"""
+    return get_embed_template(name, language).build(*values, **kwargs)
+
+
+def error_embed(key, language='es', **format_args):
+    """Build a red error embed whose description is the translation of key"""
+    return get_embed_template(f"error:{key}", language).build(**format_args)
+
+
+def precompile_templates(languages):
+    """Compile every template for the given languages up front"""
+    for language in languages:
+        for name in EMBED_TEMPLATES:
+            get_embed_template(name, language)
+
+
+def validate_translations():
+    """Check catalogs and templates for missing keys; returns {scope: [missing]}
+
+    Catalog files are only read for their keys, so unused languages stay unloaded.
+    """
+    problems = {}
+    base = set(_read_catalog(DEFAULT_LANGUAGE))
+
+    for language in SUPPORTED_LANGUAGES:
+        missing = sorted(base - set(_read_catalog(language)))
+        if missing:
+            problems[language] = missing
+
+    for name, spec in EMBED_TEMPLATES.items():
+        missing = sorted(set(key for key in _template_keys(spec) if key not in base))
+        if missing:
+            problems[f"template:{name}"] = missing
+
+    return problems
@@ -1,13 +1,11 @@
 import os
 import asyncio
-from bot.bot import XSportBSBot
+from bot.bot import create_bot
 from keep_alive import keep_alive
+from web.app import dashboard
 
 def main():
     """Main entry point for the Discord bot"""
-    # Start the keep-alive server
-    keep_alive()
-    
     # Get bot token from Replit secrets
     token = os.getenv("BOT_TOKEN")
     if not token:
@@ -15,8 +13,21 @@ def main():
         print("Please set BOT_TOKEN in Replit secrets with your Discord bot token.")
         return
     
-    # Create and run the bot
-    bot = XSportBSBot()
+    # Cluster mode: CLUSTER_WORKERS processes, each running a contiguous shard range
+    workers = int(os.getenv("CLUSTER_WORKERS", "0") or 0)
+    if workers > 1:
+        from bot.cluster import run_cluster
+        
+        shard_count = os.getenv("SHARD_COUNT")
+        run_cluster(token, workers, int(shard_count) if shard_count else None)
+        return
+    
+    # Start the keep-alive server
+    keep_alive()
+    
+    # Create and run the bot (set BOT_SHARDED=1 for one gateway connection per shard)
+    bot = create_bot()
+    dashboard.bot = bot
     
     try:
         bot.run(token)
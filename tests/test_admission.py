@@ -0,0 +1,47 @@
+import pytest
+
+from bot.utils.admission import AdmissionControl, TokenBuckets, parse_rate
+
+
+def test_parse_rate():
+    assert parse_rate('5/10', '1/1') == (5.0, 0.5)
+    assert parse_rate(None, '30/10') == (30.0, 3.0)
+    assert parse_rate('lots', '30/10') == (30.0, 3.0)
+
+
+def test_buckets_refill_lazily_up_to_capacity():
+    buckets = TokenBuckets(capacity=2, rate=0.5)
+    bucket = buckets.available('user', now=0)
+    assert bucket == [2, 0]
+    bucket[0] -= 2
+    assert buckets.retry_after(bucket) == pytest.approx(2.0)
+
+    assert buckets.available('user', now=1)[0] == pytest.approx(0.5)
+    assert buckets.available('user', now=100)[0] == 2
+
+
+def test_least_recently_used_bucket_is_evicted():
+    buckets = TokenBuckets(capacity=1, rate=1, max_keys=2)
+    for key in ('a', 'b'):
+        buckets.available(key, now=0)[0] = 0
+    buckets.available('a', now=0)
+    buckets.available('c', now=0)
+    assert list(buckets.buckets) == ['a', 'c']
+
+
+def test_admit_takes_from_every_scope_or_none(monkeypatch):
+    monkeypatch.setenv('RATE_LIMIT_USER', '2/10')
+    monkeypatch.setenv('RATE_LIMIT_GUILD', '3/10')
+    monkeypatch.setenv('RATE_LIMIT_GLOBAL', '100/10')
+    admission = AdmissionControl()
+    monkeypatch.setattr('bot.utils.admission.time.monotonic', lambda: 0.0)
+
+    assert admission.admit(1, 9) == (None, 0)
+    assert admission.admit(1, 9) == (None, 0)
+    scope, retry_after = admission.admit(1, 9)
+    assert scope == 'user' and retry_after == pytest.approx(5.0)
+
+    # The limited call took no tokens, so the guild still has one left
+    assert admission.admit(2, 9) == (None, 0)
+    assert admission.admit(3, 9)[0] == 'guild'
+    assert admission.scopes['global'].buckets[None][0] == 97
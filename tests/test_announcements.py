@@ -0,0 +1,96 @@
+import sqlite3
+from datetime import datetime, timedelta
+
+import pytest
+
+from bot.utils.database import Database
+
+NOW = datetime(2030, 1, 4, 20, 0)
+# Guild IDs carry their shard in (guild_id >> 22) % shard_count
+SHARD0, SHARD1 = 2 << 22, 3 << 22
+
+
+@pytest.fixture
+def db(tmp_path):
+    return Database(str(tmp_path / 'bot.db'))
+
+
+def test_pending_announcements_are_the_due_prefix_in_order(db):
+    later = db.schedule_announcement(SHARD0, 10, "later", NOW - timedelta(minutes=1), 1)
+    first = db.schedule_announcement(SHARD0, 10, "first", NOW - timedelta(hours=1), 1)
+    db.schedule_announcement(SHARD0, 10, "future", NOW + timedelta(minutes=1), 1)
+
+    assert [row[0] for row in db.get_pending_announcements(now=NOW)] == [first, later]
+    assert [row[0] for row in db.get_pending_announcements(now=NOW, limit=1)] == [first]
+
+
+def test_pending_announcements_filter_by_shard(db):
+    on_shard0 = db.schedule_announcement(SHARD0, 10, "zero", NOW, 1)
+    on_shard1 = db.schedule_announcement(SHARD1, 11, "one", NOW, 1)
+
+    assert [row[0] for row in db.get_pending_announcements(2, [0], now=NOW)] == [on_shard0]
+    assert [row[0] for row in db.get_pending_announcements(2, [1], now=NOW)] == [on_shard1]
+    assert len(db.get_pending_announcements(2, [0, 1], now=NOW)) == 2
+
+
+def test_next_fire_is_backfilled_for_unsent_announcements(tmp_path):
+    path = str(tmp_path / 'old.db')
+    conn = sqlite3.connect(path)
+    conn.executescript('''
+        CREATE TABLE scheduled_announcements (
+            id INTEGER PRIMARY KEY AUTOINCREMENT, guild_id INTEGER NOT NULL, channel_id INTEGER NOT NULL,
+            message TEXT NOT NULL, schedule_time DATETIME NOT NULL, is_sent BOOLEAN DEFAULT FALSE,
+            created_by INTEGER, created_at DATETIME DEFAULT CURRENT_TIMESTAMP
+        );
+        INSERT INTO scheduled_announcements (guild_id, channel_id, message, schedule_time, is_sent)
+        VALUES (1, 10, 'sent', '2030-01-01 10:00:00', TRUE), (1, 10, 'waiting', '2030-01-02 10:00:00', FALSE);
+    ''')
+    conn.close()
+
+    db = Database(path)
+    assert [row[3] for row in db.get_pending_announcements(now=NOW)] == ['waiting']
+
+
+def announcement_state(db, announcement_id):
+    conn = sqlite3.connect(db.db_path)
+    row = conn.execute(
+        'SELECT is_sent, next_fire FROM scheduled_announcements WHERE id = ?', (announcement_id,)
+    ).fetchone()
+    conn.close()
+    return row
+
+
+def test_finish_announcements_retires_one_shots_and_logs_events(db):
+    sent = db.schedule_announcement(1, 10, "sent", NOW, 1)
+    failed = db.schedule_announcement(1, 11, "failed", NOW, 1)
+
+    db.finish_announcements([sent], [failed], [('announcement_sent', 1, 'ok'), ('announcement_failed', 1, 'gone')], now=NOW)
+
+    assert announcement_state(db, sent) == (1, None)
+    # Undeliverable one-shots leave the due set but stay unsent
+    assert announcement_state(db, failed) == (0, None)
+    assert db.get_pending_announcements(now=NOW + timedelta(days=1)) == []
+    conn = sqlite3.connect(db.db_path)
+    assert conn.execute('SELECT event_type FROM event_logs ORDER BY id').fetchall() == [
+        ('announcement_sent',), ('announcement_failed',)
+    ]
+    conn.close()
+
+
+def test_finish_announcements_moves_recurring_ones_to_their_next_occurrence(db):
+    weekly = db.schedule_announcement(1, 10, "weekly", NOW, 1, recurrence='0 20 * * 5')
+    hourly = db.schedule_announcement(1, 11, "hourly", NOW - timedelta(hours=3), 1, recurrence='every 1h')
+
+    db.finish_announcements([weekly], [hourly], now=NOW)
+
+    assert announcement_state(db, weekly) == (0, str(NOW + timedelta(weeks=1)))
+    # Missed hours are skipped, and a failed send still advances
+    assert announcement_state(db, hourly) == (0, str(NOW + timedelta(hours=1)))
+
+
+def test_unknown_and_retired_announcements_are_ignored(db):
+    once = db.schedule_announcement(1, 10, "once", NOW, 1)
+    db.finish_announcements([once], now=NOW)
+    # A repeated or stale batch leaves the sent mark alone
+    db.finish_announcements([], [once, 999], now=NOW)
+    assert announcement_state(db, once) == (1, None)
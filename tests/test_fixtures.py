@@ -0,0 +1,86 @@
+from itertools import combinations
+
+import pytest
+
+from bot.utils.fixtures import bracket_order, double_elimination, generate_fixtures, round_robin, single_elimination
+
+
+@pytest.mark.parametrize('count', [2, 3, 4, 5, 8])
+def test_round_robin_pairs_every_team_once(count):
+    teams = [f"T{i}" for i in range(count)]
+    rounds = round_robin(teams)
+
+    assert len(rounds) == count - 1 + count % 2
+    played = [frozenset(pair) for pairs in rounds for pair in pairs]
+    assert sorted(played, key=sorted) == sorted(map(frozenset, combinations(teams, 2)), key=sorted)
+    for pairs in rounds:
+        in_round = [team for pair in pairs for team in pair]
+        assert len(in_round) == len(set(in_round))
+
+
+def test_round_robin_double_swaps_home_and_away():
+    rounds = round_robin(['A', 'B', 'C', 'D'], double=True)
+    first, second = rounds[:3], rounds[3:]
+    assert second == [[(away, home) for home, away in pairs] for pairs in first]
+
+
+def test_round_robin_alternates_the_fixed_team():
+    homes = [pairs[0][0] == 'A' for pairs in round_robin(['A', 'B', 'C', 'D', 'E', 'F'])]
+    assert homes == [True, False, True, False, True]
+
+
+def test_bracket_order_keeps_top_seeds_apart():
+    assert bracket_order(4) == [1, 4, 2, 3]
+    assert bracket_order(8) == [1, 8, 4, 5, 2, 7, 3, 6]
+
+
+def test_single_elimination_gives_byes_to_top_seeds():
+    fixtures = single_elimination(['A', 'B', 'C', 'D', 'E'])
+
+    first_round = [fixture for fixture in fixtures if fixture['stage'] == 0]
+    assert [(fixture['team1'], fixture['team2']) for fixture in first_round] == [('D', 'E'), ('B', 'C')]
+    # The top seed waits for the winner of 4 v 5
+    waiting = next(fixture for fixture in fixtures if fixture['team1'] == 'A')
+    assert waiting['team2'] is None
+    assert fixtures[0]['winner_to'] == (waiting['key'], 2)
+    assert sum(fixture['winner_to'] is None for fixture in fixtures) == 1
+
+
+@pytest.mark.parametrize('count', [2, 3, 4, 6, 8])
+def test_single_elimination_plays_one_match_per_eliminated_team(count):
+    fixtures = single_elimination([f"T{i}" for i in range(count)])
+    assert len(fixtures) == count - 1
+    for fixture in fixtures:
+        if fixture['winner_to']:
+            assert fixtures[fixture['winner_to'][0]]['stage'] > fixture['stage']
+
+
+def test_double_elimination_links_losers_and_grand_final():
+    fixtures = double_elimination(['A', 'B', 'C', 'D'])
+
+    assert [fixture['bracket'] for fixture in fixtures].count('GF') == 1
+    final = fixtures[-1]
+    assert final['bracket'] == 'GF' and final['winner_to'] is None
+    # Every winners-bracket loser drops into the losers bracket
+    for fixture in fixtures:
+        if fixture['bracket'] == 'W':
+            assert fixtures[fixture['loser_to'][0]]['bracket'] == 'L'
+    # Each fixture's inputs are scheduled in earlier stages
+    for fixture in fixtures:
+        for link in (fixture['winner_to'], fixture['loser_to']):
+            if link:
+                assert fixtures[link[0]]['stage'] > fixture['stage']
+    # 2n - 2 matches without a bracket reset
+    assert len(fixtures) == 6
+
+
+def test_generate_fixtures_round_robin_rows():
+    fixtures = generate_fixtures('round_robin', ['A', 'B', 'C'])
+    assert len(fixtures) == 3
+    assert all(fixture['bracket'] == 'RR' and fixture['winner_to'] is None for fixture in fixtures)
+    assert [fixture['round'] for fixture in fixtures] == [1, 2, 3]
+
+
+def test_generate_fixtures_rejects_unknown_format():
+    with pytest.raises(ValueError):
+        generate_fixtures('swiss', ['A', 'B'])
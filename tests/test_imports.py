@@ -0,0 +1,51 @@
+import json
+from datetime import datetime
+
+from bot.utils.imports import MAX_IMPORT_ROWS, parse_match_date, parse_matches
+
+NOW = datetime(2030, 1, 1, 12, 0)
+
+
+def test_parse_match_date_formats():
+    assert parse_match_date('2030-02-03 18:30') == datetime(2030, 2, 3, 18, 30)
+    assert parse_match_date('2030-02-03T18:30') == datetime(2030, 2, 3, 18, 30)
+    assert parse_match_date('03/02/2030', '18:30') == datetime(2030, 2, 3, 18, 30)
+    assert parse_match_date('tomorrow') is None
+
+
+def test_csv_rows_are_numbered_like_a_spreadsheet():
+    data = (
+        '\ufeffteam1,team2,date,time\n'
+        'Lions,Tigers,2030-02-03,18:30\n'
+        'Lions,Lions,2030-02-04,18:30\n'
+        'Bears,Wolves,someday,\n'
+        'Bears,Wolves,2029-12-31 10:00,\n'
+    ).encode()
+    matches, errors = parse_matches(data, 'fixtures.CSV', now=NOW)
+
+    assert matches == [{'team1': 'Lions', 'team2': 'Tigers', 'match_date': datetime(2030, 2, 3, 18, 30)}]
+    assert errors == [(3, 'import_invalid_teams'), (4, 'import_invalid_date'), (5, 'import_past_date')]
+
+
+def test_json_array_and_lines():
+    rows = [{'team1': 'A', 'team2': 'B', 'date': '2030-03-01 20:00'}, ['not', 'a', 'row']]
+    matches, errors = parse_matches(json.dumps(rows).encode(), 'm.json', now=NOW)
+    assert [match['team1'] for match in matches] == ['A']
+    assert errors == [(2, 'import_invalid_row')]
+
+    lines = '\n'.join(json.dumps(row) for row in rows[:1] * 2) + '\n\n'
+    matches, errors = parse_matches(lines.encode(), 'm.jsonl', now=NOW)
+    assert len(matches) == 2 and errors == []
+
+
+def test_unreadable_payloads():
+    assert parse_matches(b'{"team1": "A"}', 'm.json', now=NOW) == ([], [(0, 'import_unreadable')])
+    assert parse_matches(b'{broken', 'm.jsonl', now=NOW) == ([], [(0, 'import_unreadable')])
+    assert parse_matches(b'\xff\xfe\x00', 'm.csv', now=NOW)[1] == [(0, 'import_unreadable')]
+
+
+def test_row_limit():
+    rows = [{'team1': 'A', 'team2': 'B', 'date': '2030-03-01 20:00'}] * (MAX_IMPORT_ROWS + 5)
+    matches, errors = parse_matches(json.dumps(rows).encode(), 'm.json', now=NOW)
+    assert len(matches) == MAX_IMPORT_ROWS
+    assert errors == [(MAX_IMPORT_ROWS + 1, 'import_too_many_rows')]
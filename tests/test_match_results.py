@@ -0,0 +1,56 @@
+from datetime import datetime, timedelta
+
+import pytest
+
+from bot.utils.database import Database
+from bot.utils.fixtures import single_elimination
+
+GUILD = 1
+KICKOFF = datetime(2030, 5, 1, 18, 0)
+
+
+@pytest.fixture
+def db(tmp_path):
+    return Database(str(tmp_path / 'bot.db'))
+
+
+def knockout(db, teams):
+    tournament_id = db.create_tournament(GUILD, "Cup", KICKOFF, KICKOFF + timedelta(days=7), 1, 'single_elimination')
+    fixtures = single_elimination(teams)
+    for fixture in fixtures:
+        fixture['match_date'] = KICKOFF + timedelta(days=fixture['stage'])
+    return tournament_id, db.create_fixtures(tournament_id, GUILD, 10, 1, 'en', fixtures)
+
+
+def result(match_id, team1, team2, team1_score, team2_score):
+    winner, loser = (team1, team2) if team1_score > team2_score else (team2, team1)
+    return {
+        'match_id': match_id, 'team1': team1, 'team2': team2, 'team1_score': team1_score,
+        'team2_score': team2_score, 'match_date': KICKOFF, 'advance': (winner, loser)
+    }
+
+
+def test_record_results_advances_winners_and_completes_the_tournament(db):
+    tournament_id, (semi1, semi2, final) = knockout(db, ['A', 'B', 'C', 'D'])
+
+    changes, ready, completed = db.record_results(GUILD, [result(semi1, 'A', 'D', 2, 0)])
+    assert changes[0][0][1] > changes[0][0][0] > changes[0][1][1]
+    assert ready == [] and completed == []
+
+    _, ready, completed = db.record_results(GUILD, [result(semi2, 'B', 'C', 0, 1)])
+    assert [(row[0], row[3], row[4]) for row in ready] == [(final, 'A', 'C')]
+
+    _, _, completed = db.record_results(GUILD, [result(final, 'A', 'C', 3, 1)])
+    assert completed == [tournament_id]
+
+
+def test_record_results_refuses_finished_duplicate_and_foreign_matches(db):
+    _, (semi1, semi2, _) = knockout(db, ['A', 'B', 'C', 'D'])
+
+    assert db.record_results(GUILD, [result(semi1, 'A', 'D', 1, 0)] * 2) is None
+    assert db.record_results(GUILD + 1, [result(semi1, 'A', 'D', 1, 0)]) is None
+    assert db.record_results(GUILD, [result(semi1, 'A', 'D', 1, 0)]) is not None
+    # A batch with one finished match writes nothing at all
+    assert db.record_results(GUILD, [result(semi2, 'B', 'C', 1, 0), result(semi1, 'A', 'D', 1, 0)]) is None
+    assert len(db.get_match_results(GUILD)) == 1
+    assert db.finish_match(semi1, 'A', 'D') == ([], False)
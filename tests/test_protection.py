@@ -0,0 +1,50 @@
+import asyncio
+from types import SimpleNamespace
+
+from bot.utils.protection import Protection, SlidingWindow, parse_threshold
+
+
+def test_parse_threshold():
+    assert parse_threshold('15/30', '1/1') == (15, 30.0)
+    assert parse_threshold(None, '8/10') == (8, 10.0)
+    assert parse_threshold('often', '8/10') == (8, 10.0)
+
+
+def test_sliding_window_forgets_old_slots():
+    window = SlidingWindow(10, slots=10)
+    for now in (0.0, 0.5, 3.0):
+        window.add(now)
+    assert window.count(3.0) == 3
+    assert window.count(10.5) == 1
+    assert window.count(25.0) == 0
+    # A reused slot starts from zero
+    assert window.add(20.2) == 1
+
+
+def make_protection(max_members):
+    events = []
+    bot = SimpleNamespace(db=SimpleNamespace(log_event=lambda *event: events.append(event)), log_channels={})
+    return Protection(bot, max_members=max_members), events
+
+
+def message(user_id):
+    async def delete():
+        pass
+    return SimpleNamespace(guild=SimpleNamespace(id=1), author=SimpleNamespace(id=user_id, mention=f"<@{user_id}>"), delete=delete)
+
+
+def test_spammers_are_evicted_like_anyone_else_and_their_burst_ends():
+    protection, events = make_protection(max_members=2)
+
+    async def scenario():
+        flags = [await protection.message_sent(message(1)) for _ in range(protection.spam_messages)]
+        assert flags[-1] and not any(flags[:-1])
+        for user_id in (2, 3, 4):
+            await protection.message_sent(message(user_id))
+        assert list(protection.messages) == [(1, 3), (1, 4)]
+
+        await protection.sweep()
+
+    asyncio.run(scenario())
+    assert protection.spammers == {}
+    assert [event[0] for event in events] == ['spam_started', 'spam_ended']
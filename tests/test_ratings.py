@@ -0,0 +1,74 @@
+import sqlite3
+
+import pytest
+
+from bot.utils.database import Database
+from bot.utils.ratings import INITIAL_RATING, elo_update, expected_score, match_score, replay_ratings
+
+HISTORY = [('A', 'B', 2, 1), ('B', 'C', 0, 0), ('C', 'A', 3, 0), ('A', 'B', 1, 1)]
+
+
+def test_match_score():
+    assert (match_score(2, 1), match_score(1, 1), match_score(0, 4)) == (1.0, 0.5, 0.0)
+
+
+def test_expected_scores_are_complementary():
+    assert expected_score(1500, 1500) == 0.5
+    assert expected_score(1700, 1500) + expected_score(1500, 1700) == pytest.approx(1.0)
+    assert expected_score(1900, 1500) == pytest.approx(10 / 11)
+
+
+def test_elo_update_is_zero_sum():
+    new1, new2 = elo_update(1500, 1500, 1.0, k=32)
+    assert (new1, new2) == (1516, 1484)
+    new1, new2 = elo_update(1600, 1400, 0.5, k=20)
+    assert new1 < 1600 and new1 + new2 == pytest.approx(3000)
+
+
+def test_replay_matches_step_by_step_updates():
+    ratings = {}
+    for team1, team2, score1, score2 in HISTORY:
+        rating1, rating2 = ratings.get(team1, INITIAL_RATING), ratings.get(team2, INITIAL_RATING)
+        ratings[team1], ratings[team2] = elo_update(rating1, rating2, match_score(score1, score2), k=24)
+
+    replayed = replay_ratings(HISTORY, k=24)
+    assert replayed == pytest.approx(ratings)
+    assert sum(replayed.values()) == pytest.approx(3 * INITIAL_RATING)
+
+
+def test_recorded_results_match_a_full_replay(tmp_path):
+    db = Database(str(tmp_path / 'bot.db'))
+    for number, (team1, team2, score1, score2) in enumerate(HISTORY, 1):
+        db.save_match_result(number, 1, team1, team2, score1, score2, f"2030-01-0{number} 18:00")
+    incremental = {row[0]: row[5] for row in db.get_team_stats(1)}
+
+    assert db.recompute_ratings(1) == len(HISTORY)
+    assert {row[0]: row[5] for row in db.get_team_stats(1)} == pytest.approx(incremental)
+    assert incremental == pytest.approx(replay_ratings(HISTORY))
+
+
+def test_databases_without_ratings_replay_their_history_once(tmp_path):
+    path = str(tmp_path / 'old.db')
+    conn = sqlite3.connect(path)
+    conn.executescript('''
+        CREATE TABLE teams (
+            id INTEGER PRIMARY KEY AUTOINCREMENT, guild_id INTEGER NOT NULL, team_name TEXT NOT NULL,
+            points INTEGER DEFAULT 0, wins INTEGER DEFAULT 0, losses INTEGER DEFAULT 0, draws INTEGER DEFAULT 0,
+            created_at DATETIME DEFAULT CURRENT_TIMESTAMP
+        );
+        CREATE TABLE match_results (
+            id INTEGER PRIMARY KEY AUTOINCREMENT, match_id INTEGER NOT NULL, guild_id INTEGER NOT NULL,
+            team1_name TEXT NOT NULL, team2_name TEXT NOT NULL, team1_score INTEGER, team2_score INTEGER,
+            winner TEXT, match_date DATETIME, created_at DATETIME DEFAULT CURRENT_TIMESTAMP
+        );
+        INSERT INTO teams (guild_id, team_name) VALUES (1, 'A'), (1, 'B');
+        INSERT INTO match_results (match_id, guild_id, team1_name, team2_name, team1_score, team2_score, match_date)
+        VALUES (1, 1, 'A', 'B', 3, 0, '2030-01-01 18:00');
+    ''')
+    conn.close()
+
+    db = Database(path)
+    assert db.ratings_pending
+    assert db.recompute_ratings() == 1
+    assert {row[0]: row[5] for row in db.get_team_stats(1)} == pytest.approx(replay_ratings([('A', 'B', 3, 0)]))
+    assert not Database(path).ratings_pending
@@ -0,0 +1,58 @@
+from datetime import datetime, timedelta
+
+import pytest
+
+from bot.utils.recurrence import Recurrence, parse_time
+
+
+def test_intervals_stay_on_their_grid_and_skip_missed_occurrences():
+    rule = Recurrence('every 2h')
+    fired = datetime(2030, 1, 1, 10, 0)
+    assert rule.next_after(fired) == datetime(2030, 1, 1, 12, 0)
+    # Down for five hours: the next fire is the first slot after now, not a replay
+    assert rule.next_after(fired, now=datetime(2030, 1, 1, 15, 7)) == datetime(2030, 1, 1, 16, 0)
+    assert rule.first_at_or_after(fired) == fired
+
+
+@pytest.mark.parametrize('text', ['every 0m', 'every 5s', '61 * * * *', '* * * *', '5-1 * * * *', '*/0 * * * *'])
+def test_invalid_rules(text):
+    with pytest.raises(ValueError):
+        Recurrence(text)
+
+
+def test_cron_fields_and_weekdays():
+    # Fridays at 20:00
+    rule = Recurrence('0 20 * * 5')
+    assert rule.next_after(datetime(2030, 1, 1, 0, 0)) == datetime(2030, 1, 4, 20, 0)
+    assert rule.next_after(datetime(2030, 1, 4, 20, 0)) == datetime(2030, 1, 11, 20, 0)
+    # Sunday may be written as 0 or 7
+    assert Recurrence('0 9 * * 7').next_after(datetime(2030, 1, 1)) == datetime(2030, 1, 6, 9, 0)
+    # Steps and lists
+    rule = Recurrence('*/20 9,17 * * *')
+    assert rule.next_after(datetime(2030, 1, 1, 9, 40)) == datetime(2030, 1, 1, 17, 0)
+
+
+def test_restricted_day_of_month_and_weekday_match_either():
+    # The 1st of the month or any Monday, like cron
+    rule = Recurrence('0 8 1 * 1')
+    assert rule.next_after(datetime(2030, 1, 1, 9, 0)) == datetime(2030, 1, 7, 8, 0)
+    assert rule.next_after(datetime(2030, 1, 28, 9, 0)) == datetime(2030, 2, 1, 8, 0)
+
+
+def test_leap_day_and_impossible_dates():
+    assert Recurrence('0 0 29 2 *').next_after(datetime(2030, 3, 1)) == datetime(2032, 2, 29, 0, 0)
+    with pytest.raises(ValueError):
+        Recurrence('0 0 31 2 *').next_after(datetime(2030, 1, 1))
+
+
+def test_first_at_or_after_includes_the_start():
+    rule = Recurrence('30 18 * * *')
+    assert rule.first_at_or_after(datetime(2030, 1, 1, 18, 30)) == datetime(2030, 1, 1, 18, 30)
+    assert rule.first_at_or_after(datetime(2030, 1, 1, 18, 31)) == datetime(2030, 1, 2, 18, 30)
+
+
+def test_parse_time():
+    moment = datetime(2030, 1, 1, 18, 30)
+    assert parse_time(moment) is moment
+    assert parse_time('2030-01-01 18:30:00') == moment
+    assert parse_time(str(moment + timedelta(minutes=1))) == moment + timedelta(minutes=1)
@@ -0,0 +1,43 @@
+import sqlite3
+
+import pytest
+
+from bot.utils.database import Database, fts_query
+
+
+def test_fts_query_quotes_words_and_keeps_prefixes():
+    assert fts_query('raid  kick*') == '"raid" "kick"*'
+    assert fts_query('say "hi" *') == '"say" """hi"""'
+    assert fts_query('   ') == ''
+
+
+@pytest.fixture
+def db(tmp_path):
+    return Database(str(tmp_path / 'bot.db'))
+
+
+def test_search_follows_inserts_and_guilds(db):
+    db.log_event('raid_started', 1, "15 joins within 30s")
+    db.log_event('raid_started', 2, "40 joins within 30s")
+
+    assert [row[0] for row in db.search_events('joins', 1)] == ['raid_started']
+    assert len(db.search_events('join*')) == 2
+    assert db.search_events('kicks') == []
+    assert db.search_events('') == []
+
+
+def test_existing_rows_are_indexed_once(tmp_path):
+    path = str(tmp_path / 'old.db')
+    conn = sqlite3.connect(path)
+    conn.executescript('''
+        CREATE TABLE event_logs (
+            id INTEGER PRIMARY KEY AUTOINCREMENT, event_type TEXT NOT NULL, guild_id INTEGER,
+            description TEXT, timestamp DATETIME DEFAULT CURRENT_TIMESTAMP
+        );
+        INSERT INTO event_logs (event_type, guild_id, description) VALUES ('backup_created', 1, 'nightly snapshot');
+    ''')
+    conn.close()
+
+    assert len(Database(path).search_events('snapshot')) == 1
+    # Reopening neither rebuilds nor duplicates the index
+    assert len(Database(path).search_events('nightly')) == 1
@@ -0,0 +1,96 @@
+import random
+from collections import Counter
+
+import pytest
+
+from bot.utils.sketches import HyperLogLog, SpaceSaving
+
+
+def sketch_of(values, precision=12):
+    sketch = HyperLogLog(precision)
+    for value in values:
+        sketch.add(value)
+    return sketch
+
+
+def test_small_counts_are_near_exact():
+    assert sketch_of([]).count() == 0
+    assert sketch_of([1, 2, 3, 3, 2, 1]).count() == 3
+    assert sketch_of(range(100)).count() == pytest.approx(100, abs=2)
+
+
+@pytest.mark.parametrize('distinct', [5000, 50000])
+def test_large_counts_stay_within_a_few_standard_errors(distinct):
+    # Precision 12 has ~1.6% standard error
+    assert sketch_of(range(10 ** 9, 10 ** 9 + distinct)).count() == pytest.approx(distinct, rel=0.05)
+
+
+def test_duplicates_leave_registers_unchanged():
+    sketch = sketch_of(range(1000))
+    before = sketch.to_bytes()
+    assert not any(sketch.add(value) for value in range(1000))
+    assert sketch.to_bytes() == before
+
+
+def test_merge_counts_the_union():
+    left, right = sketch_of(range(0, 3000)), sketch_of(range(2000, 5000))
+    left.merge(right)
+    assert left.to_bytes() == sketch_of(range(5000)).to_bytes()
+
+
+def test_merge_rejects_other_precisions():
+    with pytest.raises(ValueError):
+        HyperLogLog(12).merge(HyperLogLog(10))
+
+
+def test_bytes_round_trip():
+    sketch = sketch_of(range(700))
+    restored = HyperLogLog.from_bytes(sketch.to_bytes())
+    assert restored.count() == sketch.count()
+    with pytest.raises(ValueError):
+        HyperLogLog.from_bytes(b'\0' * 10)
+
+
+def test_space_saving_is_exact_below_capacity():
+    counter = SpaceSaving(capacity=10)
+    for key in 'aababcabcd':
+        counter.offer(key)
+    assert counter.top(3) == [('a', 4, 0), ('b', 3, 0), ('c', 2, 0)]
+    assert counter.total == 10
+
+
+def test_space_saving_keeps_heavy_hitters_within_their_error():
+    random.seed(3)
+    stream = [f"heavy{index}" for index in range(5) for _ in range(200)]
+    stream += [f"light{random.randrange(2000)}" for _ in range(3000)]
+    random.shuffle(stream)
+
+    counter = SpaceSaving(capacity=50)
+    for key in stream:
+        counter.offer(key)
+    true_counts = Counter(stream)
+
+    assert len(counter.counts) == 50
+    assert {key for key, _, _ in counter.top(5)} == {f"heavy{index}" for index in range(5)}
+    for key, count, error in counter.top(50):
+        assert count - error <= true_counts[key] <= count
+    # Any key seen more than total / capacity times is tracked
+    assert all(key in counter.counts for key, count in true_counts.items() if count > len(stream) / 50)
+
+
+def test_space_saving_evicts_a_minimum_counter():
+    counter = SpaceSaving(capacity=2)
+    for key in 'aab':
+        counter.offer(key)
+    counter.offer('c')
+    assert counter.top() == [('a', 2, 0), ('c', 2, 1)]
+    assert counter.min_count == 2
+
+
+def test_space_saving_load_restores_counters():
+    counter = SpaceSaving(capacity=2)
+    counter.load([('a', 5, 0), ('b', 3, 1), ('c', 1, 0)])
+    assert counter.top() == [('a', 5, 0), ('b', 3, 1)]
+    assert (counter.min_count, counter.total) == (3, 8)
+    counter.offer('d')
+    assert counter.top() == [('a', 5, 0), ('d', 4, 3)]
@@ -0,0 +1,66 @@
+import sqlite3
+from datetime import datetime
+
+import pytest
+
+from bot.utils.database import Database
+
+GUILD = 1
+
+
+def result(match_id, team1, team2, team1_score, team2_score, match_date):
+    return {
+        'match_id': match_id, 'team1': team1, 'team2': team2, 'team1_score': team1_score,
+        'team2_score': team2_score, 'match_date': match_date, 'advance': None
+    }
+
+
+@pytest.fixture
+def db(tmp_path):
+    return Database(str(tmp_path / 'bot.db'))
+
+
+def record(db, *results):
+    match_ids = [db.create_match(GUILD, 10, entry[1], entry[2], entry[5], 1, 'en') for entry in results]
+    return db.record_results(GUILD, [result(match_id, *entry[1:]) for match_id, entry in zip(match_ids, results)])
+
+
+def test_results_on_the_same_day_accumulate_in_one_rollup(db):
+    record(db, (0, 'A', 'B', 2, 0, datetime(2030, 1, 1, 12)), (0, 'A', 'C', 1, 1, datetime(2030, 1, 1, 18)))
+    record(db, (0, 'B', 'A', 3, 1, datetime(2030, 1, 2, 18)))
+
+    standings = {row[0]: row[1:] for row in db.get_windowed_standings(GUILD, '2030-01-01', '2030-01-01')}
+    assert standings['A'] == (4, 1, 0, 1, 3, 1)
+    assert standings['B'] == (0, 0, 1, 0, 0, 2)
+
+    # Open-ended windows add the later days
+    assert {row[0]: row[1] for row in db.get_windowed_standings(GUILD)}['A'] == 4
+    assert {row[0]: row[1] for row in db.get_windowed_standings(GUILD, '2030-01-02')}['B'] == 3
+
+
+def test_existing_results_are_backfilled_into_rollups(tmp_path):
+    path = str(tmp_path / 'old.db')
+    conn = sqlite3.connect(path)
+    conn.executescript('''
+        CREATE TABLE match_results (
+            id INTEGER PRIMARY KEY AUTOINCREMENT, match_id INTEGER NOT NULL, guild_id INTEGER NOT NULL,
+            team1_name TEXT NOT NULL, team2_name TEXT NOT NULL, team1_score INTEGER, team2_score INTEGER,
+            winner TEXT, match_date DATETIME, created_at DATETIME DEFAULT CURRENT_TIMESTAMP
+        );
+        INSERT INTO match_results (match_id, guild_id, team1_name, team2_name, team1_score, team2_score, match_date, created_at)
+        VALUES
+            (1, 1, 'A', 'B', 2, 1, '2030-01-01 18:00:00', '2030-01-01 20:00:00'),
+            (2, 1, 'B', 'A', 0, 0, NULL, '2030-01-03 20:00:00'),
+            (3, 1, 'A', 'B', NULL, NULL, '2030-01-04 18:00:00', '2030-01-04 20:00:00');
+    ''')
+    conn.close()
+
+    db = Database(path)
+    # A missing match date falls back to when the result was stored; unscored rows are skipped
+    assert {row[0]: row[1:] for row in db.get_windowed_standings(GUILD)} == {
+        'A': (4, 1, 0, 1, 2, 1), 'B': (1, 0, 1, 1, 1, 2)
+    }
+    assert {row[0]: row[1] for row in db.get_windowed_standings(GUILD, '2030-01-03')} == {'A': 1, 'B': 1}
+
+    # Reopening doesn't backfill a second time
+    assert {row[0]: row[1] for row in Database(path).get_windowed_standings(GUILD)} == {'A': 4, 'B': 1}
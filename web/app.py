@@ -1,13 +1,23 @@
 from flask import Flask, render_template, request, jsonify
 import threading
+import hmac
 import os
 
 class WebDashboard:
     def __init__(self, bot=None):
         self.app = Flask(__name__, template_folder='templates', static_folder='static')
         self.bot = bot
+        # Endpoints that expose guild content (not just counts) need this bearer token; unset disables them
+        self.api_token = os.getenv("DASHBOARD_API_TOKEN")
         self.setup_routes()
     
+    def authorized(self):
+        """Check the request's 'Authorization: Bearer <token>' header against DASHBOARD_API_TOKEN"""
+        if not self.api_token:
+            return False
+        header = request.headers.get('Authorization', '')
+        return hmac.compare_digest(header, f"Bearer {self.api_token}")
+    
     def setup_routes(self):
         @self.app.route('/')
         def index():
@@ -19,15 +29,61 @@ class WebDashboard:
                 return jsonify({'error': 'Bot not available'})
             
             try:
-                stats = {
-                    'guilds': len(self.bot.guilds),
-                    'users': sum(guild.member_count for guild in self.bot.guilds),
-                    'uptime': 'Running',
-                    'status': 'Online'
-                }
+                stats = self.bot.get_stats_snapshot()
+                stats['uptime'] = 'Running'
+                stats['status'] = 'Online'
                 return jsonify(stats)
             except Exception as e:
                 return jsonify({'error': str(e)})
+        
+        @self.app.route('/api/shards')
+        def get_shards():
+            if not self.bot:
+                return jsonify({'error': 'Bot not available'})
+            
+            try:
+                return jsonify(self.bot.get_stats_snapshot()['shards'])
+            except Exception as e:
+                return jsonify({'error': str(e)})
+        
+        @self.app.route('/api/active_users/<int:guild_id>')
+        def get_active_users(guild_id):
+            if not self.bot:
+                return jsonify({'error': 'Bot not available'})
+            
+            try:
+                return jsonify(self.bot.active_members.counts(guild_id))
+            except Exception as e:
+                return jsonify({'error': str(e)})
+        
+        @self.app.route('/api/search')
+        def search():
+            if not self.authorized():
+                return jsonify({'error': 'Unauthorized'}), 401
+            if not self.bot:
+                return jsonify({'error': 'Bot not available'})
+            
+            query = request.args.get('q', '')
+            guild_id = request.args.get('guild_id', type=int)
+            if guild_id is None:
+                return jsonify({'error': 'guild_id is required'}), 400
+            limit = min(request.args.get('limit', 20, type=int), 100)
+            
+            try:
+                events = self.bot.db.search_events(query, guild_id, limit)
+                announcements = self.bot.db.search_announcements(query, guild_id, limit)
+                return jsonify({
+                    'events': [
+                        {'event_type': event_type, 'snippet': snippet, 'timestamp': timestamp}
+                        for event_type, snippet, timestamp in events
+                    ],
+                    'announcements': [
+                        {'channel_id': str(channel_id), 'snippet': snippet, 'schedule_time': schedule_time, 'is_sent': bool(is_sent)}
+                        for channel_id, snippet, schedule_time, is_sent in announcements
+                    ]
+                })
+            except Exception as e:
+                return jsonify({'error': str(e)})
     
     def run(self, host='0.0.0.0', port=5000, debug=False):
         """Run the Flask app"""